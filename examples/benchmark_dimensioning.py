@@ -0,0 +1,47 @@
+"""Benchmark of automatic dimensioning of a drawing with many edges.
+
+Generating the dimensions is timed for each mode, then the chain dimensions are added to a widget in batches while
+the event loop keeps running. The drawing is shown at the end.
+
+Run with:
+    python examples/benchmark_dimensioning.py [n_edges]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pyqtgraph as pg
+
+from cadvas import AutoDimensioner, QCadvasWidget, Segment, auto_dimensions
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(0, 1000, (n, 2))
+    ends = starts + rng.uniform(-5, 5, (n, 2))
+    segments = [Segment(tuple(s), tuple(e)) for s, e in zip(starts.tolist(), ends.tolist(), strict=True)]
+
+    for mode, per_item in (("chain", False), ("baseline", False), ("overall", True), ("chain", True)):
+        t0 = time.perf_counter()
+        measures = auto_dimensions(segments, mode=mode, per_item=per_item)
+        print(f"{mode:8s} per_item={per_item!s:5s}: {len(measures)} dimensions in {time.perf_counter() - t0:.2f} s")
+
+    app = pg.mkQApp()
+    widget = QCadvasWidget()
+    widget.resize(1000, 800)
+    widget.addLayer("dimensions", z=10)
+    widget.addCadItems(segments, do_bounds=True)
+    widget.show()
+
+    dimensioner = AutoDimensioner(widget, layer="dimensions")
+    t0 = time.perf_counter()
+    dimensioner.sigFinished.connect(lambda: print(f"added in batches in {time.perf_counter() - t0:.2f} s"))
+    dimensioner.dimension(segments[:2000], mode="chain", axis="x", offset=5, spacing=5)
+    dimensioner.dimension(segments[:2000], mode="overall", axis="y", per_item=True, offset=5, spacing=5)
+    app.exec()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark of SVG and PDF export throughput and memory on 1M entities.
+
+The elements are generated on the fly. Each format is exported in a fresh process, and the growth of its peak resident
+memory during the export is reported. This includes memory allocated by Qt, which `tracemalloc` does not see. SVG
+export runs in constant memory. PDF export does not: `QPdfWriter` keeps the content of the page in memory until the
+page is finished.
+
+Run with (on Linux or macOS):
+    python examples/benchmark_export.py [n_items]
+"""
+
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pyqtgraph as pg
+
+from cadvas import Box, Circle, Measure, Polygon, Segment
+from cadvas.export import export_pdf, export_svg
+
+EXPORTERS = {"svg": export_svg, "pdf": export_pdf}
+
+
+def generate(n):
+    """Yields a mix of elements on a square grid."""
+    side = int(math.sqrt(n)) + 1
+    for i in range(n):
+        x, y = 2.0 * (i % side), 2.0 * (i // side)
+        kind = i % 5
+        if kind == 0:
+            yield Segment((x, y), (x + 1, y + 1))
+        elif kind == 1:
+            yield Box((x, y), (x + 1, y + 0.5))
+        elif kind == 2:
+            yield Circle((x + 0.5, y + 0.5), 0.4)
+        elif kind == 3:
+            yield Polygon(((x, y), (x + 1, y), (x, y + 1)))
+        else:
+            yield Measure((x, y), (x + 1, y), offset=0.3)
+
+
+def peak_rss():
+    """Returns the peak resident memory of the process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run(name, n):
+    """Exports n entities in the given format, called in a fresh process."""
+    pg.mkQApp()
+    side = int(math.sqrt(n)) + 1
+    bounds = (0, 0, 2 * side, 2 * side)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, f"drawing.{name}")
+        before = peak_rss()
+        t0 = time.perf_counter()
+        EXPORTERS[name](generate(n), path, bounds=bounds, width=20000)
+        elapsed = time.perf_counter() - t0
+        growth = peak_rss() - before
+        size = os.path.getsize(path) / 1e6
+    print(f"{name}: {n} entities in {elapsed:.1f} s ({n / elapsed:,.0f} /s), {size:.0f} MB")
+    print(f"{name}: peak resident memory grew by {growth / 1e6:.1f} MB during export")
+
+
+def main():
+    """Runs the export of each format in a child process, so that their peak memory is measured separately."""
+    if len(sys.argv) > 2:
+        run(sys.argv[2], int(sys.argv[1]))
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for name in EXPORTERS:
+        subprocess.run([sys.executable, __file__, str(n), name], check=True)  # noqa: S603, runs this script
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark of the latency of highlighting a single polygon in a scene with 100k items.
+
+Compares the default update mode of the view with the minimal update mode of `QCadvasWidget`.
+
+Run with:
+    python examples/benchmark_highlight.py [n_items]
+"""
+
+import statistics
+import sys
+import time
+
+import pyqtgraph as pg
+from PySide6.QtGui import QBrush, QColor
+from PySide6.QtWidgets import QApplication
+
+from cadvas import Polygon, QCadvasWidget
+
+
+def build_scene(cw, n):
+    side = int(n**0.5) + 1
+    items = []
+    for i in range(n):
+        x, y = i % side, i // side
+        items.append(Polygon(((x, y), (x + 0.8, y), (x, y + 0.8))))
+    cw.addCadItems(items)
+    cw.w.setRange(xRange=(0, side), yRange=(0, side), padding=0)
+    return items
+
+
+def highlight_latency(app, cw, items, repeats=50):
+    latencies = []
+    step = max(1, len(items) // repeats)
+    for k in range(repeats):
+        poly = items[(k * step) % len(items)].poly
+        app.processEvents()
+
+        t0 = time.perf_counter()
+        poly.setBrush(QBrush(QColor(0, 254, 0)))
+        cw.markDirtyRect(poly.sceneBoundingRect())
+        app.processEvents()  # runs the dirty-region timer
+        app.processEvents()  # paints
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def report(name, latencies):
+    ms = sorted(1000 * t for t in latencies)
+    p95 = ms[int(0.95 * (len(ms) - 1))]
+    print(f"{name:>10}: median {statistics.median(ms):8.2f} ms   p95 {p95:8.2f} ms   max {ms[-1]:8.2f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    app = pg.mkQApp()
+    cw = QCadvasWidget()
+    cw.resize(3840, 2160)
+    cw.show()
+
+    t0 = time.perf_counter()
+    items = build_scene(cw, n)
+    app.processEvents()
+    print(f"Scene with {n} polygons built in {time.perf_counter() - t0:.2f} s")
+
+    cw.setMinimalUpdate(False)
+    report("default", highlight_latency(app, cw, items))
+
+    cw.setMinimalUpdate(True)
+    report("minimal", highlight_latency(app, cw, items))
+
+    QApplication.instance().quit()
+
+
+if __name__ == "__main__":
+    main()
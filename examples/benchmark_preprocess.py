@@ -0,0 +1,68 @@
+"""Benchmark of measurement and polygon preprocessing for large imports.
+
+The vectorized preprocessing and the creation of the elements from its results are timed separately, next to creating
+the same elements directly, with and without pausing the garbage collector.
+
+Run with:
+    python examples/benchmark_preprocess.py [n_items]
+"""
+
+import gc
+import sys
+import time
+
+import numpy as np
+
+from cadvas import Measure
+from cadvas.preprocess import preprocess_measures, preprocess_polygons
+
+
+def main():
+    """Times preprocessing and element creation for n random measurements and polygons."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(0, 1000, (n, 2))
+    ends = rng.uniform(0, 1000, (n, 2))
+    offsets = rng.uniform(-5, 5, n)
+    counts = rng.integers(3, 12, n)
+    polygon_offsets = np.concatenate([[0], np.cumsum(counts)])
+    points = rng.uniform(0, 1000, (polygon_offsets[-1], 2))
+
+    t0 = time.perf_counter()
+    result = preprocess_measures(starts, ends, offsets)
+    t1 = time.perf_counter()
+    measures = result.measures()
+    t2 = time.perf_counter()
+    print(f"measures: preprocessing {t1 - t0:.2f} s, creating {n} elements {t2 - t1:.2f} s")
+    del measures
+
+    t0 = time.perf_counter()
+    result = preprocess_polygons(points, polygon_offsets)
+    t1 = time.perf_counter()
+    polygons = result.polygons()
+    t2 = time.perf_counter()
+    print(f"polygons: preprocessing {t1 - t0:.2f} s, creating {n} elements {t2 - t1:.2f} s")
+    del polygons
+
+    def direct():
+        return [
+            Measure(tuple(s), tuple(e), o)
+            for s, e, o in zip(starts.tolist(), ends.tolist(), offsets.tolist(), strict=True)
+        ]
+
+    t0 = time.perf_counter()
+    measures = direct()
+    t1 = time.perf_counter()
+    print(f"creating {len(measures)} measures directly: {t1 - t0:.2f} s")
+    del measures
+
+    gc.disable()
+    t0 = time.perf_counter()
+    measures = direct()
+    t1 = time.perf_counter()
+    gc.enable()
+    print(f"creating {len(measures)} measures directly with the garbage collector paused: {t1 - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Records or replays a pan/zoom trace against a generated drawing.
+
+Without a trace file (or with -) a synthetic trace that pans across and zooms out of the drawing is written first, so the script
+also runs on a headless machine. Replays of the same trace can be compared between versions.
+
+Run with:
+    python examples/replay_trace.py --record trace.jsonl      # interact with the window, then close it
+    QT_QPA_PLATFORM=offscreen python examples/replay_trace.py [trace.jsonl or -] [n_items]
+"""
+
+import json
+import math
+import sys
+import tempfile
+
+import pyqtgraph as pg
+
+from cadvas import Box, Circle, Measure, Polygon, QCadvasWidget, Segment
+from cadvas.replay import TRACE_VERSION, InteractionRecorder, replay
+
+
+def build_widget(n):
+    """Creates a widget with a mix of `n` elements on a square grid."""
+    cw = QCadvasWidget()
+    cw.resize(1000, 700)
+    side = int(math.sqrt(n)) + 1
+    items = []
+    for i in range(n):
+        x, y = 2.0 * (i % side), 2.0 * (i // side)
+        kind = i % 5
+        if kind == 0:
+            items.append(Segment((x, y), (x + 1, y + 1)))
+        elif kind == 1:
+            items.append(Box((x, y), (x + 1, y + 0.5)))
+        elif kind == 2:
+            items.append(Circle((x + 0.5, y + 0.5), 0.4))
+        elif kind == 3:
+            items.append(Polygon(((x, y), (x + 1, y), (x, y + 1))))
+        else:
+            items.append(Measure((x, y), (x + 1, y), offset=0.3))
+    cw.addCadItems(items)
+    cw.w.setRange(xRange=(0, 40), yRange=(0, 28), padding=0)
+    cw.show()
+    return cw
+
+
+def write_synthetic_trace(filename, frames=300):
+    """Writes a trace that pans along the diagonal for half of the frames and zooms out for the other half."""
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "header", "version": TRACE_VERSION, "size": [1000, 700]}) + "\n")
+        for i in range(frames):
+            if i < frames // 2:
+                x, y, w = 0.5 * i, 0.5 * i, 40.0
+            else:
+                x, y, w = 0.5 * (frames // 2), 0.5 * (frames // 2), 40.0 * 1.02 ** (i - frames // 2)
+            record = {"t": i / 60, "type": "range", "x": [x, x + w], "y": [y, y + 0.7 * w]}
+            f.write(json.dumps(record) + "\n")
+
+
+def main():
+    app = pg.mkQApp()
+    if len(sys.argv) > 2 and sys.argv[1] == "--record":
+        cw = build_widget(20_000)
+        recorder = InteractionRecorder(cw, sys.argv[2])
+        recorder.start()
+        app.exec()
+        recorder.stop()
+        return
+
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    cw = build_widget(n)
+    if len(sys.argv) > 1 and sys.argv[1] != "-":
+        print(replay(cw, sys.argv[1]))
+    else:
+        with tempfile.TemporaryDirectory() as folder:
+            trace = f"{folder}/trace.jsonl"
+            write_synthetic_trace(trace)
+            print(replay(cw, trace))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Soak test of session mode: loads many drawings one after another into one widget and checks for leaks.
+
+Every drawing is cleared before the next one is loaded, and a few pan steps are replayed on each so that elements are
+evicted and restored. After the warm-up drawings, the resident memory may not grow by more than the given margin,
+no graphics items may be left in the scene and no elements of earlier drawings may be alive. The exit code is 1 if
+one of the checks fails.
+
+Run with:
+    python examples/soak_session.py [n_drawings] [n_items]
+"""
+
+import gc
+import sys
+import weakref
+
+import numpy as np
+import pyqtgraph as pg
+
+from cadvas import Box, Circle, Measure, Polygon, QCadvasWidget, Segment
+
+WARMUP = 50
+MAX_GROWTH = 32 * 2**20
+
+
+def drawing(rng, n):
+    """Returns n random elements of all kinds."""
+    items = []
+    for i, (x, y) in enumerate(rng.uniform(0, 1000, (n, 2)).tolist()):
+        kind = i % 5
+        if kind == 0:
+            items.append(Segment((x, y), (x + 5, y + 2)))
+        elif kind == 1:
+            items.append(Box((x, y), (x + 4, y + 3)))
+        elif kind == 2:
+            items.append(Polygon([(x, y), (x + 4, y), (x + 2, y + 3)]))
+        elif kind == 3:
+            items.append(Circle((x, y), 2))
+        else:
+            items.append(Measure((x, y), (x + 6, y), 1))
+    return items
+
+
+def main():
+    n_drawings = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_items = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    app = pg.mkQApp()
+    widget = QCadvasWidget()
+    widget.resize(800, 600)
+    widget.addLayer("dimensions", z=10)
+    widget.show()
+    widget.setSessionMode(max_items=n_items // 4, max_memory=2 * 2**30)
+    scene_items = len(widget.scene().items())
+
+    rng = np.random.default_rng(0)
+    baseline = None
+    previous = []
+    failed = False
+    for k in range(n_drawings):
+        items = drawing(rng, n_items)
+        measures = [p for p in items if isinstance(p, Measure)]
+        widget.addCadItems([p for p in items if not isinstance(p, Measure)])
+        widget.addCadItems(measures, layer="dimensions")
+        for x in range(0, 1000, 250):
+            widget.w.setRange(xRange=(x, x + 200), yRange=(400, 550), padding=0)
+            app.processEvents()
+
+        widget.clearDrawing()
+        app.processEvents()
+        alive = sum(r() is not None for r in previous)
+        previous = [weakref.ref(p) for p in items[:100]]
+        del items, measures
+
+        if k + 1 == WARMUP:
+            gc.collect()
+            baseline = widget.sessionStats()["memory"]
+        if (k + 1) % 100 == 0 or k + 1 == n_drawings:
+            gc.collect()
+            stats = widget.sessionStats()
+            scene = len(widget.scene().items()) - scene_items
+            memory = stats["memory"]
+            print(
+                f"{k + 1:5d} drawings: memory {memory / 2**20 if memory else float('nan'):.1f} MiB, "
+                f"evictions {stats['evictions']}, restores {stats['restores']}, leaked {stats['leaked_items']}, "
+                f"scene items {scene}, elements alive {alive}"
+            )
+            if stats["leaked_items"] or alive or stats["live_items"] or scene:
+                failed = True
+            if baseline is not None and memory is not None and memory - baseline > MAX_GROWTH:
+                print(f"memory grew by {(memory - baseline) / 2**20:.1f} MiB after warm-up")
+                failed = True
+
+    print("FAILED" if failed else "OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
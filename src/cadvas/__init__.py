@@ -3,7 +3,18 @@
 import os
 from importlib.metadata import PackageNotFoundError, version  # pragma: no cover
 
+from .blocks import Block, Insert
+from .dimensioning import AutoDimensioner, auto_dimensions
 from .elements import Box, CadItem, Circle, Measure, Polygon, Segment
+from .export import export_pdf, export_svg
+from .feed import DrawingFeed
+from .grid import GridItem
+from .hatch import Hatch
+from .labels import LabelRenderer
+from .layers import Layer
+from .preprocess import preprocess_measures, preprocess_polygons
+from .query import GeometryStore
+from .undo import UndoStack
 from .widget import QCadvasWidget
 
 try:
@@ -18,11 +29,26 @@ finally:
 os.environ["PYQTGRAPH_QT_LIB"] = "PySide6"
 
 __all__ = [
+    "AutoDimensioner",
+    "Block",
     "Box",
     "CadItem",
     "Circle",
+    "DrawingFeed",
+    "GeometryStore",
+    "GridItem",
+    "Hatch",
+    "Insert",
+    "LabelRenderer",
+    "Layer",
     "Measure",
     "Polygon",
     "QCadvasWidget",
     "Segment",
+    "UndoStack",
+    "auto_dimensions",
+    "export_pdf",
+    "export_svg",
+    "preprocess_measures",
+    "preprocess_polygons",
 ]
@@ -0,0 +1,197 @@
+"""This module defines block definitions and block inserts.
+
+A `Block` is a reusable group of elements, such as a bolt pattern or a nameplate. An `Insert` places a block in the
+drawing with its own position, rotation and scale. The geometry of a block is recorded once into a `QPicture` that is
+shared by all of its inserts, so the memory use and creation cost of a drawing scale with the number of unique blocks
+and not with the number of copies. Each insert only creates a single lightweight graphics item.
+
+Classes:
+    Block: A named group of elements that is recorded once into a shared picture.
+    Insert: A CAD element that places a block with a transform.
+Usage:
+    Blocks can contain `Segment`, `Box`, `Circle` and `Polygon` elements and inserts of other blocks, which allows
+    hierarchical symbols. A block is recorded the first time it is drawn; changing the elements of a block afterwards
+    requires a call to `Block.invalidate`, which also updates the inserts that are shown. Blocks that insert a changed
+    block have to be invalidated as well, innermost first.
+
+Example:
+    bolt = Block([Circle((0, 0), 0.5), Segment((-0.7, 0), (0.7, 0)), Segment((0, -0.7), (0, 0.7))], name="bolt")
+    for i in range(1000):
+        widget.addCadItem(Insert(bolt, position=(i, 0), rotation=45), do_bounds=False)
+"""
+
+import weakref
+
+import pyqtgraph as pg
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QPainter, QPicture, QTransform
+from PySide6.QtWidgets import QGraphicsItem
+from shiboken6 import isValid
+
+from .elements import CadItem, _mark_dirty
+
+
+class Block:
+    """Block is a reusable group of elements.
+
+    Methods:
+        picture() -> QPicture:
+            Returns the shared recording of the block geometry.
+        boundingRect() -> QRectF:
+            Returns the bounding rectangle of the block geometry in block coordinates.
+        bounds() -> tuple:
+            Returns the bounding box (xmin, ymin, xmax, ymax) in block coordinates.
+        invalidate():
+            Discards the recording so that it is rebuilt on next use.
+    """
+
+    def __init__(self, items, name=None):
+        """Initializes the block with the elements it consists of.
+
+        Args:
+            items (iterable of CadItem): The elements of the block, in block coordinates.
+            name (str, optional): The name of the block. Defaults to None.
+        """
+        self.items = list(items)
+        self.name = name
+        self._picture = None
+        self._bounds = None
+        self._graphics = weakref.WeakSet()  # graphics items of the inserts that paint this block
+
+    def picture(self) -> QPicture:
+        """Returns the recording of the block geometry, recording it on first use."""
+        if self._picture is None:
+            picture = QPicture()
+            painter = QPainter(picture)
+            for item in self.items:
+                item.draw(painter)
+            painter.end()
+            self._picture = picture
+        return self._picture
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Returns the bounding box (xmin, ymin, xmax, ymax) of the block geometry in block coordinates."""
+        if self._bounds is None:
+            boxes = [item.bounds() for item in self.items]
+            if boxes:
+                self._bounds = (
+                    min(b[0] for b in boxes),
+                    min(b[1] for b in boxes),
+                    max(b[2] for b in boxes),
+                    max(b[3] for b in boxes),
+                )
+            else:
+                self._bounds = (0.0, 0.0, 0.0, 0.0)
+        return self._bounds
+
+    def boundingRect(self) -> QRectF:
+        """Returns the bounding rectangle of the block geometry in block coordinates."""
+        x0, y0, x1, y1 = self.bounds()
+        return QRectF(x0, y0, x1 - x0, y1 - y0)
+
+    def invalidate(self):
+        """Discards the recorded picture and bounds so that they are rebuilt on next use.
+
+        The graphics items of inserts that are already shown take over the new bounding rectangle and are repainted.
+        Blocks that insert this block are not invalidated automatically.
+        """
+        self._picture = None
+        self._bounds = None
+        for graphics in list(self._graphics):
+            if isValid(graphics):
+                graphics.updateGeometry()
+
+
+class _InsertGraphicsItem(QGraphicsItem):
+    """A graphics item that paints the shared picture of a block."""
+
+    def __init__(self, block: Block, parent=None):
+        super().__init__(parent)
+        self.block = block
+        self._rect = self._blockRect()
+        block._graphics.add(self)
+
+    def _blockRect(self):
+        # pens of the recorded geometry are not cosmetic, leave a margin for the line width
+        return self.block.boundingRect().adjusted(-1, -1, 1, 1)
+
+    def updateGeometry(self):
+        """Takes over the bounding rectangle of the block after it changed and repaints the item."""
+        _mark_dirty(self)
+        self.prepareGeometryChange()
+        self._rect = self._blockRect()
+        self.update()
+        _mark_dirty(self)
+
+    def boundingRect(self):
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        painter.drawPicture(0, 0, self.block.picture())
+
+
+class Insert(CadItem):
+    """Insert places a block in the drawing with a position, rotation and scale."""
+
+    _graphics_attrs = ("graphics",)
+    _geometry_attrs = ("position", "rotation", "scale")
+    _style_attrs = ("block",)
+
+    def __init__(self, block: Block, position=(0, 0), rotation=0, scale=1):
+        """Initializes an insert of a block.
+
+        Args:
+            block (Block): The block to insert.
+            position (tuple, optional): The position of the block origin in the drawing. Defaults to (0, 0).
+            rotation (float, optional): Counter-clockwise rotation in degrees. Defaults to 0.
+            scale (float, optional): Scale factor of the block. Defaults to 1.
+        """
+        self.block = block
+        self.position = position
+        self.rotation = rotation
+        self.scale = scale
+
+    def transform(self) -> QTransform:
+        """Returns the transform from block coordinates to drawing coordinates."""
+        t = QTransform()
+        t.translate(*self.position)
+        t.rotate(self.rotation)
+        t.scale(self.scale, self.scale)
+        return t
+
+    def createItems(self, target: pg.PlotWidget, do_bounds=False):
+        """Creates a single graphics item that paints the shared block picture and adds it to target.
+
+        Args:
+            target (pg.PlotWidget): The PlotWidget to which the item will be added.
+            do_bounds (bool, optional): If True, the bounds of the item will be considered when adding it to
+                the PlotWidget. Defaults to False.
+        """
+        self.graphics = _InsertGraphicsItem(self.block)
+        self._applyGeometry()
+        target.addItem(self.graphics, ignoreBounds=not do_bounds)
+
+    def updateItems(self, target: pg.PlotWidget):
+        """Updates the items in the specified PlotWidget target."""
+        pass
+
+    def _applyGeometry(self):
+        graphics = getattr(self, "graphics", None)
+        if graphics is not None:
+            graphics.setPos(*self.position)
+            graphics.setRotation(self.rotation)
+            graphics.setScale(self.scale)
+
+    def bounds(self):
+        """Returns the bounding box (xmin, ymin, xmax, ymax) of the insert in drawing coordinates."""
+        rect = self.transform().mapRect(self.block.boundingRect())
+        return (rect.left(), rect.top(), rect.right(), rect.bottom())
+
+    def draw(self, painter: QPainter):
+        """Paints the insert with the given painter, used for nested blocks and export."""
+        painter.save()
+        painter.translate(QPointF(*self.position))
+        painter.rotate(self.rotation)
+        painter.scale(self.scale, self.scale)
+        painter.drawPicture(0, 0, self.block.picture())
+        painter.restore()
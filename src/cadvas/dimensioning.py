@@ -0,0 +1,279 @@
+"""This module generates `Measure` dimensions for whole sets of CAD elements.
+
+Dimensions are generated along one axis, outside the drawing: horizontal dimensions below or above it and vertical
+dimensions left or right of it. The feature coordinates of the elements (vertices of segments, boxes and polygons and
+the extremes of everything else) are projected onto the axis and sorted, and then dimensioned in one of three ways:
+
+- "chain": a dimension between every two neighbouring coordinates, all in one row.
+- "baseline": a dimension from the first coordinate to every other coordinate, nested in rows.
+- "overall": one dimension over the full extent.
+
+With `per_item=True` every element is dimensioned on its own instead of the set as a whole. Dimensions whose extents
+overlap are put in different rows ("tracks") by a sweep over the sorted intervals that always reuses the nearest
+free track; a chain of one element stays in one track. Sorting dominates, so generating dimensions for n edges costs
+O(n log n).
+
+Classes:
+    AutoDimensioner: Generates dimensions and adds them to a `QCadvasWidget` in batches.
+Functions:
+    auto_dimensions(items, mode="chain", axis="x", ...): Returns the dimensions of a set of elements.
+    dimension_tracks(lo, hi): Assigns non-overlapping tracks to intervals.
+Usage:
+    `auto_dimensions` only creates the `Measure` objects. `AutoDimensioner` also adds them to a widget, a batch per
+    timer tick, so that the GUI stays responsive while tens of thousands of dimensions are added.
+
+Example:
+    dimensioner = AutoDimensioner(widget, layer="dimensions")
+    dimensioner.dimension(items, mode="chain", axis="x", side="below")
+    dimensioner.dimension(items, mode="overall", axis="y", side="left", per_item=True)
+"""
+
+import heapq
+
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .elements import Box, CadItem, Measure, Polygon, Segment
+
+MODES = ("chain", "baseline", "overall")
+
+_SIDES = {"x": ("below", "above"), "y": ("left", "right")}
+
+
+def dimension_tracks(lo, hi) -> np.ndarray:
+    """Assigns every interval the lowest track that is free over its whole extent.
+
+    Intervals are swept in order of their start, with shorter intervals first on equal starts. Tracks whose last
+    interval ended before the current start are kept in a heap and reused lowest first, so the number of tracks is
+    the minimum possible: the largest number of intervals that overlap in one point. Intervals that only touch at an
+    end point can share a track.
+
+    Args:
+        lo (array_like): The start of every interval.
+        hi (array_like): The end of every interval, not smaller than its start.
+
+    Returns:
+        ndarray: The track index of every interval, starting at 0.
+    """
+    lo = np.asarray(lo, dtype=float)
+    hi = np.asarray(hi, dtype=float)
+    tracks = np.empty(len(lo), dtype=np.intp)
+    order = np.lexsort((hi, lo)).tolist()
+    starts = lo.tolist()
+    ends = hi.tolist()
+
+    busy = []  # (end, track) of the last interval in every occupied track
+    free = []  # tracks that are free again
+    count = 0
+    for i in order:
+        start = starts[i]
+        while busy and busy[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if free:
+            track = heapq.heappop(free)
+        else:
+            track = count
+            count += 1
+        tracks[i] = track
+        heapq.heappush(busy, (ends[i], track))
+    return tracks
+
+
+def _feature_points(item: CadItem) -> np.ndarray:
+    """Returns the points of an element that are dimensioned, as an (n, 2) array."""
+    if isinstance(item, Segment):
+        return np.array((item.start, item.end), dtype=float)
+    if isinstance(item, Polygon):
+        return np.asarray(item.points, dtype=float).reshape(-1, 2)
+    if isinstance(item, Box):
+        return np.array((item.lower_left, item.upper_right), dtype=float)
+    xmin, ymin, xmax, ymax = item.bounds()
+    return np.array(((xmin, ymin), (xmax, ymax)), dtype=float)
+
+
+def _distinct(values, tol):
+    """Returns the sorted values without values that are within `tol` of the previous one."""
+    values = np.sort(values)
+    if len(values) < 2:
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    keep[1:] = np.diff(values) > tol
+    return values[keep]
+
+
+def _intervals(groups, mode, tol):
+    """Returns the dimension intervals of groups of coordinates and the slots they are placed in.
+
+    Tracks are assigned to slots: a chain of one group shares one slot over its whole extent, in the other modes
+    every dimension has a slot of its own.
+
+    Returns:
+        tuple: (dim_lo, dim_hi, dim_slot, slot_lo, slot_hi) as arrays, or None if there is nothing to dimension.
+    """
+    dim_lo, dim_hi, dim_slot, slot_lo, slot_hi = [], [], [], [], []
+    n_slots = 0
+    for coords in groups:
+        coords = _distinct(coords, tol)
+        if len(coords) < 2:
+            continue
+        if mode == "chain":
+            lo, hi = coords[:-1], coords[1:]
+            dim_slot.append(np.full(len(lo), n_slots))
+            slot_lo.append(coords[:1])
+            slot_hi.append(coords[-1:])
+        else:
+            if mode == "baseline":
+                lo, hi = np.full(len(coords) - 1, coords[0]), coords[1:]
+            else:
+                lo, hi = coords[:1], coords[-1:]
+            dim_slot.append(np.arange(len(lo)) + n_slots)
+            slot_lo.append(lo)
+            slot_hi.append(hi)
+        n_slots += len(slot_lo[-1])
+        dim_lo.append(lo)
+        dim_hi.append(hi)
+    if not dim_lo:
+        return None
+    return tuple(np.concatenate(v) for v in (dim_lo, dim_hi, dim_slot, slot_lo, slot_hi))
+
+
+def auto_dimensions(
+    items, mode="chain", axis="x", side=None, per_item=False, offset=1.0, spacing=1.0, tol=1e-9
+) -> list[Measure]:
+    """Generates dimensions for a set of elements.
+
+    Args:
+        items (iterable of CadItem): The elements to dimension. Segments, boxes and polygons are dimensioned at
+            their vertices, other elements at the extremes of their bounding box.
+        mode (str, optional): "chain", "baseline" or "overall". Defaults to "chain".
+        axis (str, optional): "x" for horizontal or "y" for vertical dimensions. Defaults to "x".
+        side (str, optional): Where the dimensions are placed: "below" or "above" for horizontal and "left" or
+            "right" for vertical dimensions. Defaults to below and left.
+        per_item (bool, optional): Whether every element is dimensioned on its own. Defaults to False.
+        offset (float, optional): Distance from the drawing to the first track in drawing units. Defaults to 1.
+        spacing (float, optional): Distance between two tracks in drawing units. Defaults to 1.
+        tol (float, optional): Coordinates closer than this are dimensioned as one. Defaults to 1e-9.
+
+    Returns:
+        list: The new `Measure` objects, not yet added to a widget.
+
+    Raises:
+        ValueError: If the mode, axis or side is unknown.
+    """
+    if mode not in MODES:
+        raise ValueError(mode)
+    if axis not in _SIDES:
+        raise ValueError(axis)
+    if side is None:
+        side = _SIDES[axis][0]
+    if side not in _SIDES[axis]:
+        raise ValueError(side)
+
+    points = [_feature_points(item) for item in items]
+    if not points:
+        return []
+    a = 0 if axis == "x" else 1
+    groups = [p[:, a] for p in points] if per_item else [np.concatenate(points)[:, a]]
+    intervals = _intervals(groups, mode, tol)
+    if intervals is None:
+        return []
+    dim_lo, dim_hi, dim_slot, slot_lo, slot_hi = intervals
+
+    tracks = dimension_tracks(slot_lo, slot_hi)[dim_slot]
+    distance = offset + tracks * spacing
+
+    # a positive Measure offset moves the dimension line to the right of the direction from start to end, so
+    # below a horizontal dimension that runs in +x and to the right of a vertical dimension that runs in +y
+    other = np.concatenate(points)[:, 1 - a]
+    base = float(other.min() if side in ("below", "left") else other.max())
+    offsets = distance if side in ("below", "right") else -distance
+
+    measures = []
+    for lo, hi, off in zip(dim_lo.tolist(), dim_hi.tolist(), offsets.tolist(), strict=True):
+        if axis == "x":
+            measures.append(Measure((lo, base), (hi, base), off))
+        else:
+            measures.append(Measure((base, lo), (base, hi), off))
+    return measures
+
+
+class AutoDimensioner(QObject):
+    """AutoDimensioner generates dimensions for sets of elements and adds them to a widget in batches.
+
+    Methods:
+        dimension(items, mode="chain", axis="x", ...) -> list:
+            Generates dimensions, see `auto_dimensions`, and queues them for the widget.
+        pending() -> int:
+            Returns the number of dimensions that are not yet added.
+        flush():
+            Adds the next batch to the widget. Called by a timer while dimensions are pending.
+        cancel():
+            Drops all pending dimensions.
+
+    Signals:
+        sigBatchAdded(int): Emitted after a batch was added, with the number of dimensions in the batch.
+        sigFinished(): Emitted when all queued dimensions were added.
+    """
+
+    sigBatchAdded = Signal(int)
+    sigFinished = Signal()
+
+    def __init__(self, widget, layer=None, batch_size=2000, interval_ms=0, parent=None):
+        """Initializes the dimensioner.
+
+        Args:
+            widget (QCadvasWidget): The widget to add the dimensions to.
+            layer (str, optional): The layer to add the dimensions to. Defaults to None (the view box).
+            batch_size (int, optional): Number of dimensions added per timer tick. Defaults to 2000.
+            interval_ms (int, optional): Time between two batches in milliseconds. Defaults to 0, which adds one
+                batch each time the event loop is idle.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.widget = widget
+        self.layer = layer
+        self.batch_size = batch_size
+        self._queue = []
+        self._next = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def dimension(self, items, **kwargs) -> list[Measure]:
+        """Generates dimensions for a set of elements and queues them for the widget.
+
+        Args:
+            items (iterable of CadItem): The elements to dimension.
+            **kwargs: Options of `auto_dimensions`, such as `mode`, `axis`, `side` and `per_item`.
+
+        Returns:
+            list: The generated `Measure` objects.
+        """
+        measures = auto_dimensions(items, **kwargs)
+        if measures:
+            self._queue.extend(measures)
+            self._timer.start()
+        return measures
+
+    def pending(self) -> int:
+        """Returns the number of queued dimensions that are not yet added to the widget."""
+        return len(self._queue) - self._next
+
+    def flush(self):
+        """Adds the next batch of queued dimensions to the widget."""
+        batch = self._queue[self._next : self._next + self.batch_size]
+        self._next += len(batch)
+        if batch:
+            self.widget.addCadItems(batch, layer=self.layer)
+            self.sigBatchAdded.emit(len(batch))
+        if self._next >= len(self._queue):
+            self.cancel()
+            self.sigFinished.emit()
+
+    def cancel(self):
+        """Drops all pending dimensions; dimensions that were already added stay in the widget."""
+        self._timer.stop()
+        self._queue = []
+        self._next = 0
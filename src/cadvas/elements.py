@@ -21,6 +21,12 @@ Classes and Methods:
         - createItems(target: pg.PlotWidget, do_bounds: bool): Abstract method to create and add items to the target widget.
         - updateItems(target: pg.PlotWidget): Abstract method to update items on the target widget.
         - in_view(x: float, y: float, w: pg.PlotWidget): Checks if a point is within the view range of the widget.
+        - graphicsItems(): Returns the Qt graphics items that were created for the element.
+        - releaseItems(target: pg.PlotWidget): Removes the graphics items of the element from the target and drops them.
+        - bounds(): Returns the bounding box of the element geometry.
+        - draw(painter: QPainter): Paints the element geometry directly, without creating graphics items.
+        - geometry(): Returns the geometry of the element as constructor arguments.
+        - setGeometry(**changes): Changes the geometry and updates existing graphics items in place.
     - Segment:
         - __init__(start: tuple, end: tuple): Initializes a line segment with start and end points.
         - createItems(target: pg.PlotWidget, do_bounds: bool): Creates and adds a line segment to the target widget.
@@ -50,7 +56,7 @@ from abc import ABC, abstractmethod
 
 import pyqtgraph as pg
 from PySide6.QtCore import QPointF, QRectF
-from PySide6.QtGui import QBrush, QColor, QPolygonF
+from PySide6.QtGui import QBrush, QColor, QPainter, QPen, QPolygonF
 from PySide6.QtWidgets import (
     QGraphicsEllipseItem,
     QGraphicsLineItem,
@@ -58,10 +64,14 @@ from PySide6.QtWidgets import (
     QGraphicsRectItem,
     QGraphicsSceneMouseEvent,
 )
+from shiboken6 import isValid
+
+from .hatch import Hatch, hatch_brush, hatch_bucket
 
 logger = logging.getLogger(__name__)
 
 MEASURE_COLOR = QColor(0, 200, 150)
+LINE_WIDTH = 0.1
 
 """
 Use ,ignoreBounds=True to speed-up adding to plot
@@ -94,8 +104,33 @@ class CadItem(ABC):
 
     Returns:
                 bool: True if the point is within the view range, False otherwise.
+        graphicsItems() -> list:
+            Returns the Qt graphics items created by `createItems`, as listed in `_graphics_attrs`.
+        releaseItems(target: pg.PlotWidget):
+            Removes the graphics items from the target and drops the references to them.
+        bounds() -> tuple:
+            Returns the bounding box (xmin, ymin, xmax, ymax) of the element geometry.
+        draw(painter: QPainter):
+            Paints the element geometry with the given painter, without creating graphics items.
+        geometry() -> dict:
+            Returns the geometry of the element as constructor arguments, as listed in `_geometry_attrs`.
+        setGeometry(**changes):
+            Changes the geometry of the element and updates the existing graphics items in place.
     """
 
+    _graphics_attrs: tuple[str, ...] = ()
+
+    # Constructor arguments that describe the geometry of the element, see `geometry` and `setGeometry`.
+    _geometry_attrs: tuple[str, ...] = ()
+
+    # The other constructor arguments, such as the hatch. Two elements of the same type whose other arguments are
+    # equal can take over each other's geometry in place, see `DrawingFeed`. None if unknown.
+    _style_attrs: tuple[str, ...] | None = None
+
+    # True for elements that create their graphics items only once they become visible, and that can
+    # release them again while off-screen; see `Measure`.
+    lazy = False
+
     @abstractmethod
     def createItems(self, target: pg.PlotWidget, do_bounds=False):
         """Creates items and adds them to target."""
@@ -120,10 +155,130 @@ class CadItem(ABC):
         view_range = w.viewRect()
         return bool(view_range.left() <= x <= view_range.right() and view_range.top() <= y <= view_range.bottom())
 
+    def graphicsItems(self) -> list:
+        """Returns the Qt graphics items that were created for this element.
+
+        Returns:
+            list: The graphics items, empty if `createItems` has not been called yet.
+        """
+        items = (getattr(self, name, None) for name in self._graphics_attrs)
+        return [item for item in items if item is not None]
+
+    def releaseItems(self, target: pg.PlotWidget):
+        """Removes the graphics items of this element from the target and drops the references to them.
+
+        Args:
+            target (pg.PlotWidget): The PlotWidget or layer the items were added to.
+        """
+        for item in self.graphicsItems():
+            target.removeItem(item)
+        self._dropItems()
+
+    def _dropItems(self):
+        """Drops the references to the graphics items after they were removed from the scene."""
+        self._detach()
+        for name in self._graphics_attrs:
+            setattr(self, name, None)
+
+    def _detach(self):  # noqa: B027, optional hook
+        """Removes what the element draws through items it shares with other elements, such as a label renderer.
+
+        Called when the element is removed from the drawing while its own graphics items are kept for a restore.
+        """
+        pass
+
+    def _sharedSceneRects(self) -> list:
+        """Returns the scene rectangles the element draws through items it shares with other elements."""
+        return []
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Returns the bounding box of the element geometry.
+
+        Returns:
+            tuple: (xmin, ymin, xmax, ymax) in drawing coordinates.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement bounds")
+
+    def draw(self, painter: QPainter):
+        """Paints the element geometry with the given painter.
+
+        This draws the same geometry as the graphics items created by `createItems`, but directly with a
+        `QPainter`. It is used to record elements into shared pictures and to export drawings.
+
+        Args:
+            painter (QPainter): An active painter in drawing coordinates.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement draw")
+
+    def geometry(self) -> dict:
+        """Returns the geometry of the element.
+
+        Returns:
+            dict: The constructor arguments that describe the geometry, e.g. `start` and `end` of a segment.
+        """
+        return {name: getattr(self, name) for name in self._geometry_attrs}
+
+    def setGeometry(self, **changes):
+        """Changes the geometry of the element.
+
+        Graphics items that were already created are updated in place instead of being re-created.
+
+        Args:
+            **changes: New values for some of the constructor arguments returned by `geometry`.
+
+        Raises:
+            TypeError: If an argument is not part of the geometry of the element.
+        """
+        for name in changes:
+            if name not in self._geometry_attrs:
+                raise TypeError(name)
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self._applyGeometry()
+
+    def _applyGeometry(self):
+        """Updates the existing graphics items after the geometry changed."""
+        raise NotImplementedError(f"{type(self).__name__} does not implement setGeometry")
+
+
+def _line_pen(color=None) -> QPen:
+    """Returns the pen that is used for the outlines of the elements."""
+    pen = QPen()
+    pen.setWidthF(LINE_WIDTH)
+    if color is not None:
+        pen.setColor(color)
+    return pen
+
+
+def _update_hatch(element, item, target):
+    """Sets the hatch brush of a graphics item when the zoom of the target moved into another scale bucket.
+
+    Targets with a `hatchBucket` method, such as `CadViewBox` and `Layer`, compute the bucket once per zoom level.
+    """
+    bucket_of = getattr(target, "hatchBucket", None)
+    bucket = (
+        bucket_of(element.hatch) if bucket_of is not None else hatch_bucket(element.hatch, max(target.viewPixelSize()))
+    )
+    if bucket != element._hatch_bucket:
+        element._hatch_bucket = bucket
+        item.setBrush(hatch_brush(element.hatch, bucket=bucket))
+
+
+def _fill_brush(element, painter: QPainter) -> QBrush:
+    """Returns the brush for painting an element with the scale of the painter."""
+    if element.hatch is None:
+        return QBrush()
+    scale = math.sqrt(abs(painter.worldTransform().determinant()))
+    return hatch_brush(element.hatch, 1 / scale if scale else None)
+
 
 class Segment(CadItem):
     """Segment is a line between two points."""
 
+    _graphics_attrs = ("line",)
+    _geometry_attrs = ("start", "end")
+    _style_attrs = ()
+
     def __init__(self, start, end):
         """Initializes an instance of the class with the specified start and end points.
 
@@ -153,7 +308,7 @@ class Segment(CadItem):
         """
         self.line = QGraphicsLineItem(*self.start, *self.end)
         pen = self.line.pen()
-        pen.setWidthF(0.1)
+        pen.setWidthF(LINE_WIDTH)
         self.line.setPen(pen)
         target.addItem(self.line, ignoreBounds=not do_bounds)
 
@@ -168,19 +323,46 @@ class Segment(CadItem):
         """
         pass
 
+    def bounds(self):
+        """Returns the bounding box (xmin, ymin, xmax, ymax) of the segment."""
+        return (
+            min(self.start[0], self.end[0]),
+            min(self.start[1], self.end[1]),
+            max(self.start[0], self.end[0]),
+            max(self.start[1], self.end[1]),
+        )
+
+    def draw(self, painter: QPainter):
+        """Paints the segment with the given painter."""
+        painter.setPen(_line_pen())
+        painter.drawLine(QPointF(*self.start), QPointF(*self.end))
+
+    def _applyGeometry(self):
+        line = getattr(self, "line", None)
+        if line is not None:
+            line.setLine(*self.start, *self.end)
+
 
 class Box(CadItem):
     """Box is a rectangle."""
 
-    def __init__(self, lower_left, upper_right):
+    _graphics_attrs = ("rect",)
+    _geometry_attrs = ("lower_left", "upper_right")
+    _style_attrs = ("hatch",)
+
+    _hatch_bucket = None
+
+    def __init__(self, lower_left, upper_right, hatch: Hatch = None):
         """Initializes a new instance of the class with the specified lower-left and upper-right coordinates.
 
         Args:
             lower_left: The coordinates of the lower-left corner.
             upper_right: The coordinates of the upper-right corner.
+            hatch (Hatch, optional): The hatch or fill of the box. Defaults to None (not filled).
         """
         self.lower_left = lower_left
         self.upper_right = upper_right
+        self.hatch = hatch
 
     def createItems(self, target: pg.PlotWidget, do_bounds=False):
         """Creates and adds a rectangular graphical item to the specified PlotWidget.
@@ -206,20 +388,56 @@ class Box(CadItem):
         self.rect = QGraphicsRectItem(QRectF(x, y, w, h))
 
         pen = self.rect.pen()
-        pen.setWidthF(0.1)
+        pen.setWidthF(LINE_WIDTH)
         self.rect.setPen(pen)
+        if self.hatch is not None:
+            self._hatch_bucket = None
+            _update_hatch(self, self.rect, target)
         target.addItem(self.rect, ignoreBounds=not do_bounds)
 
     def updateItems(self, target: pg.PlotWidget):
         """Updates the items in the specified PlotWidget target.
 
-        This method is intended to modify or refresh the graphical elements
-        displayed in the provided pyqtgraph PlotWidget.
+        The hatch brush is replaced if the zoom level moved into another scale bucket.
 
         Args:
             target (pg.PlotWidget): The PlotWidget instance to update.
         """
-        pass
+        if self.hatch is not None and getattr(self, "rect", None) is not None:
+            _update_hatch(self, self.rect, target)
+
+    def bounds(self):
+        """Returns the bounding box (xmin, ymin, xmax, ymax) of the box."""
+        return (
+            min(self.lower_left[0], self.upper_right[0]),
+            min(self.lower_left[1], self.upper_right[1]),
+            max(self.lower_left[0], self.upper_right[0]),
+            max(self.lower_left[1], self.upper_right[1]),
+        )
+
+    def draw(self, painter: QPainter):
+        """Paints the box with the given painter."""
+        x, y = self.lower_left
+        painter.setPen(_line_pen())
+        painter.setBrush(_fill_brush(self, painter))
+        painter.drawRect(QRectF(x, y, self.upper_right[0] - x, self.upper_right[1] - y))
+
+    def _applyGeometry(self):
+        rect = getattr(self, "rect", None)
+        if rect is not None:
+            x, y = self.lower_left
+            rect.setRect(QRectF(x, y, self.upper_right[0] - x, self.upper_right[1] - y))
+
+
+def _mark_dirty(item):
+    """Reports a changed graphics item to the views that track dirty regions, see `QCadvasWidget.setMinimalUpdate`."""
+    scene = item.scene()
+    if scene is None:
+        return
+    for view in scene.views():
+        mark_dirty_rect = getattr(view, "markDirtyRect", None)
+        if mark_dirty_rect is not None:
+            mark_dirty_rect(item.sceneBoundingRect())
 
 
 class ClickablePolygon(QGraphicsPolygonItem):
@@ -239,42 +457,87 @@ class ClickablePolygon(QGraphicsPolygonItem):
         """Handles the mouse press event by changing the brush color."""
         self.setBrush(QBrush(QColor(0, 254, 0)))
         self.update()
+        _mark_dirty(self)
         super().mousePressEvent(event)  # Call parent method to keep default behavior
 
 
 class Polygon(CadItem):
     """Polygon is a closed segment."""
 
-    def __init__(self, points):
+    _graphics_attrs = ("poly",)
+    _geometry_attrs = ("points",)
+    _style_attrs = ("hatch",)
+
+    _bounds = None
+    _hatch_bucket = None
+
+    def __init__(self, points, hatch: Hatch = None):
         """Initializes an instance of the class with the given points.
 
         Args:
             points (iterable): A collection of points to initialize the instance with.
+            hatch (Hatch, optional): The hatch or fill of the polygon. Defaults to None (not filled).
         """
         self.points = points
+        self.hatch = hatch
 
     def createItems(self, target: pg.PlotWidget, do_bounds=False):
         """Creates graphical items for the given target PlotWidget and adds them to it."""
         self.poly = ClickablePolygon(self.points)  # Use our custom subclass
+        if self.hatch is not None:
+            self._hatch_bucket = None
+            _update_hatch(self, self.poly, target)
         target.addItem(self.poly)
 
     def updateItems(self, target: pg.PlotWidget):
-        """Updates the items in the specified PlotWidget target."""
-        pass
+        """Updates the items in the specified PlotWidget target.
+
+        The hatch brush is replaced if the zoom level moved into another scale bucket.
+        """
+        if self.hatch is not None and getattr(self, "poly", None) is not None:
+            _update_hatch(self, self.poly, target)
+
+    def bounds(self):
+        """Returns the bounding box (xmin, ymin, xmax, ymax) of the polygon."""
+        if self._bounds is not None:
+            return self._bounds
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def draw(self, painter: QPainter):
+        """Paints the polygon with the given painter."""
+        painter.setPen(QPen())
+        painter.setBrush(_fill_brush(self, painter))
+        painter.drawPolygon(QPolygonF([QPointF(*p) for p in self.points]))
+
+    def _applyGeometry(self):
+        self._bounds = None
+        poly = getattr(self, "poly", None)
+        if poly is not None:
+            poly.setPolygon(QPolygonF([QPointF(*p) for p in self.points]))
 
 
 class Circle(CadItem):
     """Polygon is a closed segment."""
 
-    def __init__(self, center, radius):
+    _graphics_attrs = ("circle",)
+    _geometry_attrs = ("center", "radius")
+    _style_attrs = ("hatch",)
+
+    _hatch_bucket = None
+
+    def __init__(self, center, radius, hatch: Hatch = None):
         """Initialize a new instance of the class.
 
         Args:
             center (tuple or list): The coordinates of the center point.
             radius (float): The radius of the element.
+            hatch (Hatch, optional): The hatch or fill of the circle. Defaults to None (not filled).
         """
         self.center = center
         self.radius = radius
+        self.hatch = hatch
 
     def createItems(self, target: pg.PlotWidget, do_bounds=False):
         """Creates and adds graphical items to the specified PlotWidget.
@@ -301,20 +564,41 @@ class Circle(CadItem):
             2 * self.radius,
         )
         pen = self.circle.pen()
-        pen.setWidthF(0.1)
+        pen.setWidthF(LINE_WIDTH)
         self.circle.setPen(pen)
+        if self.hatch is not None:
+            self._hatch_bucket = None
+            _update_hatch(self, self.circle, target)
         target.addItem(self.circle, ignoreBounds=not do_bounds)
 
     def updateItems(self, target: pg.PlotWidget):
         """Updates the items in the given PlotWidget target.
 
-        This method is intended to modify or refresh the graphical elements
-        displayed in the specified PlotWidget.
+        The hatch brush is replaced if the zoom level moved into another scale bucket.
 
         Args:
             target (pg.PlotWidget): The PlotWidget instance to update.
         """
-        pass
+        if self.hatch is not None and getattr(self, "circle", None) is not None:
+            _update_hatch(self, self.circle, target)
+
+    def bounds(self):
+        """Returns the bounding box (xmin, ymin, xmax, ymax) of the circle."""
+        x, y = self.center
+        r = self.radius
+        return (x - r, y - r, x + r, y + r)
+
+    def draw(self, painter: QPainter):
+        """Paints the circle with the given painter."""
+        painter.setPen(_line_pen())
+        painter.setBrush(_fill_brush(self, painter))
+        painter.drawEllipse(QPointF(*self.center), self.radius, self.radius)
+
+    def _applyGeometry(self):
+        circle = getattr(self, "circle", None)
+        if circle is not None:
+            r = self.radius
+            circle.setRect(self.center[0] - r, self.center[1] - r, 2 * r, 2 * r)
 
 
 class Measure(CadItem):
@@ -330,17 +614,31 @@ class Measure(CadItem):
             Initializes a measurement object with a start point, end point, and optional offset.
             Raises a warning if the distance between start and end points is zero.
         createItems(target: pg.PlotWidget, do_bounds=False):
-            Creates and adds graphical items to a target `pg.PlotWidget` for visual representation.
-            Generates lines, arrows, and text to represent the measurement.
+            Registers the measurement with a target `pg.PlotWidget`. The lines, arrows and text that represent
+            the measurement are only created once the measurement is in view. The text is drawn by the label
+            renderer of the target (`measureLabels`) if it has one, and by a `pg.TextItem` otherwise.
         updateItems(target: pg.PlotWidget):
-            Updates the visibility of graphical items based on their presence within the view
-            range of the target `pg.PlotWidget`.
+            Creates the graphical items when the measurement comes into view for the first time and
+            updates their visibility based on the view range of the target `pg.PlotWidget`.
+        releaseItems(target: pg.PlotWidget):
+            Removes the graphical items again; they are re-created when the measurement comes into view.
         in_view(x, y, target: pg.PlotWidget) -> bool:
             Determines whether a given point (x, y) is within the view range of the target
             `pg.PlotWidget`.
         Warning: If the distance between the start and end points is zero, a warning is issued
     """
 
+    _graphics_attrs = ("line", "mark_start", "mark_end", "offset_start", "offset_end", "textitem")
+    _style_attrs = ()
+
+    lazy = True
+
+    line = mark_start = mark_end = offset_start = offset_end = textitem = None
+
+    # The label renderer of the target that draws the distance, see `cadvas.labels`. Without one, the
+    # distance is drawn by a `pg.TextItem` of its own.
+    _labels = None
+
     def __init__(self, start, end, offset=0):
         """Initializes a measurement object with a start point, end point, and optional offset.
 
@@ -362,6 +660,7 @@ class Measure(CadItem):
             ndy (float): The normalized y-component of the direction vector from start to end.
             angle (float): The angle of the measurement in degrees, measured counterclockwise
                            from the positive x-axis.
+            visible (bool): Whether the measurement was in view at the last update.
 
         Raises:
             Warning: If the distance between start and end points is zero, a warning is issued
@@ -369,39 +668,123 @@ class Measure(CadItem):
         """
         self.start = start
         self.end = end
-
-        dx = start[0] - end[0]
-        dy = start[1] - end[1]
-        self.distance = math.sqrt(dx**2 + dy**2)
-
-        if self.distance == 0:
+        self.visible = False
+        self._do_bounds = False
+        self._offset_length = offset
+        self._derived = None
+        self._invalid = self._isDegenerate()
+
+    def _isDegenerate(self) -> bool:
+        """Returns True, with a warning, if start and end point coincide."""
+        if self.start[0] == self.end[0] and self.start[1] == self.end[1]:
             logger.warning("Can not create a measurement with length 0")
-            self._invalid = True
-            return
+            return True
+        return False
 
-        self._invalid = False
+    def _derive(self) -> tuple:
+        """Returns distance, offset vector, midpoint, direction and angle, computed once per geometry.
 
-        ndx = dx / self.distance
-        ndy = dy / self.distance
+        Most measurements of a large drawing are never shown, so these values are only computed when the graphics
+        items, the label or an export need them. `setGeometry` discards them.
+        """
+        derived = self._derived
+        if derived is not None:
+            return derived
 
-        self.offset = (-offset * ndy, offset * ndx)
+        start, end = self.start, self.end
+        dx = start[0] - end[0]
+        dy = start[1] - end[1]
+        distance = math.hypot(dx, dy)
+        if self._invalid or distance == 0:
+            derived = (distance, (0.0, 0.0), (0.5 * (start[0] + end[0]), 0.5 * (start[1] + end[1])), 0.0, 0.0, 0.0)
+        else:
+            ndx = dx / distance
+            ndy = dy / distance
+            offset = (-self._offset_length * ndy, self._offset_length * ndx)
+            midpoint = (0.5 * (start[0] + end[0]) + offset[0], 0.5 * (start[1] + end[1]) + offset[1])
+            derived = (distance, offset, midpoint, ndx, ndy, math.degrees(math.atan2(dy, dx)))
+        self._derived = derived
+        return derived
+
+    @property
+    def distance(self) -> float:
+        """The distance between the start and end points."""
+        return self._derive()[0]
+
+    @property
+    def offset(self) -> tuple:
+        """The offset vector of the measurement line, (0, 0) for invalid measurements."""
+        return self._derive()[1]
+
+    @property
+    def midpoint(self) -> tuple:
+        """The midpoint of the measurement line, where the label is placed."""
+        return self._derive()[2]
+
+    @property
+    def ndx(self) -> float:
+        """The normalized x-component of the direction vector from end to start."""
+        return self._derive()[3]
+
+    @property
+    def ndy(self) -> float:
+        """The normalized y-component of the direction vector from end to start."""
+        return self._derive()[4]
+
+    @property
+    def angle(self) -> float:
+        """The angle of the measurement in degrees, counterclockwise from the positive x-axis."""
+        return self._derive()[5]
+
+    def geometry(self) -> dict:
+        """Returns the geometry of the measurement.
 
-        self.midpoint = (
-            0.5 * (start[0] + end[0]) + self.offset[0],
-            0.5 * (start[1] + end[1]) + self.offset[1],
-        )
+        Returns:
+            dict: `start`, `end` and the scalar `offset`, as passed to the constructor.
+        """
+        return {"start": self.start, "end": self.end, "offset": self._offset_length}
 
-        self.ndx = ndx
-        self.ndy = ndy
+    def setGeometry(self, **changes):
+        """Changes start, end or offset of the measurement and updates existing graphics items in place.
 
-        self.angle = math.degrees(math.atan2(dy, dx))
+        Args:
+            **changes: New values for `start`, `end` or the scalar `offset`.
+
+        Raises:
+            TypeError: If an argument is not part of the geometry of the measurement.
+        """
+        geometry = self.geometry()
+        for name in changes:
+            if name not in geometry:
+                raise TypeError(name)
+        geometry.update(changes)
+        self.start = geometry["start"]
+        self.end = geometry["end"]
+        self._offset_length = geometry["offset"]
+        self._derived = None
+        self._invalid = self._isDegenerate()
+        self._applyGeometry()
+
+    def _applyGeometry(self):
+        if self.line is None:
+            return
+        if self._invalid:
+            for item in self.graphicsItems():
+                item.setVisible(False)
+            if self._labels is not None:
+                self._labels.removeLabel(self)
+            return
+        self._placeItems()
 
     def createItems(self, target: pg.PlotWidget, do_bounds=False):
-        """Creates and adds graphical items to a target PlotWidget for visual representation.
+        """Registers the measurement with a target PlotWidget.
 
-        This method generates various graphical elements such as lines, arrows, and text
-        to represent measurements or annotations. The items are positioned and styled
-        based on the object's attributes and added to the specified target PlotWidget.
+        The graphical items (lines, arrows and text) are created right away if the measurement is
+        in view of the target. Otherwise their creation is postponed to the first call of `updateItems`
+        in which the measurement is in view.
+
+        Graphical items that are no longer part of a scene, e.g. because their layer was cleared, are
+        dropped and created again.
 
         Args:
             target (pg.PlotWidget): The PlotWidget to which the graphical items will be added.
@@ -411,17 +794,18 @@ class Measure(CadItem):
         Returns:
             None
         """
-        if self._invalid:
-            return
+        if self.line is not None and (not isValid(self.line) or self.line.scene() is None):
+            self._dropItems()
+        self._do_bounds = do_bounds
+        self.updateItems(target)
 
-        self.line = QGraphicsLineItem(
-            self.start[0] + self.offset[0],
-            self.start[1] + self.offset[1],
-            self.end[0] + self.offset[0],
-            self.end[1] + self.offset[1],
-        )
+    def _materialize(self, target: pg.PlotWidget):
+        """Creates the graphical items of the measurement and adds them to the target."""
+        do_bounds = self._do_bounds
+
+        self.line = QGraphicsLineItem()
         pen = self.line.pen()
-        pen.setWidthF(0.1)
+        pen.setWidthF(LINE_WIDTH)
         pen.setColor(MEASURE_COLOR)
         self.line.setPen(pen)
 
@@ -447,15 +831,21 @@ class Measure(CadItem):
             pen=pen,
         )
 
-        self.mark_start.setPos(self.start[0] + self.offset[0], self.start[1] + self.offset[1])
-        self.mark_end.setPos(self.end[0] + self.offset[0], self.end[1] + self.offset[1])
-
-        self.offset_start = QGraphicsLineItem(*self.end, *self.end)
-        self.offset_end = QGraphicsLineItem(*self.end, *self.end)
+        self.offset_start = QGraphicsLineItem()
+        self.offset_end = QGraphicsLineItem()
 
         self.offset_start.setPen(pen)
         self.offset_end.setPen(pen)
 
+        measure_labels = getattr(target, "measureLabels", None)
+        if measure_labels is not None:
+            self._labels = measure_labels()
+        else:
+            self.textitem = pg.TextItem(f"{self.distance:.2f}", anchor=(0.5, 0.5), fill=(254, 254, 254))
+            self.textitem.setColor(MEASURE_COLOR)
+
+        self._placeItems()
+
         target.addItem(self.line, ignoreBounds=not do_bounds)
 
         target.addItem(self.mark_start, ignoreBounds=not do_bounds)
@@ -463,31 +853,53 @@ class Measure(CadItem):
         target.addItem(self.offset_start, ignoreBounds=not do_bounds)
         target.addItem(self.offset_end, ignoreBounds=not do_bounds)
 
-        self.textitem = pg.TextItem(f"{self.distance:.2f}", anchor=(0.5, 0.5), fill=(254, 254, 254))
-        self.textitem.setPos(*self.midpoint)
+        if self.textitem is not None:
+            target.addItem(self.textitem, ignoreBounds=not do_bounds)
 
-        if self.angle > 90 or self.angle < -90:
-            self.textitem.setAngle(self.angle - 180)
-        else:
-            self.textitem.setAngle(self.angle)
+    def _placeItems(self):
+        """Moves the existing graphical items to the current geometry of the measurement."""
+        sx, sy = self.start[0] + self.offset[0], self.start[1] + self.offset[1]
+        ex, ey = self.end[0] + self.offset[0], self.end[1] + self.offset[1]
 
-        self.textitem.setColor(MEASURE_COLOR)
+        self.line.setLine(sx, sy, ex, ey)
 
-        target.addItem(self.textitem, ignoreBounds=not do_bounds)
+        if self.mark_end.opts["angle"] != -self.angle:
+            self.mark_start.setStyle(angle=180 - self.angle)
+            self.mark_end.setStyle(angle=-self.angle)
+        self.mark_start.setPos(sx, sy)
+        self.mark_end.setPos(ex, ey)
 
-        self.offset_start.setLine(
-            self.start[0],
-            self.start[1],
-            self.start[0] + self.offset[0],
-            self.start[1] + self.offset[1],
-        )
+        self.offset_start.setLine(self.start[0], self.start[1], sx, sy)
+        self.offset_end.setLine(self.end[0], self.end[1], ex, ey)
 
-        self.offset_end.setLine(
-            self.end[0],
-            self.end[1],
-            self.end[0] + self.offset[0],
-            self.end[1] + self.offset[1],
-        )
+        if self.textitem is not None:
+            self.textitem.setText(f"{self.distance:.2f}")
+            self.textitem.setPos(*self.midpoint)
+            self.textitem.setAngle(self._labelAngle())
+        else:
+            self._showLabel()
+
+    def _labelAngle(self):
+        """Returns the angle of the label, turned so that the text is never upside down."""
+        if self.angle > 90 or self.angle < -90:
+            return self.angle - 180
+        return self.angle
+
+    def _showLabel(self):
+        """Shows or hides the label in the label renderer of the target, depending on the visibility."""
+        if self.visible:
+            self._labels.setLabel(self, self.midpoint, self._labelAngle(), f"{self.distance:.2f}")
+        else:
+            self._labels.removeLabel(self)
+
+    def bounds(self):
+        """Returns the bounding box (xmin, ymin, xmax, ymax) of the measured points and the offset measurement line."""
+        xs = [self.start[0], self.end[0]]
+        ys = [self.start[1], self.end[1]]
+        if not self._invalid:
+            xs += [self.start[0] + self.offset[0], self.end[0] + self.offset[0]]
+            ys += [self.start[1] + self.offset[1], self.end[1] + self.offset[1]]
+        return (min(xs), min(ys), max(xs), max(ys))
 
     @staticmethod
     def _unpack_coordinates(coords):
@@ -507,24 +919,46 @@ class Measure(CadItem):
         Behavior:
             - Checks if the start and end points of the element are within the view range of the target.
             - If both points are within the view, sets all associated graphical items (marks, offsets, line, and text) to visible.
+              The items are created the first time this happens.
             - If either point is outside the view, hides all associated graphical items.
         """
         if self._invalid:
             return
 
         view_range = target.viewRect()
-        length = max(view_range.width(), view_range.height())
-        logger.debug(f"Measure length: {length}")
+        left, right = view_range.left(), view_range.right()
+        top, bottom = view_range.top(), view_range.bottom()
 
         # Unpack both self.start and self.end using the helper function
         x1, y1 = self._unpack_coordinates(self.start)
         x2, y2 = self._unpack_coordinates(self.end)
 
-        visible = bool(self.in_view(x1, y1, target) and self.in_view(x2, y2, target))
+        visible = left <= x1 <= right and top <= y1 <= bottom and left <= x2 <= right and top <= y2 <= bottom
+        self.visible = visible
+
+        if self.line is None:
+            if not visible:
+                return
+            self._materialize(target)
 
         self.mark_start.setVisible(visible)
         self.mark_end.setVisible(visible)
         self.offset_start.setVisible(visible)
         self.offset_end.setVisible(visible)
         self.line.setVisible(visible)
-        self.textitem.setVisible(visible)
+        if self.textitem is not None:
+            self.textitem.setVisible(visible)
+        else:
+            self._showLabel()
+
+    def _detach(self):
+        if self._labels is not None and isValid(self._labels):
+            self._labels.removeLabel(self)
+
+    def _sharedSceneRects(self):
+        rect = None if self._labels is None else self._labels.labelSceneRect(self)
+        return [] if rect is None else [rect]
+
+    def _dropItems(self):
+        super()._dropItems()
+        self._labels = None
@@ -0,0 +1,374 @@
+"""This module exports drawings to SVG and PDF directly from the element geometry.
+
+The exporters read the coordinates of the elements (`Segment` endpoints, `Box` corners, `Circle` center and radius,
+`Polygon` points, `Measure` start, end and offset, and block inserts) and write them one element at a time. No
+graphics items and no `QCadvasWidget` are needed. SVG export streams to the file and runs with constant memory for
+drawings of any size. PDF export does not: `QPdfWriter` keeps the content of the page in memory until the page is
+finished, so its memory grows with the drawing, by about 80 MB for 200k elements.
+
+Line widths are in drawing units, like on screen. Measure arrows and labels have a fixed size on screen; in the
+export they have a fixed size in output units, as if the drawing was shown at `width` pixels wide.
+
+Functions:
+    export_svg(items, file, bounds=None, width=1000, margin=10, arrow_length=10, font_size=12):
+        Writes the elements as an SVG document.
+    export_pdf(items, filename, bounds=None, width=1000, margin=10, arrow_length=10, font_size=12):
+        Writes the elements as a single-page PDF document.
+Usage:
+    `items` may be any iterable of elements, including a generator. The size of the document is derived from the
+    bounding box of the elements; for a generator the bounding box must be passed as `bounds`, because the elements
+    can be iterated only once.
+
+Example:
+    export_svg(widget._items, "drawing.svg")
+    export_pdf(read_elements(path), "drawing.pdf", bounds=(0, 0, 1000, 500))
+"""
+
+import math
+import os
+
+from PySide6.QtCore import QMarginsF, QPointF, QRectF, QSizeF, Qt
+from PySide6.QtGui import QBrush, QColor, QFont, QPageSize, QPainter, QPdfWriter, QPen, QPolygonF, QTransform
+
+from .blocks import Insert
+from .elements import LINE_WIDTH, MEASURE_COLOR, Box, Circle, Measure, Polygon, Segment
+
+BACKGROUND_COLOR = QColor(254, 254, 254)
+
+# same shape as the pg.ArrowItem of a Measure
+ARROW_TIP_ANGLE = 30
+ARROW_BASE_ANGLE = 20
+
+
+def _drawing_bounds(items, bounds):
+    """Returns the bounds of the drawing, computing them from the items if needed."""
+    if bounds is not None:
+        return bounds
+    if iter(items) is items:
+        raise ValueError("bounds")
+    boxes = [item.bounds() for item in items]
+    if not boxes:
+        return (0.0, 0.0, 1.0, 1.0)
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+def _page_transform(bounds, width, margin):
+    """Returns the transform from drawing coordinates (y up) to output coordinates (y down) and the page size."""
+    x0, y0, x1, y1 = bounds
+    scale = width / max(x1 - x0, 1e-12)
+    t = QTransform(scale, 0, 0, -scale, margin - x0 * scale, margin + y1 * scale)
+    return t, (width + 2 * margin, (y1 - y0) * scale + 2 * margin)
+
+
+def _measure_annotation(measure: Measure, t: QTransform, arrow_length):
+    """Returns the arrow heads and label placement of a measure in output coordinates.
+
+    Returns:
+        tuple: (arrows, label, position, angle) with arrows a list of two polygons as lists of (x, y), the label
+            text, the label center and the label angle in degrees, clockwise in output coordinates.
+    """
+    a = t.map(QPointF(measure.start[0] + measure.offset[0], measure.start[1] + measure.offset[1]))
+    b = t.map(QPointF(measure.end[0] + measure.offset[0], measure.end[1] + measure.offset[1]))
+
+    dx, dy = b.x() - a.x(), b.y() - a.y()
+    length = math.hypot(dx, dy) or 1.0
+    ux, uy = dx / length, dy / length
+
+    half_width = arrow_length * math.tan(math.radians(ARROW_TIP_ANGLE / 2))
+    inner = arrow_length - half_width * math.tan(math.radians(ARROW_BASE_ANGLE / 2))
+
+    arrows = []
+    for tip, (bx, by) in ((a, (ux, uy)), (b, (-ux, -uy))):
+        tx, ty = tip.x(), tip.y()
+        arrows.append(
+            [
+                (tx, ty),
+                (tx + bx * arrow_length - by * half_width, ty + by * arrow_length + bx * half_width),
+                (tx + bx * inner, ty + by * inner),
+                (tx + bx * arrow_length + by * half_width, ty + by * arrow_length - bx * half_width),
+            ]
+        )
+
+    angle = measure.angle - 180 if measure.angle > 90 or measure.angle < -90 else measure.angle
+    return arrows, f"{measure.distance:.2f}", t.map(QPointF(*measure.midpoint)), -angle
+
+
+# ---- SVG
+
+
+# default cap and join style of QPen
+_STROKE_STYLE = 'stroke-linecap="square" stroke-linejoin="bevel" fill="none"'
+
+
+def _f(v):
+    return f"{v:.6g}"
+
+
+def _svg_color(color: QColor):
+    return f"rgb({color.red()},{color.green()},{color.blue()})"
+
+
+class _SvgWriter:
+    """Writes elements as SVG markup to a text file."""
+
+    def __init__(self, out, t, arrow_length, font_size):
+        self.out = out
+        self.t = t
+        self.arrow_length = arrow_length
+        self.font_size = font_size
+        self._blocks = {}  # id(block) -> svg id
+        self._patterns = {}  # (hatch key, scale, flipped) -> svg id
+
+    def _pt(self, x, y, t):
+        p = t.map(QPointF(x, y))
+        return p.x(), p.y()
+
+    def element(self, item, t, scale):
+        """Writes a single element. `t` maps the element coordinates to the coordinates of the enclosing group."""
+        w = _f(LINE_WIDTH * scale)
+        hatch = getattr(item, "hatch", None)
+        style = _STROKE_STYLE if hatch is None else _STROKE_STYLE.replace('fill="none"', self.fill(hatch, t, scale))
+        stroke = f'stroke="black" stroke-width="{w}" {style}'
+        write = self.out.write
+
+        if isinstance(item, Segment):
+            x1, y1 = self._pt(*item.start, t)
+            x2, y2 = self._pt(*item.end, t)
+            write(f'<line x1="{_f(x1)}" y1="{_f(y1)}" x2="{_f(x2)}" y2="{_f(y2)}" {stroke}/>\n')
+        elif isinstance(item, Box):
+            rect = t.mapRect(QRectF(QPointF(*item.lower_left), QPointF(*item.upper_right)).normalized())
+            write(
+                f'<rect x="{_f(rect.x())}" y="{_f(rect.y())}" width="{_f(rect.width())}" '
+                f'height="{_f(rect.height())}" {stroke}/>\n'
+            )
+        elif isinstance(item, Circle):
+            cx, cy = self._pt(*item.center, t)
+            write(f'<circle cx="{_f(cx)}" cy="{_f(cy)}" r="{_f(item.radius * scale)}" {stroke}/>\n')
+        elif isinstance(item, Polygon):
+            points = " ".join(f"{_f(x)},{_f(y)}" for x, y in (self._pt(*p, t) for p in item.points))
+            write(f'<polygon points="{points}" stroke="black" stroke-width="{_f(scale)}" {style}/>\n')
+        elif isinstance(item, Insert):
+            ref = self.block(item.block)
+            m = item.transform() * t
+            write(
+                f'<use href="#{ref}" xlink:href="#{ref}" transform="matrix({_f(m.m11())} {_f(m.m12())} {_f(m.m21())} '
+                f'{_f(m.m22())} {_f(m.dx())} {_f(m.dy())})"/>\n'
+            )
+        elif isinstance(item, Measure):
+            if not item._invalid:
+                self.measure(item, w)
+        else:
+            raise TypeError(type(item).__name__)
+
+    def fill(self, hatch, t, scale):
+        """Returns the fill attribute of a hatch and writes its pattern definition once."""
+        if hatch.spacing is None:
+            if hatch.fill is None:
+                return 'fill="none"'
+            return f'fill="{_svg_color(hatch.fill)}" fill-opacity="{_f(hatch.fill.alphaF())}"'
+
+        flipped = t.determinant() < 0
+        key = (hatch.key(), scale, flipped)
+        ref = self._patterns.get(key)
+        if ref is None:
+            ref = f"hatch{len(self._patterns)}"
+            self._patterns[key] = ref
+            size = _f(hatch.spacing * scale)
+            half = _f(hatch.spacing * scale / 2)
+            line = f'stroke="{_svg_color(hatch.color)}" stroke-width="1"'
+            write = self.out.write
+            write(
+                f'<defs><pattern id="{ref}" patternUnits="userSpaceOnUse" width="{size}" height="{size}" '
+                f'patternTransform="rotate({_f(-hatch.angle if flipped else hatch.angle)})">'
+            )
+            if hatch.fill is not None:
+                write(f'<rect width="{size}" height="{size}" fill="{_svg_color(hatch.fill)}"/>')
+            write(f'<line x1="0" y1="{half}" x2="{size}" y2="{half}" {line}/>')
+            if hatch.cross:
+                write(f'<line x1="{half}" y1="0" x2="{half}" y2="{size}" {line}/>')
+            write("</pattern></defs>\n")
+        return f'fill="url(#{ref})"'
+
+    def block(self, block):
+        """Writes the definition of a block, once, and returns its id."""
+        ref = self._blocks.get(id(block))
+        if ref is not None:
+            return ref
+        for item in block.items:
+            if isinstance(item, Insert):
+                self.block(item.block)
+        ref = f"block{len(self._blocks)}"
+        self._blocks[id(block)] = ref
+        self.out.write(f'<defs><g id="{ref}">\n')
+        for item in block.items:
+            self.element(item, QTransform(), 1.0)
+        self.out.write("</g></defs>\n")
+        return ref
+
+    def measure(self, m: Measure, w):
+        write = self.out.write
+        t = self.t
+        color = _svg_color(MEASURE_COLOR)
+        stroke = f'stroke="{color}" stroke-width="{w}" {_STROKE_STYLE}'
+
+        sx, sy = m.start
+        ex, ey = m.end
+        ox, oy = m.offset
+        for (x1, y1), (x2, y2) in (
+            ((sx + ox, sy + oy), (ex + ox, ey + oy)),
+            ((sx, sy), (sx + ox, sy + oy)),
+            ((ex, ey), (ex + ox, ey + oy)),
+        ):
+            a = t.map(QPointF(x1, y1))
+            b = t.map(QPointF(x2, y2))
+            write(f'<line x1="{_f(a.x())}" y1="{_f(a.y())}" x2="{_f(b.x())}" y2="{_f(b.y())}" {stroke}/>\n')
+
+        # arrows are sized in output units, like the arrows on screen are sized in pixels
+        arrows, label, pos, angle = _measure_annotation(m, t, self.arrow_length)
+        for arrow in arrows:
+            points = " ".join(f"{_f(x)},{_f(y)}" for x, y in arrow)
+            write(f'<polygon points="{points}" stroke="{color}" stroke-width="{_f(LINE_WIDTH)}" fill="none"/>\n')
+
+        tw = 0.6 * self.font_size * len(label) + 4
+        th = 1.2 * self.font_size
+        write(
+            f'<g transform="translate({_f(pos.x())} {_f(pos.y())}) rotate({_f(angle)})">'
+            f'<rect x="{_f(-tw / 2)}" y="{_f(-th / 2)}" width="{_f(tw)}" height="{_f(th)}" '
+            f'fill="{_svg_color(BACKGROUND_COLOR)}"/>'
+            f'<text text-anchor="middle" dominant-baseline="central" font-family="sans-serif" '
+            f'font-size="{_f(self.font_size)}" fill="{color}">{label}</text></g>\n'
+        )
+
+
+def export_svg(items, file, bounds=None, width=1000, margin=10, arrow_length=10, font_size=12):
+    """Writes elements to an SVG document.
+
+    Elements are written one at a time; blocks are written once as definitions and referenced by their inserts.
+
+    Args:
+        items (iterable of CadItem): The elements to export.
+        file (str, path or file object): The file to write to. A file object must be opened in text mode.
+        bounds (tuple, optional): (xmin, ymin, xmax, ymax) of the exported region in drawing coordinates.
+            Defaults to None (the bounds of the items). Required if `items` is an iterator.
+        width (float, optional): Width of the exported region in output units (pixels). Defaults to 1000.
+        margin (float, optional): Margin around the exported region in output units. Defaults to 10.
+        arrow_length (float, optional): Length of the measure arrows in output units. Defaults to 10.
+        font_size (float, optional): Font size of the measure labels in output units. Defaults to 12.
+
+    Raises:
+        ValueError: If `items` is an iterator and no bounds are given.
+        TypeError: If an element can not be exported.
+    """
+    bounds = _drawing_bounds(items, bounds)
+    t, (page_w, page_h) = _page_transform(bounds, width, margin)
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "w", encoding="utf-8") as out:
+            _write_svg(out, items, t, page_w, page_h, arrow_length, font_size)
+    else:
+        _write_svg(file, items, t, page_w, page_h, arrow_length, font_size)
+
+
+def _write_svg(out, items, t, page_w, page_h, arrow_length, font_size):
+    out.write(
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{_f(page_w)}" height="{_f(page_h)}" viewBox="0 0 {_f(page_w)} {_f(page_h)}">\n'
+    )
+    out.write(f'<rect width="100%" height="100%" fill="{_svg_color(BACKGROUND_COLOR)}"/>\n')
+    writer = _SvgWriter(out, t, arrow_length, font_size)
+    scale = t.m11()
+    for item in items:
+        writer.element(item, t, scale)
+    out.write("</svg>\n")
+
+
+# ---- PDF
+
+
+def _draw_measure(painter: QPainter, m: Measure, t: QTransform, arrow_length, font):
+    """Draws a measure; lines in drawing coordinates, arrows and label in output coordinates."""
+    pen = QPen(MEASURE_COLOR)
+    pen.setWidthF(LINE_WIDTH)
+    painter.setPen(pen)
+    painter.setBrush(QBrush())
+
+    sx, sy = m.start
+    ex, ey = m.end
+    ox, oy = m.offset
+    painter.drawLine(QPointF(sx + ox, sy + oy), QPointF(ex + ox, ey + oy))
+    painter.drawLine(QPointF(sx, sy), QPointF(sx + ox, sy + oy))
+    painter.drawLine(QPointF(ex, ey), QPointF(ex + ox, ey + oy))
+
+    arrows, label, pos, angle = _measure_annotation(m, t, arrow_length)
+
+    painter.save()
+    painter.resetTransform()
+    pen.setWidthF(LINE_WIDTH)
+    painter.setPen(pen)
+    for arrow in arrows:
+        painter.drawPolygon(QPolygonF([QPointF(x, y) for x, y in arrow]))
+
+    painter.translate(pos)
+    painter.rotate(angle)
+    painter.setFont(font)
+    box = QRectF(painter.fontMetrics().boundingRect(label)).adjusted(-2, 0, 2, 0)
+    box.moveCenter(QPointF(0, 0))
+    painter.fillRect(box, BACKGROUND_COLOR)
+    painter.drawText(box, Qt.AlignmentFlag.AlignCenter, label)
+    painter.restore()
+
+
+def export_pdf(items, filename, bounds=None, width=1000, margin=10, arrow_length=10, font_size=12):
+    """Writes elements to a single-page PDF document.
+
+    The page is sized to fit the drawing; one output unit is one PDF point. Elements are painted one at a time
+    and block inserts replay the shared block picture. A `QGuiApplication` must exist.
+
+    Unlike `export_svg`, this does not run in constant memory: `QPdfWriter` keeps the content of the page in memory
+    until the document is finished.
+
+    Args:
+        items (iterable of CadItem): The elements to export.
+        filename (str or path): The file to write to.
+        bounds (tuple, optional): (xmin, ymin, xmax, ymax) of the exported region in drawing coordinates.
+            Defaults to None (the bounds of the items). Required if `items` is an iterator.
+        width (float, optional): Width of the exported region in points. Defaults to 1000.
+        margin (float, optional): Margin around the exported region in points. Defaults to 10.
+        arrow_length (float, optional): Length of the measure arrows in points. Defaults to 10.
+        font_size (float, optional): Font size of the measure labels in points. Defaults to 12.
+
+    Raises:
+        ValueError: If `items` is an iterator and no bounds are given.
+        TypeError: If an element can not be exported.
+    """
+    bounds = _drawing_bounds(items, bounds)
+    t, (page_w, page_h) = _page_transform(bounds, width, margin)
+
+    writer = QPdfWriter(str(filename))
+    writer.setResolution(72)
+    writer.setPageSize(QPageSize(QSizeF(page_w, page_h), QPageSize.Unit.Point))
+    writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+
+    font = QFont()
+    font.setPixelSize(round(font_size))
+
+    painter = QPainter(writer)
+    try:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(QRectF(0, 0, page_w, page_h), BACKGROUND_COLOR)
+        painter.setTransform(t)
+        for item in items:
+            if isinstance(item, Measure):
+                if not item._invalid:
+                    _draw_measure(painter, item, t, arrow_length, font)
+            elif isinstance(item, (Segment, Box, Circle, Polygon, Insert)):
+                item.draw(painter)
+            else:
+                raise TypeError(type(item).__name__)
+    finally:
+        painter.end()
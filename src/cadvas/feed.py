@@ -0,0 +1,268 @@
+"""This module defines the `DrawingFeed` class.
+
+A drawing feed applies a stream of add/update/remove deltas to a `QCadvasWidget`. Deltas can be submitted from any
+thread or from an asyncio coroutine. They are coalesced per key and applied in batches once per frame on the GUI
+thread, so a producer that emits hundreds of updates per second does not trigger hundreds of redraws.
+
+Classes:
+    DrawingFeed: Collects deltas from producers and applies them to a widget in batches.
+Usage:
+    Every element in the feed is identified by a hashable key chosen by the producer. Setting a key adds the element
+    or replaces the element that was previously set for that key; removing a key removes its element. When several
+    deltas for the same key arrive within one frame only the last one is applied. An element that replaces one of the
+    same type, with the same style and on the same layer, is applied as a geometry change of the shown element with
+    `QCadvasWidget.modifyCadItems`, so its graphics items are updated in place instead of being re-created.
+
+    Elements that are removed from the widget by other means, for example by `QCadvasWidget.clearDrawing`, are
+    forgotten by the feed; setting their key again adds a new element.
+
+    The number of pending keys is bounded by `max_pending`. When the GUI falls behind, `set` and `remove` block (or
+    return False when called with `block=False`) and `aset` and `aremove` wait until the next batch has been applied.
+
+    Producers running in a plain thread or `QThread` use the blocking methods. Producers running on an asyncio loop
+    use the coroutine methods; this works both for a loop in a separate thread and for a qasync-style loop that runs
+    inside the Qt event loop. Never call the blocking methods from the GUI thread, they would wait for a flush that
+    can not happen.
+
+Example:
+    feed = DrawingFeed(widget)
+
+    async def consume(reader):
+        async for key, start, end in read_updates(reader):
+            await feed.aset(key, Segment(start, end), layer="live")
+"""
+
+import asyncio
+import threading
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .elements import CadItem
+from .hatch import Hatch
+
+_REMOVE = object()
+
+
+def _style_key(value):
+    """Returns a value to compare a style argument of an element by. Hatches are compared by their style."""
+    return value.key() if isinstance(value, Hatch) else value
+
+
+class DrawingFeed(QObject):
+    """DrawingFeed applies coalesced add/update/remove deltas to a `QCadvasWidget`.
+
+    Methods:
+        set(key, item, layer=None, block=True, timeout=None) -> bool:
+            Adds or replaces the element for `key`.
+        remove(key, block=True, timeout=None) -> bool:
+            Removes the element for `key`.
+        aset(key, item, layer=None), aremove(key):
+            Coroutine versions of `set` and `remove` that wait without blocking the asyncio loop.
+        flush():
+            Applies all pending deltas to the widget. Called by a timer once per frame.
+        items() -> dict:
+            Returns the elements that are currently shown, by key.
+        stop():
+            Stops the frame timer.
+
+    Signals:
+        sigApplied(int): Emitted after a batch was applied, with the number of applied deltas.
+    """
+
+    sigApplied = Signal(int)
+
+    def __init__(self, widget, interval_ms=16, max_pending=10000, parent=None):
+        """Initializes the feed and starts the frame timer.
+
+        Args:
+            widget (QCadvasWidget): The widget to apply the deltas to.
+            interval_ms (int, optional): Time between two batches in milliseconds. Defaults to 16 (about 60 fps).
+            max_pending (int, optional): Maximum number of keys with a pending delta. Defaults to 10000.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.widget = widget
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._pending = {}  # key -> (item or _REMOVE, layer)
+        self._live = {}  # key -> item currently in the widget
+        self._waiters = []  # (loop, future) of coroutines waiting for room
+
+        widget.sigItemsRemoved.connect(self._itemsRemoved)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    # ---- producer side, any thread
+
+    def _put(self, key, value, layer) -> bool:
+        """Stores a delta if there is room. Must be called with the lock held."""
+        if key not in self._pending and len(self._pending) >= self.max_pending:
+            return False
+        self._pending[key] = (value, layer)
+        return True
+
+    def _submit(self, key, value, layer, block, timeout) -> bool:
+        if layer is not None:
+            self.widget.layer(layer)  # raises KeyError for an unknown layer before anything is queued
+        with self._not_full:
+            if self._put(key, value, layer):
+                return True
+            if not block:
+                return False
+            self._not_full.wait_for(
+                lambda: key in self._pending or len(self._pending) < self.max_pending,
+                timeout=timeout,
+            )
+            return self._put(key, value, layer)
+
+    def set(self, key, item: CadItem, layer=None, block=True, timeout=None) -> bool:
+        """Adds the element for `key`, or replaces the element that was set before.
+
+        Args:
+            key (hashable): The key of the element.
+            item (CadItem): The new element. Its graphics items are created when the delta is applied.
+            layer (str, optional): The layer to add the element to. Defaults to None (the view box).
+            block (bool, optional): If True, waits until there is room when too many deltas are pending.
+                Defaults to True.
+            timeout (float, optional): Maximum time to wait in seconds. Defaults to None (wait forever).
+
+        Returns:
+            bool: True if the delta was accepted, False if the feed was full.
+
+        Raises:
+            KeyError: If the layer does not exist.
+        """
+        return self._submit(key, item, layer, block, timeout)
+
+    def remove(self, key, block=True, timeout=None) -> bool:
+        """Removes the element for `key`.
+
+        Args:
+            key (hashable): The key of the element.
+            block (bool, optional): If True, waits until there is room when too many deltas are pending.
+                Defaults to True.
+            timeout (float, optional): Maximum time to wait in seconds. Defaults to None (wait forever).
+
+        Returns:
+            bool: True if the delta was accepted, False if the feed was full.
+        """
+        return self._submit(key, _REMOVE, None, block, timeout)
+
+    async def _asubmit(self, key, value, layer):
+        if layer is not None:
+            self.widget.layer(layer)
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._put(key, value, layer):
+                    return
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            await future
+
+    async def aset(self, key, item: CadItem, layer=None):
+        """Coroutine version of `set`, waits for room without blocking the event loop."""
+        await self._asubmit(key, item, layer)
+
+    async def aremove(self, key):
+        """Coroutine version of `remove`, waits for room without blocking the event loop."""
+        await self._asubmit(key, _REMOVE, None)
+
+    # ---- consumer side, GUI thread
+
+    @staticmethod
+    def _wake(future):
+        if not future.done():
+            future.set_result(None)
+
+    def flush(self):
+        """Applies all pending deltas to the widget in one batch.
+
+        Removals are applied first with a single call to `removeCadItems`, then in-place updates with a single call
+        to `modifyCadItems`, and finally additions, grouped per layer, with `addCadItems`. The elements returned by
+        `items` are only changed after the widget accepted them.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            waiters = self._waiters
+            self._waiters = []
+            self._not_full.notify_all()
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(self._wake, future)
+
+        if not pending:
+            return
+
+        to_remove, to_modify, to_add = self._classify(pending)
+        if to_remove:
+            self.widget.removeCadItems([self._live[key] for key in to_remove])
+            for key in to_remove:
+                self._live.pop(key, None)  # already dropped by `_itemsRemoved` if the widget still held the element
+        if to_modify:
+            self.widget.modifyCadItems(to_modify)
+        for layer, added in to_add.items():
+            self.widget.addCadItems([value for _, value in added], layer=layer)
+            self._live.update(added)
+
+        self.sigApplied.emit(len(pending))
+
+    def _itemsRemoved(self, items):
+        """Forgets the keys of elements that were removed from the widget."""
+        if not self._live:
+            return
+        removed = {id(p) for p in items}
+        self._live = {key: item for key, item in self._live.items() if id(item) not in removed}
+
+    def _classify(self, pending):
+        """Splits pending deltas into removals, in-place updates and additions.
+
+        Returns:
+            tuple: The keys to remove, (shown element, new geometry) pairs and lists of (key, element) per layer.
+        """
+        to_remove = []
+        to_modify = []
+        to_add = {}
+        for key, (value, layer) in pending.items():
+            old = self._live.get(key)
+            if value is _REMOVE:
+                if old is not None:
+                    to_remove.append(key)
+            elif old is not None and self._updatable(old, value, layer):
+                to_modify.append((old, value.geometry()))
+            else:
+                if old is not None:
+                    to_remove.append(key)
+                to_add.setdefault(layer, []).append((key, value))
+        return to_remove, to_modify, to_add
+
+    def _updatable(self, old: CadItem, new: CadItem, layer) -> bool:
+        """Whether the shown element `old` can take over the geometry of `new` instead of being replaced by it."""
+        if not self.widget.hasCadItem(old):
+            return False
+        if old is not new:
+            if type(old) is not type(new) or old._style_attrs is None:
+                return False
+            if any(_style_key(getattr(old, name)) != _style_key(getattr(new, name)) for name in old._style_attrs):
+                return False
+        shown = self.widget.layerOf(old)
+        return (shown is None) if layer is None else (shown is not None and shown.name == layer)
+
+    def items(self) -> dict:
+        """Returns the elements that are currently shown by the feed, by key.
+
+        After an in-place update, the shown element is the one that was set first for the key, with the geometry of
+        the element that was set last.
+        """
+        return dict(self._live)
+
+    def stop(self):
+        """Stops the frame timer. Pending deltas are applied one last time."""
+        self._timer.stop()
+        self.flush()
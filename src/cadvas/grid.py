@@ -0,0 +1,147 @@
+"""This module defines the `GridItem` class, an adaptive reference grid.
+
+The grid is not made of CAD items. It is a single graphics item that covers the visible range of its view box and
+computes the grid lines on every paint: only the lines inside the view are drawn, with a spacing chosen from the
+current zoom, so the cost of the grid depends on the size of the viewport and not on the extent of the drawing.
+
+Classes:
+    GridItem: A grid with adaptive minor and major spacing and the two axes.
+Functions:
+    grid_spacing(pixel_size, min_spacing): Returns the minor and major spacing for a pixel size.
+Usage:
+    The grid is normally shown with `QCadvasWidget.showGrid`. It can also be added to any `pg.ViewBox` with
+    `ignoreBounds=True`.
+
+Example:
+    widget = QCadvasWidget()
+    widget.showGrid()
+    minor, major = widget.grid.spacing()
+"""
+
+import math
+
+import pyqtgraph as pg
+from PySide6.QtCore import QLineF, QRectF
+from PySide6.QtGui import QPen
+
+GRID_MINOR_COLOR = (232, 232, 232)
+GRID_MAJOR_COLOR = (205, 205, 205)
+GRID_AXIS_COLOR = (150, 150, 150)
+
+
+def grid_spacing(pixel_size, min_spacing=12):
+    """Returns the minor and major grid spacing for a zoom level.
+
+    The minor spacing is the smallest value of the 1-2-5 sequence (..., 0.1, 0.2, 0.5, 1, 2, 5, 10, ...) that is at
+    least `min_spacing` pixels wide. Major lines are drawn every 5 minor lines for a mantissa of 1 or 2 and every
+    2 minor lines for a mantissa of 5, so major lines always fall on 5 or 10 times a power of ten.
+
+    Args:
+        pixel_size (float): The size of one screen pixel in drawing units.
+        min_spacing (float, optional): Minimum distance between minor lines in pixels. Defaults to 12.
+
+    Returns:
+        tuple: (minor, major) spacing in drawing units.
+    """
+    target = pixel_size * min_spacing
+    exponent = math.floor(math.log10(target))
+    base = 10.0**exponent
+    for mantissa, every in ((1, 5), (2, 5), (5, 2), (10, 5)):
+        if mantissa * base >= target:
+            minor = mantissa * base
+            return minor, minor * every
+    raise AssertionError  # pragma: no cover
+
+
+class GridItem(pg.GraphicsObject):
+    """GridItem draws minor grid lines, major grid lines and the axes of the visible range in one paint call.
+
+    Methods:
+        spacing() -> tuple:
+            Returns the (minor, major) spacing at the current zoom.
+        setMinSpacing(pixels):
+            Sets the minimum distance between minor lines in pixels.
+    """
+
+    def __init__(
+        self, min_spacing=12, minor_color=GRID_MINOR_COLOR, major_color=GRID_MAJOR_COLOR, axis_color=GRID_AXIS_COLOR
+    ):
+        """Initializes the grid.
+
+        Args:
+            min_spacing (float, optional): Minimum distance between minor lines in pixels. Defaults to 12.
+            minor_color (optional): Color of the minor lines. Anything accepted by `pg.mkColor` can be used.
+            major_color (optional): Color of the major lines.
+            axis_color (optional): Color of the x and y axis.
+        """
+        super().__init__()
+        self._min_spacing = min_spacing
+        self._rect = QRectF()
+        self._pens = [self._makePen(c) for c in (minor_color, major_color, axis_color)]
+
+    @staticmethod
+    def _makePen(color):
+        pen = QPen(pg.mkColor(color))
+        pen.setCosmetic(True)
+        pen.setWidth(0)
+        return pen
+
+    def setMinSpacing(self, pixels):
+        """Sets the minimum distance between minor lines in pixels."""
+        self._min_spacing = pixels
+        self.update()
+
+    def spacing(self):
+        """Returns the (minor, major) spacing at the current zoom, or None if the grid is not in a view box."""
+        vb = self.getViewBox()
+        if vb is None:
+            return None
+        pixel_size = max(vb.viewPixelSize())
+        if not pixel_size > 0:
+            return None
+        return grid_spacing(pixel_size, self._min_spacing)
+
+    def viewRangeChanged(self):
+        """Follows the visible range of the view box."""
+        vb = self.getViewBox()
+        if vb is None:
+            return
+        self.prepareGeometryChange()
+        self._rect = vb.viewRect()
+        self.update()
+
+    viewTransformChanged = viewRangeChanged
+
+    def boundingRect(self):
+        """Returns the visible range of the view box."""
+        return self._rect
+
+    @staticmethod
+    def _kind(i, every):
+        """Returns 0 for a minor line, 1 for a major line and 2 for an axis at index `i`."""
+        if i == 0:
+            return 2
+        return 1 if i % every == 0 else 0
+
+    def paint(self, painter, option, widget=None):
+        """Paints the grid lines inside the visible range."""
+        spacing = self.spacing()
+        rect = self._rect
+        if spacing is None or rect.isEmpty():
+            return
+        minor, major = spacing
+        every = round(major / minor)
+        left, right, top, bottom = rect.left(), rect.right(), rect.top(), rect.bottom()
+
+        lines = ([], [], [])  # minor, major, axes
+        for i in range(math.ceil(left / minor), math.floor(right / minor) + 1):
+            x = i * minor
+            lines[self._kind(i, every)].append(QLineF(x, top, x, bottom))
+        for i in range(math.ceil(top / minor), math.floor(bottom / minor) + 1):
+            y = i * minor
+            lines[self._kind(i, every)].append(QLineF(left, y, right, y))
+
+        for pen, batch in zip(self._pens, lines, strict=True):
+            if batch:
+                painter.setPen(pen)
+                painter.drawLines(batch)
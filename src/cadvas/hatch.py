@@ -0,0 +1,146 @@
+"""This module defines hatch and fill styles for closed elements.
+
+A hatch is drawn with a texture brush instead of line items. The texture holds a single hatch line (two for a cross
+hatch) and is tiled by Qt while filling the shape; the brush transform scales the texture to the hatch spacing and
+rotates it to the hatch angle. To keep the lines about one pixel wide at every zoom level, the texture resolution is
+picked from a small set of scale buckets: the number of texels between two lines is the power of two closest to the
+on-screen spacing. Brushes are cached per hatch style and bucket and shared by all elements, so a hatched region
+costs one brush fill per paint, no matter how many hatch lines it shows.
+
+Classes:
+    Hatch: The hatch or fill style of an element.
+Functions:
+    hatch_bucket(hatch, pixel_size): Returns the scale bucket of a hatch at a zoom level.
+    hatch_brush(hatch, pixel_size): Returns the cached brush of a hatch at a zoom level.
+    clear_cache(): Drops all cached brushes.
+Usage:
+    `Polygon`, `Box` and `Circle` accept a `hatch` argument. Elements re-pick their brush in `updateItems` only
+    when the zoom level moved into another bucket.
+
+Example:
+    section = Hatch(angle=45, spacing=0.5, color=(80, 80, 80))
+    widget.addCadItem(Polygon(points, hatch=section))
+    widget.addCadItem(Box((0, 0), (4, 2), hatch=Hatch(spacing=None, fill=(220, 220, 255))))
+"""
+
+import math
+
+import pyqtgraph as pg
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QBrush, QImage, QPainter, QTransform
+
+MIN_TEXTURE_SPACING = 4
+MAX_TEXTURE_SPACING = 1024
+
+_brushes = {}
+
+
+class Hatch:
+    """Hatch describes parallel or crossed hatch lines and an optional solid fill.
+
+    Attributes:
+        angle (float): Counter-clockwise angle of the hatch lines in degrees.
+        spacing (float or None): Distance between two hatch lines in drawing units. If None, only the fill is drawn.
+        color (QColor): Color of the hatch lines.
+        cross (bool): Whether a second set of lines is drawn perpendicular to the first.
+        fill (QColor or None): Color of the background of the hatch, or None for a transparent background.
+    """
+
+    def __init__(self, angle=45.0, spacing=1.0, color=(0, 0, 0), cross=False, fill=None):
+        """Initializes a hatch style.
+
+        Args:
+            angle (float, optional): Counter-clockwise angle of the hatch lines in degrees. Defaults to 45.
+            spacing (float, optional): Distance between two hatch lines in drawing units. If None, only the fill
+                is drawn. Defaults to 1.
+            color (optional): Color of the hatch lines, anything accepted by `pg.mkColor`. Defaults to black.
+            cross (bool, optional): Whether to draw a cross hatch. Defaults to False.
+            fill (optional): Background color, anything accepted by `pg.mkColor`. Defaults to None (transparent).
+
+        Raises:
+            ValueError: If the spacing is not positive.
+        """
+        if spacing is not None and not spacing > 0:
+            raise ValueError("spacing")
+        self.angle = angle
+        self.spacing = spacing
+        self.color = pg.mkColor(color)
+        self.cross = cross
+        self.fill = None if fill is None else pg.mkColor(fill)
+
+    def key(self) -> tuple:
+        """Returns a hashable key that identifies the style."""
+        return (
+            self.angle,
+            self.spacing,
+            self.color.rgba(),
+            self.cross,
+            None if self.fill is None else self.fill.rgba(),
+        )
+
+
+def hatch_bucket(hatch: Hatch, pixel_size) -> int:
+    """Returns the scale bucket of a hatch at a zoom level.
+
+    Args:
+        hatch (Hatch): The hatch style.
+        pixel_size (float): The size of one screen pixel in drawing units.
+
+    Returns:
+        int: The number of texels between two hatch lines, a power of two. 0 for fills without hatch lines.
+    """
+    if hatch.spacing is None:
+        return 0
+    if not pixel_size > 0:
+        return 64
+    texels = 2 ** round(math.log2(hatch.spacing / pixel_size))
+    return min(max(texels, MIN_TEXTURE_SPACING), MAX_TEXTURE_SPACING)
+
+
+def hatch_brush(hatch: Hatch, pixel_size=None, bucket=None) -> QBrush:
+    """Returns the brush of a hatch at a zoom level.
+
+    Brushes are cached, so elements with equal hatch styles share one brush per scale bucket.
+
+    Args:
+        hatch (Hatch): The hatch style.
+        pixel_size (float, optional): The size of one screen pixel in drawing units.
+        bucket (int, optional): The scale bucket, if already known. Defaults to the bucket of `pixel_size`.
+
+    Returns:
+        QBrush: A texture brush in drawing coordinates, or a solid brush for fills without hatch lines.
+    """
+    if bucket is None:
+        bucket = hatch_bucket(hatch, pixel_size)
+    key = (hatch.key(), bucket)
+    brush = _brushes.get(key)
+    if brush is None:
+        brush = _make_brush(hatch, bucket)
+        _brushes[key] = brush
+    return brush
+
+
+def _make_brush(hatch: Hatch, texels):
+    if hatch.spacing is None:
+        return QBrush(Qt.BrushStyle.NoBrush) if hatch.fill is None else QBrush(hatch.fill)
+
+    image = QImage(texels, texels, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent if hatch.fill is None else hatch.fill)
+    painter = QPainter(image)
+    painter.fillRect(0, 0, texels, 1, hatch.color)
+    if hatch.cross:
+        painter.fillRect(0, 0, 1, texels, hatch.color)
+    painter.end()
+
+    brush = QBrush(image)
+    s = hatch.spacing / texels
+    t = QTransform()
+    t.rotate(hatch.angle)
+    t.scale(s, s)
+    brush.setTransform(t)
+    return brush
+
+
+def clear_cache():
+    """Drops all cached hatch brushes."""
+    _brushes.clear()
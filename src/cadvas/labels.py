@@ -0,0 +1,163 @@
+"""This module defines the `LabelRenderer` class, which draws the text labels of many measurements in one item.
+
+A `pg.TextItem` per label keeps its text upright and pixel-sized by recomputing its own transform whenever the view
+changes, which dominates the cost of panning a drawing with many visible dimensions. The label renderer is a single
+graphics item that holds the position, angle and text of every visible label and paints all of them in one pass in
+device coordinates, so a view change costs nothing per label until it is painted. The glyph layout of every label is
+cached as a `QStaticText` per text and angle; dimensions with the same value and direction share one layout.
+
+Classes:
+    LabelRenderer: Paints the labels of all visible measurements of a view box or layer.
+Usage:
+    `CadViewBox` and `Layer` provide a renderer through `measureLabels()`. `Measure` uses it when its target has
+    one and falls back to a `pg.TextItem` per label otherwise, e.g. in a plain `pg.ViewBox`.
+
+Example:
+    labels = widget.w.measureLabels()
+    labels.setLabel(key, (5.0, 1.0), 0.0, "10.00")
+    labels.removeLabel(key)
+"""
+
+from collections import OrderedDict
+
+import pyqtgraph as pg
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QFont, QStaticText, QTransform
+
+LABEL_COLOR = (0, 200, 150)
+LABEL_FILL = (254, 254, 254)
+
+# Horizontal padding of the label background in pixels.
+LABEL_PADDING = 3
+
+# Maximum number of cached text layouts. The least recently used layouts are dropped first.
+MAX_CACHED_LAYOUTS = 4096
+
+
+class LabelRenderer(pg.GraphicsObject):
+    """LabelRenderer paints text labels centered on points in view coordinates, all in one paint call.
+
+    Labels have a fixed size in pixels and are rotated by their angle on screen, like a `pg.TextItem` with
+    anchor (0.5, 0.5).
+
+    Methods:
+        setLabel(key, pos, angle, text):
+            Shows or moves the label of `key`.
+        removeLabel(key):
+            Hides the label of `key`.
+        labelSceneRect(key) -> QRectF:
+            Returns the area covered by the label of `key` in scene coordinates.
+        clear():
+            Removes all labels.
+    """
+
+    def __init__(self, color=LABEL_COLOR, fill=LABEL_FILL, font=None):
+        """Initializes a renderer without labels.
+
+        Args:
+            color (optional): Color of the text. Anything accepted by `pg.mkColor` can be used.
+            fill (optional): Color of the background of the labels, or None for no background.
+            font (QFont, optional): Font of the labels. Defaults to the application font.
+        """
+        super().__init__()
+        self._labels = {}
+        self._layouts = OrderedDict()
+        self._rect = QRectF()
+        self._pen = pg.mkPen(color)
+        self._fill = None if fill is None else pg.mkBrush(fill)
+        self._font = QFont() if font is None else QFont(font)
+
+    def __len__(self):
+        """Returns the number of labels that are shown."""
+        return len(self._labels)
+
+    def setLabel(self, key, pos, angle, text):
+        """Shows a label, or moves it if a label with this key is already shown.
+
+        Args:
+            key: Any hashable object that identifies the label, usually the element it belongs to.
+            pos (tuple): The center of the label in view coordinates.
+            angle (float): Counter-clockwise rotation of the label on screen in degrees.
+            text (str): The text of the label.
+        """
+        label = (pos[0], pos[1], angle, text)
+        if self._labels.get(key) != label:
+            self._labels[key] = label
+            self.update()
+
+    def removeLabel(self, key):
+        """Hides the label of `key`, if it is shown."""
+        if self._labels.pop(key, None) is not None:
+            self.update()
+
+    def labelSceneRect(self, key):
+        """Returns the rectangle covered by the label of `key` in scene coordinates, or None if it is not shown."""
+        label = self._labels.get(key)
+        if label is None or self.scene() is None:
+            return None
+        x, y, angle, text = label
+        _, _, background, rotation = self._layout(text, angle)
+        return rotation.mapRect(background).translated(self.mapToScene(QPointF(x, y)))
+
+    def clear(self):
+        """Removes all labels and drops the cached layouts."""
+        self._labels = {}
+        self._layouts.clear()
+        self.update()
+
+    def _layout(self, text, angle):
+        """Returns the cached static text, background rectangle and rotation of a text at an angle."""
+        key = (text, angle)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            return layout
+
+        rotation = QTransform()
+        rotation.rotate(-angle)
+        static = QStaticText(text)
+        static.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        static.prepare(rotation, self._font)
+        size = static.size()
+        w, h = size.width(), size.height()
+        layout = (
+            static,
+            QPointF(-w / 2, -h / 2),
+            QRectF(-w / 2 - LABEL_PADDING, -h / 2, w + 2 * LABEL_PADDING, h),
+            rotation,
+        )
+
+        self._layouts[key] = layout
+        if len(self._layouts) > MAX_CACHED_LAYOUTS:
+            self._layouts.popitem(last=False)
+        return layout
+
+    def viewRangeChanged(self):
+        """Follows the visible range of the view box."""
+        vb = self.getViewBox()
+        if vb is None:
+            return
+        self.prepareGeometryChange()
+        self._rect = vb.viewRect()
+
+    viewTransformChanged = viewRangeChanged
+
+    def boundingRect(self):
+        """Returns the visible range of the view box."""
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        """Paints all labels in device coordinates."""
+        if not self._labels:
+            return
+        view = painter.transform()
+        painter.setFont(self._font)
+        painter.setPen(self._pen)
+        for x, y, angle, text in self._labels.values():
+            static, origin, background, rotation = self._layout(text, angle)
+            p = view.map(QPointF(x, y))
+            painter.setTransform(rotation * QTransform.fromTranslate(round(p.x()), round(p.y())))
+            if self._fill is not None:
+                painter.fillRect(background, self._fill)
+            painter.drawStaticText(origin, static)
+        painter.setTransform(view)
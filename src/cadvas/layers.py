@@ -0,0 +1,208 @@
+"""This module defines the `Layer` class.
+
+A layer is a named collection of CAD items that share a single parent graphics item inside the view box. Because
+Qt propagates visibility, z-order, opacity and graphics effects from a parent item to all of its children, toggling,
+restyling or clearing a layer is a single Qt operation regardless of the number of items it holds.
+
+Classes:
+    Layer: A named container for CAD items with its own z-order, visibility and style.
+Usage:
+    Layers are normally created through `QCadvasWidget.addLayer` and filled through `QCadvasWidget.addCadItem` with
+    the `layer` argument. A layer also acts as a drop-in target for `CadItem.createItems`, so elements do not need to
+    know whether they are drawn into a layer or directly into the view box.
+
+Example:
+    widget = QCadvasWidget()
+    widget.addLayer("dimensions", z=10, color=(0, 200, 150))
+    widget.addCadItem(Measure((0, 0), (10, 0)), layer="dimensions")
+    widget.setLayerVisible("dimensions", False)
+"""
+
+import pyqtgraph as pg
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QGraphicsColorizeEffect
+
+from .hatch import Hatch, hatch_bucket
+from .labels import LabelRenderer
+
+
+class Layer:
+    """Layer is a named group of CAD items backed by one parent graphics item.
+
+    Methods:
+        addItem(item, ignoreBounds=False):
+            Adds a graphics item to the layer. Mirrors `pg.ViewBox.addItem` so a layer can be used as target.
+        removeItem(item):
+            Removes a graphics item from the layer.
+        viewRect(), viewPixelSize():
+            Return the visible range and the pixel size of the view box the layer lives in.
+        hatchBucket(hatch: Hatch) -> int:
+            Returns the scale bucket of a hatch at the zoom of the view box.
+        measureLabels() -> LabelRenderer:
+            Returns the renderer that paints the labels of the measurements in the layer.
+        setVisible(visible), setZValue(z), setOpacity(opacity), setColor(color):
+            Change the visibility or style of all items in the layer at once.
+        clear():
+            Removes all items from the layer.
+    """
+
+    def __init__(self, name, view: pg.ViewBox, z=0, visible=True, color=None, opacity=1.0):
+        """Initializes the layer and adds its parent item to the view box.
+
+        Args:
+            name (str): The name of the layer.
+            view (pg.ViewBox): The view box the layer is drawn in.
+            z (float, optional): The z-value of the layer. Layers with a higher z-value are drawn on top.
+                Defaults to 0.
+            visible (bool, optional): Initial visibility of the layer. Defaults to True.
+            color (optional): If given, all items in the layer are drawn in this color. Anything accepted by
+                `pg.mkColor` can be used. Defaults to None (items keep their own colors).
+            opacity (float, optional): Opacity of the layer between 0 and 1. Defaults to 1.0.
+
+        Attributes:
+            items (list): The CAD items that were added to this layer.
+        """
+        self.name = name
+        self.view = view
+        self.items = []
+
+        self._z = z
+        self._visible = visible
+        self._color = None if color is None else pg.mkColor(color)
+        self._opacity = opacity
+        self._bounded = set()  # graphics items that take part in auto-range
+        self._labels = None
+
+        self._group = self._createGroup()
+
+    def _createGroup(self):
+        """Creates the parent item of the layer, adds it to the view box and applies the layer style."""
+        group = pg.ItemGroup()
+        self.view.addItem(group, ignoreBounds=True)
+        group.setZValue(self._z)
+        group.setVisible(self._visible)
+        group.setOpacity(self._opacity)
+        if self._color is not None:
+            group.setGraphicsEffect(self._makeEffect(self._color))
+        return group
+
+    @staticmethod
+    def _makeEffect(color: QColor):
+        effect = QGraphicsColorizeEffect()
+        effect.setColor(color)
+        effect.setStrength(1.0)
+        return effect
+
+    @property
+    def visible(self) -> bool:
+        """Whether the layer is visible."""
+        return self._visible
+
+    @property
+    def zValue(self) -> float:
+        """The z-value of the layer."""
+        return self._z
+
+    # ---- target interface, mirrors pg.ViewBox
+
+    def addItem(self, item, ignoreBounds=False):
+        """Adds a graphics item to the layer.
+
+        Args:
+            item (QGraphicsItem): The item to add.
+            ignoreBounds (bool, optional): If False, the item is taken into account for auto-ranging of the
+                view box. Defaults to False.
+        """
+        item.setParentItem(self._group)
+        if not ignoreBounds:
+            self.view.addedItems.append(item)
+            self._bounded.add(item)
+            self.view.updateAutoRange()
+
+    def removeItem(self, item):
+        """Removes a graphics item from the layer and from the scene.
+
+        Args:
+            item (QGraphicsItem): The item to remove.
+        """
+        if item in self._bounded:
+            self._bounded.remove(item)
+            self.view.addedItems.remove(item)
+        scene = item.scene()
+        if scene is not None:
+            scene.removeItem(item)
+        else:
+            item.setParentItem(None)
+
+    def viewRect(self):
+        """Returns the visible range of the view box the layer is drawn in."""
+        return self.view.viewRect()
+
+    def viewPixelSize(self):
+        """Returns the size of a screen pixel in view coordinates, see `pg.ViewBox.viewPixelSize`."""
+        return self.view.viewPixelSize()
+
+    def hatchBucket(self, hatch: Hatch) -> int:
+        """Returns the scale bucket of a hatch at the zoom of the view box, see `CadViewBox.hatchBucket`."""
+        bucket_of = getattr(self.view, "hatchBucket", None)
+        if bucket_of is None:
+            return hatch_bucket(hatch, max(self.view.viewPixelSize()))
+        return bucket_of(hatch)
+
+    def measureLabels(self) -> LabelRenderer:
+        """Returns the label renderer of the layer, creating it on first use.
+
+        The renderer is a child of the layer, so the labels follow its visibility, z-order and style.
+        """
+        if self._labels is None:
+            self._labels = LabelRenderer()
+            self._labels.setZValue(1e7)
+            self._labels.setParentItem(self._group)
+        return self._labels
+
+    # ---- layer-wide operations
+
+    def setVisible(self, visible: bool):
+        """Shows or hides all items in the layer."""
+        self._visible = visible
+        self._group.setVisible(visible)
+
+    def setZValue(self, z: float):
+        """Sets the z-value (drawing order) of the layer."""
+        self._z = z
+        self._group.setZValue(z)
+
+    def setOpacity(self, opacity: float):
+        """Sets the opacity of all items in the layer."""
+        self._opacity = opacity
+        self._group.setOpacity(opacity)
+
+    def setColor(self, color):
+        """Draws all items in the layer in the given color.
+
+        Args:
+            color: Anything accepted by `pg.mkColor`, or None to let the items use their own colors again.
+        """
+        if color is None:
+            self._color = None
+            self._group.setGraphicsEffect(None)
+        else:
+            self._color = pg.mkColor(color)
+            self._group.setGraphicsEffect(self._makeEffect(self._color))
+
+    def clear(self):
+        """Removes all items from the layer.
+
+        The parent item is removed from the scene together with all of its children and replaced by a new,
+        empty one with the same style.
+        """
+        if self._bounded:
+            self.view.addedItems = [item for item in self.view.addedItems if item not in self._bounded]
+        self._bounded = set()
+
+        scene = self._group.scene()
+        if scene is not None:
+            scene.removeItem(self._group)
+        self.items = []
+        self._labels = None
+        self._group = self._createGroup()
@@ -0,0 +1,492 @@
+"""This module defines the `GeometryStore` class for vectorized geometry queries.
+
+A geometry store is a snapshot of the geometry of a drawing in NumPy arrays. Lengths, areas, perimeters, bounding
+boxes and nearest-neighbour distances are computed over all elements at once instead of in a Python loop.
+
+Classes:
+    GeometryStore: Arrays with the geometry of segments, boxes, circles, polygons and measures.
+Functions:
+    nearest_neighbours(points): Distance from each point to its nearest other point.
+Usage:
+    The store is created from CAD elements with `GeometryStore.from_items` or from a widget with
+    `GeometryStore.from_widget`. Creating the store only reads the coordinates of the elements; it does not touch any
+    Qt object. The store itself only holds NumPy arrays, so all queries can run on a worker thread while the drawing
+    stays interactive.
+
+Example:
+    store = GeometryStore.from_widget(widget)
+    future = executor.submit(store.layer_bounds)
+    print(store.total_segment_length(), store.polygon_areas().sum())
+"""
+
+import math
+
+import numpy as np
+
+from .elements import Box, Circle, Measure, Polygon, Segment
+
+
+class GeometryStore:
+    """GeometryStore holds the geometry of a drawing in NumPy arrays.
+
+    Elements on a layer are tagged with the index of the layer in `layers`. Index 0 is used for elements that were
+    added directly to the view box and has the name None.
+
+    Attributes:
+        layers (list): Layer names, indexed by the layer index arrays.
+        segments (ndarray): (n, 2, 2) start and end points of the segments.
+        boxes (ndarray): (n, 2, 2) lower-left and upper-right corners of the boxes.
+        circle_centers (ndarray): (n, 2) centers of the circles.
+        circle_radii (ndarray): (n,) radii of the circles.
+        polygon_points (ndarray): (m, 2) points of all polygons, concatenated.
+        polygon_offsets (ndarray): (n + 1,) index of the first point of each polygon in `polygon_points`;
+            the last entry is the total number of points.
+        measures (ndarray): (n, 2, 2) start and end points of the measures.
+        other_bounds (ndarray): (n, 4) bounding boxes of other elements, such as block inserts.
+        segment_layers, box_layers, circle_layers, polygon_layers, measure_layers, other_layers (ndarray):
+            Layer index of each element.
+    """
+
+    def __init__(
+        self,
+        layers=None,
+        segments=None,
+        boxes=None,
+        circle_centers=None,
+        circle_radii=None,
+        polygon_points=None,
+        polygon_offsets=None,
+        measures=None,
+        other_bounds=None,
+        segment_layers=None,
+        box_layers=None,
+        circle_layers=None,
+        polygon_layers=None,
+        measure_layers=None,
+        other_layers=None,
+    ):
+        """Initializes the store from arrays. Missing arrays are replaced by empty ones.
+
+        See the class docstring for the shapes of the arrays. Layer index arrays default to 0 for all elements.
+        """
+        self.layers = [None] if layers is None else list(layers)
+
+        self.segments = _array(segments, (0, 2, 2))
+        self.boxes = _array(boxes, (0, 2, 2))
+        self.circle_centers = _array(circle_centers, (0, 2))
+        self.circle_radii = _array(circle_radii, (0,))
+        self.polygon_points = _array(polygon_points, (0, 2))
+        self.polygon_offsets = np.zeros(1, dtype=np.intp) if polygon_offsets is None else np.asarray(polygon_offsets)
+        self.measures = _array(measures, (0, 2, 2))
+        self.other_bounds = _array(other_bounds, (0, 4))
+
+        self.segment_layers = _layer_array(segment_layers, len(self.segments))
+        self.box_layers = _layer_array(box_layers, len(self.boxes))
+        self.circle_layers = _layer_array(circle_layers, len(self.circle_radii))
+        self.polygon_layers = _layer_array(polygon_layers, len(self.polygon_offsets) - 1)
+        self.measure_layers = _layer_array(measure_layers, len(self.measures))
+        self.other_layers = _layer_array(other_layers, len(self.other_bounds))
+
+    @classmethod
+    def from_items(cls, items, layer_of=None):
+        """Creates a store from CAD elements.
+
+        Args:
+            items (iterable of CadItem): The elements. Elements other than segments, boxes, circles, polygons
+                and measures only contribute their `bounds` to the bounding box queries.
+            layer_of (callable, optional): Returns the layer name of an element. Defaults to None (all
+                elements are on layer None).
+
+        Returns:
+            GeometryStore: The new store.
+        """
+        layers = [None]
+        layer_index = {None: 0}
+
+        segments, boxes, centers, radii, points, counts, measures, others = [], [], [], [], [], [], [], []
+        segment_layers, box_layers, circle_layers, polygon_layers, measure_layers, other_layers = [], [], [], [], [], []
+
+        for item in items:
+            name = None if layer_of is None else layer_of(item)
+            index = layer_index.get(name)
+            if index is None:
+                index = layer_index[name] = len(layers)
+                layers.append(name)
+
+            if isinstance(item, Segment):
+                segments.append((item.start, item.end))
+                segment_layers.append(index)
+            elif isinstance(item, Box):
+                boxes.append((item.lower_left, item.upper_right))
+                box_layers.append(index)
+            elif isinstance(item, Circle):
+                centers.append(item.center)
+                radii.append(item.radius)
+                circle_layers.append(index)
+            elif isinstance(item, Polygon):
+                if len(item.points) == 0:
+                    continue
+                points.extend(item.points)
+                counts.append(len(item.points))
+                polygon_layers.append(index)
+            elif isinstance(item, Measure):
+                measures.append((item.start, item.end))
+                measure_layers.append(index)
+            else:
+                try:
+                    others.append(item.bounds())
+                except NotImplementedError:
+                    continue
+                other_layers.append(index)
+
+        offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+
+        return cls(
+            layers=layers,
+            segments=segments,
+            boxes=boxes,
+            circle_centers=centers,
+            circle_radii=radii,
+            polygon_points=points,
+            polygon_offsets=offsets,
+            measures=measures,
+            other_bounds=others,
+            segment_layers=segment_layers,
+            box_layers=box_layers,
+            circle_layers=circle_layers,
+            polygon_layers=polygon_layers,
+            measure_layers=measure_layers,
+            other_layers=other_layers,
+        )
+
+    @classmethod
+    def from_widget(cls, widget):
+        """Creates a store from all elements of a `QCadvasWidget`, tagged with their layer.
+
+        Must be called on the GUI thread, the returned store can be used from any thread.
+        """
+        item_layers = widget._item_layers
+
+        def layer_of(item):
+            layer = item_layers.get(id(item))
+            return None if layer is None else layer.name
+
+        return cls.from_items(widget._items, layer_of)
+
+    # ---- segments
+
+    def segment_lengths(self) -> np.ndarray:
+        """Returns the length of each segment."""
+        d = self.segments[:, 1] - self.segments[:, 0]
+        return np.hypot(d[:, 0], d[:, 1])
+
+    def total_segment_length(self) -> float:
+        """Returns the total length of all segments."""
+        return float(self.segment_lengths().sum())
+
+    # ---- boxes
+
+    def box_areas(self) -> np.ndarray:
+        """Returns the area of each box."""
+        d = np.abs(self.boxes[:, 1] - self.boxes[:, 0])
+        return d[:, 0] * d[:, 1]
+
+    def box_perimeters(self) -> np.ndarray:
+        """Returns the perimeter of each box."""
+        d = np.abs(self.boxes[:, 1] - self.boxes[:, 0])
+        return 2 * (d[:, 0] + d[:, 1])
+
+    # ---- circles
+
+    def circle_areas(self) -> np.ndarray:
+        """Returns the area of each circle."""
+        return np.pi * self.circle_radii**2
+
+    def circle_perimeters(self) -> np.ndarray:
+        """Returns the circumference of each circle."""
+        return 2 * np.pi * self.circle_radii
+
+    # ---- polygons
+
+    def _next_point_index(self) -> np.ndarray:
+        """Index of the next point of each polygon point, wrapping around at the end of each polygon."""
+        n = len(self.polygon_points)
+        nxt = np.arange(1, n + 1)
+        if n:
+            nxt[self.polygon_offsets[1:] - 1] = self.polygon_offsets[:-1]
+        return nxt
+
+    def polygon_areas(self) -> np.ndarray:
+        """Returns the area of each polygon using the shoelace formula."""
+        if len(self.polygon_offsets) < 2:
+            return np.zeros(0)
+        p = self.polygon_points
+        q = p[self._next_point_index()]
+        cross = p[:, 0] * q[:, 1] - q[:, 0] * p[:, 1]
+        return 0.5 * np.abs(np.add.reduceat(cross, self.polygon_offsets[:-1]))
+
+    def polygon_perimeters(self) -> np.ndarray:
+        """Returns the perimeter of each polygon, including the closing edge."""
+        if len(self.polygon_offsets) < 2:
+            return np.zeros(0)
+        p = self.polygon_points
+        d = p[self._next_point_index()] - p
+        return np.add.reduceat(np.hypot(d[:, 0], d[:, 1]), self.polygon_offsets[:-1])
+
+    def polygon_bounds(self) -> np.ndarray:
+        """Returns the (n, 4) bounding boxes (xmin, ymin, xmax, ymax) of the polygons."""
+        if len(self.polygon_offsets) < 2:
+            return np.zeros((0, 4))
+        starts = self.polygon_offsets[:-1]
+        lo = np.minimum.reduceat(self.polygon_points, starts)
+        hi = np.maximum.reduceat(self.polygon_points, starts)
+        return np.hstack([lo, hi])
+
+    # ---- measures
+
+    def measure_distances(self) -> np.ndarray:
+        """Returns the measured distance of each measure."""
+        d = self.measures[:, 1] - self.measures[:, 0]
+        return np.hypot(d[:, 0], d[:, 1])
+
+    # ---- all elements
+
+    def vertices(self) -> np.ndarray:
+        """Returns the (n, 2) end points, corners, centers and polygon points of all elements."""
+        b = self.boxes
+        upper_left = np.stack([b[:, 0, 0], b[:, 1, 1]], axis=1)
+        lower_right = np.stack([b[:, 1, 0], b[:, 0, 1]], axis=1)
+        return np.concatenate(
+            [
+                self.segments[:, 0],
+                self.segments[:, 1],
+                b[:, 0],
+                b[:, 1],
+                upper_left,
+                lower_right,
+                self.circle_centers,
+                self.polygon_points,
+            ]
+        )
+
+    def bounds(self) -> np.ndarray:
+        """Returns the (n, 4) bounding boxes (xmin, ymin, xmax, ymax) of all elements except measures.
+
+        The order is segments, boxes, circles, polygons and other elements; `layer_indices` returns the
+        matching layer index of each row.
+        """
+        seg = np.hstack([self.segments.min(axis=1), self.segments.max(axis=1)])
+        box = np.hstack([self.boxes.min(axis=1), self.boxes.max(axis=1)])
+        r = self.circle_radii[:, None]
+        circ = np.hstack([self.circle_centers - r, self.circle_centers + r])
+        return np.concatenate([seg, box, circ, self.polygon_bounds(), self.other_bounds]).reshape(-1, 4)
+
+    def layer_indices(self) -> np.ndarray:
+        """Returns the layer index of each row of `bounds`."""
+        return np.concatenate(
+            [self.segment_layers, self.box_layers, self.circle_layers, self.polygon_layers, self.other_layers]
+        )
+
+    def layer_bounds(self) -> dict:
+        """Returns the bounding box of the elements of each layer.
+
+        Returns:
+            dict: (xmin, ymin, xmax, ymax) by layer name, for layers that contain at least one element.
+        """
+        bounds = self.bounds()
+        index = self.layer_indices()
+        n = len(self.layers)
+
+        lo = np.full((n, 2), np.inf)
+        hi = np.full((n, 2), -np.inf)
+        np.minimum.at(lo, index, bounds[:, :2])
+        np.maximum.at(hi, index, bounds[:, 2:])
+
+        present = np.bincount(index, minlength=n) > 0
+        return {self.layers[i]: (*lo[i].tolist(), *hi[i].tolist()) for i in np.flatnonzero(present)}
+
+    def nearest_vertex_distances(self) -> np.ndarray:
+        """Returns for each vertex (see `vertices`) the distance to the nearest other vertex."""
+        distances, _ = nearest_neighbours(self.vertices())
+        return distances
+
+
+MAX_PAIRS = 1 << 20
+"""Maximum number of candidate pairs that `nearest_neighbours` evaluates at once."""
+
+_GRID_BITS = 31  # resolution per axis of the Z-order curve
+_SORT_WINDOW = 3
+
+
+def nearest_neighbours(points):
+    """Returns the distance from each point to its nearest other point.
+
+    The points are sorted along a Z-order curve, which puts coincident points next to each other and gives every
+    other point an upper bound of its nearest-neighbour distance from the few points before and after it on the
+    curve. Points are then grouped by that bound, rounded up to a power of two, and each group searches the 3 x 3
+    neighbouring cells of a uniform grid with that cell size. Candidate pairs are evaluated in batches of at most
+    `MAX_PAIRS`, so memory use does not grow with the square of the number of points, and clustered points get a
+    grid as fine as their cluster.
+
+    Args:
+        points (array_like): (n, 2) points.
+
+    Returns:
+        tuple: (distances, indices), the distance to and the index of the nearest other point for each point.
+            For a single point the distance is inf and the index -1.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    n = len(points)
+    distances = np.full(n, np.inf)
+    indices = np.full(n, -1, dtype=np.intp)
+    if n < 2:
+        return distances, indices
+
+    lo = points.min(axis=0)
+    unit = (points.max(axis=0) - lo).max() / ((1 << _GRID_BITS) - 1)
+    if not unit > 0:
+        unit = 1.0
+    cells = np.clip((points - lo) / unit, 0, (1 << _GRID_BITS) - 1).astype(np.int64)
+    z = _interleave(cells[:, 0], cells[:, 1])
+    order = np.lexsort((points[:, 1], points[:, 0], z))
+
+    # coincident points are adjacent in this order and each other's nearest neighbours, every point of a group
+    # refers to the next one
+    p = points[order]
+    starts = np.r_[True, (p[1:] != p[:-1]).any(axis=1)]
+    ends = np.r_[starts[1:], True]
+    single = starts & ends
+    following = np.roll(order, -1)
+    following[ends] = order[starts]
+    indices[order[~single]] = following[~single]
+    distances[order[~single]] = 0.0
+
+    unique = order[starts]
+    if len(unique) > 1 and single.any():
+        d, i = _nearest_distinct(points[unique])
+        group = np.cumsum(starts)[single] - 1
+        distances[order[single]] = d[group]
+        indices[order[single]] = unique[i[group]]
+    return distances, indices
+
+
+def _nearest_distinct(points):
+    """`nearest_neighbours` for at least two distinct points, sorted along the Z-order curve."""
+    m = len(points)
+    best_d2 = np.full(m, np.inf)
+    best = np.full(m, -1, dtype=np.intp)
+
+    # upper bounds from the neighbours on the curve
+    positions = np.arange(m)
+    for k in range(1, min(_SORT_WINDOW, m - 1) + 1):
+        a, b = positions[:-k], positions[k:]
+        d = points[a] - points[b]
+        d2 = np.einsum("ij,ij->i", d, d)
+        _improve(best_d2, best, a, b, d2)
+        _improve(best_d2, best, b, a, d2)
+
+    # cells larger than the bound, so that the nearest point lies in one of the 3 x 3 cells around the point
+    bound = np.sqrt(np.maximum(best_d2, np.finfo(float).smallest_subnormal)) * (1 + 1e-9)
+    levels = np.clip(np.floor(np.log2(bound)) + 1, -1074, 1023).astype(np.int64)
+    # every grid costs a sort of the points, so levels with few points are searched with a grid up to 4 times coarser
+    by_level = np.argsort(levels, kind="stable")
+    levels = levels[by_level]
+    ends = np.flatnonzero(np.r_[levels[1:] != levels[:-1], True]) + 1
+    start = 0
+    for end in ends:
+        if end == m or end - start >= m >> 8 or levels[end] - levels[start] > 2:
+            _grid_search(points, by_level[start:end], 2.0 ** int(levels[end - 1]), best_d2, best)
+            start = end
+    return np.sqrt(best_d2), best
+
+
+def _interleave(x, y):
+    """Returns the Z-order keys of the integer grid coordinates `x` and `y`."""
+    return _spread_bits(x) | (_spread_bits(y) << 1)
+
+
+def _spread_bits(x):
+    """Spreads the lower 31 bits of `x` to the even bit positions."""
+    x = x & 0x7FFFFFFF
+    for shift, mask in (
+        (16, 0x0000FFFF0000FFFF),
+        (8, 0x00FF00FF00FF00FF),
+        (4, 0x0F0F0F0F0F0F0F0F),
+        (2, 0x3333333333333333),
+        (1, 0x5555555555555555),
+    ):
+        x = (x | (x << shift)) & mask
+    return x
+
+
+def _improve(best_d2, best, queries, candidates, d2):
+    """Takes over the candidates that are closer than the best point found so far; `queries` must be unique."""
+    closer = d2 < best_d2[queries]
+    best_d2[queries[closer]] = d2[closer]
+    best[queries[closer]] = candidates[closer]
+
+
+def _grid_search(points, queries, h, best_d2, best):
+    """Searches the nearest point of `queries` among the points in the 3 x 3 grid cells of size `h` around them.
+
+    `h` must be a power of two, so that points closer than `h` are at most one cell apart. Only points within `h` of
+    the bounding box of the queries are put in the grid.
+    """
+    lo = points[queries].min(axis=0) - h
+    hi = points[queries].max(axis=0) + h
+    near = np.flatnonzero(((points >= lo) & (points <= hi)).all(axis=1))
+    # coarser cells find the same points, with at most 2**30 cells per side the cell keys fit in an int64
+    h = max(h, 2.0 ** math.ceil(math.log2(max((hi - lo).max(), h) / 2**30)))
+
+    base = np.floor(lo / h)
+    cells = (np.floor(points[near] / h) - base).astype(np.int64) + 1
+    rows = int(cells[:, 1].max()) + 2
+    keys = cells[:, 0] * rows + cells[:, 1]
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    order = near[order]
+
+    # the three cells in a column of the neighbourhood have consecutive keys
+    q = (np.floor(points[queries] / h) - base).astype(np.int64) + 1
+    columns = (q[:, 0] * rows + q[:, 1])[None, :] + np.array([-rows, 0, rows])[:, None]
+    first = np.searchsorted(sorted_keys, columns - 1, side="left")
+    counts = np.searchsorted(sorted_keys, columns + 2, side="left") - first
+
+    total = np.cumsum(counts.sum(axis=0))
+    start = 0
+    while start < len(queries):
+        done = total[start - 1] if start else 0
+        stop = max(int(np.searchsorted(total, done + MAX_PAIRS, side="right")), start + 1)
+        _search_batch(points, queries[start:stop], order, first[:, start:stop], counts[:, start:stop], best_d2, best)
+        start = stop
+
+
+def _search_batch(points, queries, order, first, counts, best_d2, best):
+    """Evaluates the candidate points `order[first:first + counts]` of each query."""
+    counts = counts.ravel()
+    n = int(counts.sum())
+    if n == 0:
+        return
+    q = np.repeat(np.tile(queries, len(first)), counts)
+    offsets = np.cumsum(counts) - counts
+    c = order[np.arange(n) - np.repeat(offsets - first.ravel(), counts)]
+    d = points[q] - points[c]
+    d2 = np.einsum("ij,ij->i", d, d)
+    d2[c == q] = np.inf
+
+    np.minimum.at(best_d2, q, d2)
+    hit = d2 == best_d2[q]
+    best[q[hit]] = c[hit]
+
+
+def _array(data, empty_shape):
+    if data is None or len(data) == 0:
+        return np.zeros(empty_shape)
+    return np.asarray(data, dtype=float).reshape(-1, *empty_shape[1:])
+
+
+def _layer_array(data, n):
+    if data is None or len(data) == 0:
+        return np.zeros(n, dtype=np.intp)
+    return np.asarray(data, dtype=np.intp)
@@ -0,0 +1,255 @@
+"""This module records and replays pan/zoom interaction with a `QCadvasWidget` for performance testing.
+
+A trace is a JSON lines file. The first line is a header with the size of the view; every following line is either
+a range change of the view box or a mouse event on the viewport, with the time since the start of the recording.
+Replaying a trace drives the same sequence against a widget and measures how long every frame takes, including
+`updateMeasurements` and a synchronous repaint of the viewport. Because nothing depends on a user, replays of the same
+trace on the same drawing are comparable across versions, also on a headless CI machine (`QT_QPA_PLATFORM=offscreen`).
+
+Classes:
+    InteractionRecorder: Records range changes and mouse events of a live widget to a trace file.
+    ReplayReport: Per-frame latencies of a replay and their percentiles.
+Functions:
+    replay(widget, filename, mode="range"): Replays a trace against a widget and returns a `ReplayReport`.
+Usage:
+    In "range" mode (the default) the recorded view ranges are set one by one, so the result does not depend on how
+    mouse events are handled. In "events" mode the recorded mouse events are sent to the viewport instead, which also
+    covers the mouse handling of the view box; the widget is resized to the recorded size so positions match, and
+    events are not sent earlier than recorded because pyqtgraph tells clicks from drags by their duration.
+
+Example:
+    recorder = InteractionRecorder(widget, "pan_zoom.jsonl")
+    recorder.start()
+    ...  # interact with the widget
+    recorder.stop()
+
+    report = replay(other_widget, "pan_zoom.jsonl")
+    print(report)
+"""
+
+import json
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import QEvent, QObject, QPoint, QPointF, Qt
+from PySide6.QtGui import QMouseEvent, QWheelEvent
+
+TRACE_VERSION = 1
+
+_MOUSE_EVENTS = {
+    QEvent.Type.MouseButtonPress: "press",
+    QEvent.Type.MouseMove: "move",
+    QEvent.Type.MouseButtonRelease: "release",
+    QEvent.Type.MouseButtonDblClick: "dblclick",
+    QEvent.Type.Wheel: "wheel",
+}
+_EVENT_TYPES = {name: event_type for event_type, name in _MOUSE_EVENTS.items()}
+
+
+class InteractionRecorder(QObject):
+    """InteractionRecorder writes the range changes and mouse events of a widget to a trace file.
+
+    Methods:
+        start():
+            Opens the trace file and starts recording.
+        stop():
+            Stops recording and closes the file.
+    """
+
+    def __init__(self, widget, filename):
+        """Initializes the recorder without starting it.
+
+        Args:
+            widget (QCadvasWidget): The widget to record.
+            filename (str or PathLike): The trace file. It is overwritten when recording starts.
+        """
+        super().__init__(widget)
+        self.widget = widget
+        self.filename = filename
+        self._file = None
+        self._t0 = 0.0
+
+    @property
+    def recording(self) -> bool:
+        """Whether the recorder is running."""
+        return self._file is not None
+
+    def start(self):
+        """Opens the trace file, writes the header and the current range and starts recording."""
+        if self._file is not None:
+            return
+        self._file = open(self.filename, "w", encoding="utf-8")  # noqa: SIM115, closed in stop()
+        self._t0 = time.perf_counter()
+        viewport = self.widget.viewport()
+        self._write({"type": "header", "version": TRACE_VERSION, "size": [viewport.width(), viewport.height()]})
+        self._rangeChanged()
+        self.widget.w.sigRangeChanged.connect(self._rangeChanged)
+        viewport.installEventFilter(self)
+
+    def stop(self):
+        """Stops recording and closes the trace file."""
+        if self._file is None:
+            return
+        self.widget.viewport().removeEventFilter(self)
+        self.widget.w.sigRangeChanged.disconnect(self._rangeChanged)
+        self._file.close()
+        self._file = None
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+
+    def _time(self):
+        return round(time.perf_counter() - self._t0, 6)
+
+    def _rangeChanged(self, *args):
+        (x0, x1), (y0, y1) = self.widget.w.viewRange()
+        self._write({"t": self._time(), "type": "range", "x": [x0, x1], "y": [y0, y1]})
+
+    def eventFilter(self, obj, event):
+        """Records mouse events of the viewport; events are never filtered out."""
+        name = _MOUSE_EVENTS.get(event.type())
+        if name is not None:
+            pos = event.position()
+            record = {
+                "t": self._time(),
+                "type": "mouse",
+                "event": name,
+                "pos": [pos.x(), pos.y()],
+                "buttons": event.buttons().value,
+                "modifiers": event.modifiers().value,
+            }
+            if name == "wheel":
+                delta = event.angleDelta()
+                record["delta"] = [delta.x(), delta.y()]
+            else:
+                record["button"] = event.button().value
+            self._write(record)
+        return False
+
+
+class ReplayReport:
+    """ReplayReport holds the latencies of the frames of a replay.
+
+    Attributes:
+        latencies (ndarray): Duration of every frame in seconds, in replay order.
+    """
+
+    def __init__(self, latencies):
+        """Initializes the report with the frame durations in seconds."""
+        self.latencies = np.asarray(latencies, dtype=float)
+
+    def __len__(self):
+        """Returns the number of frames."""
+        return len(self.latencies)
+
+    def percentile(self, p) -> float:
+        """Returns the `p`-th percentile of the frame latencies in milliseconds."""
+        if not len(self.latencies):
+            return float("nan")
+        return float(np.percentile(self.latencies, p) * 1000)
+
+    def summary(self) -> dict:
+        """Returns the number of frames and the mean, p50, p90, p99 and maximum latency in milliseconds."""
+        empty = not len(self.latencies)
+        return {
+            "frames": len(self.latencies),
+            "mean": float("nan") if empty else float(self.latencies.mean() * 1000),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": float("nan") if empty else float(self.latencies.max() * 1000),
+        }
+
+    def __str__(self):
+        """Returns the summary as one line."""
+        s = self.summary()
+        return (
+            f"{s['frames']} frames: mean {s['mean']:.2f} ms, p50 {s['p50']:.2f} ms, p90 {s['p90']:.2f} ms, "
+            f"p99 {s['p99']:.2f} ms, max {s['max']:.2f} ms"
+        )
+
+
+def _read_trace(filename):
+    """Reads a trace file and returns the header and the list of records."""
+    with open(filename, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records or records[0].get("type") != "header":
+        raise ValueError("header")
+    if records[0]["version"] > TRACE_VERSION:
+        raise ValueError("version")
+    return records[0], records[1:]
+
+
+def _mouse_event(record):
+    """Creates the Qt mouse or wheel event of a trace record."""
+    pos = QPointF(*record["pos"])
+    buttons = Qt.MouseButton(record["buttons"])
+    modifiers = Qt.KeyboardModifier(record["modifiers"])
+    if record["event"] == "wheel":
+        return QWheelEvent(
+            pos,
+            pos,
+            QPoint(),
+            QPoint(*record["delta"]),
+            buttons,
+            modifiers,
+            Qt.ScrollPhase.NoScrollPhase,
+            False,
+        )
+    return QMouseEvent(_EVENT_TYPES[record["event"]], pos, pos, Qt.MouseButton(record["button"]), buttons, modifiers)
+
+
+def replay(widget, filename, mode="range"):
+    """Replays a trace against a widget and measures the latency of every frame.
+
+    A frame is one range change in "range" mode and one mouse event in "events" mode. Range changes are replayed
+    back to back; mouse events are sent no earlier than their recorded time after the start of the replay. The
+    latency of a frame covers applying the change, including `updateMeasurements`, and a synchronous repaint of the
+    viewport.
+
+    Args:
+        widget (QCadvasWidget): The widget to drive. It should already show the drawing.
+        filename (str or PathLike): The trace file written by `InteractionRecorder`.
+        mode (str, optional): "range" to replay the recorded view ranges or "events" to replay the recorded mouse
+            events. Defaults to "range".
+
+    Returns:
+        ReplayReport: The frame latencies.
+
+    Raises:
+        ValueError: If the mode is unknown or the file is not a trace.
+    """
+    if mode not in ("range", "events"):
+        raise ValueError(mode)
+    header, records = _read_trace(filename)
+    app = pg.mkQApp()
+    viewport = widget.viewport()
+
+    if mode == "events":
+        width, height = header["size"]
+        widget.resize(widget.width() - viewport.width() + width, widget.height() - viewport.height() + height)
+        ranges = [r for r in records if r["type"] == "range"]
+        if ranges:
+            widget.w.setRange(xRange=ranges[0]["x"], yRange=ranges[0]["y"], padding=0)
+        frames = [r for r in records if r["type"] == "mouse"]
+    else:
+        frames = [r for r in records if r["type"] == "range"]
+    app.processEvents()
+
+    latencies = []
+    start = time.perf_counter()
+    for record in frames:
+        if mode == "events":
+            wait = record["t"] - (time.perf_counter() - start)
+            if wait > 0:
+                time.sleep(wait)
+        t0 = time.perf_counter()
+        if mode == "events":
+            app.sendEvent(viewport, _mouse_event(record))
+        else:
+            widget.w.setRange(xRange=record["x"], yRange=record["y"], padding=0)
+        viewport.repaint()
+        latencies.append(time.perf_counter() - t0)
+        app.processEvents()
+    return ReplayReport(latencies)
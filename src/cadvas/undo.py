@@ -0,0 +1,199 @@
+"""This module provides undo and redo for edits of a `QCadvasWidget`.
+
+Edits are recorded as commands on a `QUndoStack`. A command stores only what it needs to reverse itself: the CAD
+items that were added or removed, or the old and new values of the geometry arguments that were changed. Undoing or
+redoing a command applies it to the existing graphics items; removed items keep their graphics items while they can
+be restored, so nothing is re-created from scratch. The number of commands, and with it the memory held by the
+history, is bounded by the undo limit of the stack.
+
+Classes:
+    AddItemsCommand: Adds CAD items to the widget.
+    RemoveItemsCommand: Removes CAD items from the widget.
+    ModifyItemCommand: Changes the geometry of one CAD item.
+    UndoStack: A `QUndoStack` for one widget with shortcuts to push the commands above.
+Usage:
+    Edits that should be undoable go through the stack instead of the widget. The stack can be connected to the
+    usual Qt undo and redo actions with `createUndoAction` and `createRedoAction`.
+
+Example:
+    stack = UndoStack(widget, limit=200)
+    segment = Segment((0, 0), (10, 0))
+    stack.add([segment])
+    stack.modify(segment, end=(10, 5))
+    stack.undo()  # segment ends at (10, 0) again
+"""
+
+from PySide6.QtGui import QUndoCommand, QUndoStack
+
+from .elements import CadItem
+
+
+class AddItemsCommand(QUndoCommand):
+    """AddItemsCommand adds CAD items to a widget.
+
+    The graphics items are created the first time the command is applied and reused when it is redone.
+    """
+
+    def __init__(self, widget, items, layer=None, do_bounds=False, text="Add"):
+        """Initializes the command without applying it.
+
+        Args:
+            widget (QCadvasWidget): The widget to edit.
+            items (iterable of CadItem): The CAD items to add.
+            layer (str, optional): The layer to add the items to. Defaults to None (the view box).
+            do_bounds (bool, optional): Whether the items take part in auto-ranging. Defaults to False.
+            text (str, optional): The text of the command, e.g. for undo actions. Defaults to "Add".
+        """
+        super().__init__(text)
+        self.widget = widget
+        self.items = list(items)
+        self.layer = layer
+        self.do_bounds = do_bounds
+        self._created = False
+
+    def redo(self):
+        """Adds the items to the widget."""
+        if self._created:
+            self.widget.restoreCadItems(self.items, self.do_bounds, self.layer)
+        else:
+            self.widget.addCadItems(self.items, self.do_bounds, self.layer)
+            self._created = True
+
+    def undo(self):
+        """Removes the items from the widget again, keeping their graphics items for a redo."""
+        self.widget.removeCadItems(self.items, keep_graphics=True)
+
+
+class RemoveItemsCommand(QUndoCommand):
+    """RemoveItemsCommand removes CAD items from a widget.
+
+    The graphics items of the removed CAD items are kept while the command is on the stack, so an undo adds them back
+    to their view box or layer without re-creating them.
+    """
+
+    def __init__(self, widget, items, text="Remove"):
+        """Initializes the command without applying it.
+
+        Args:
+            widget (QCadvasWidget): The widget to edit.
+            items (iterable of CadItem): The CAD items to remove.
+            text (str, optional): The text of the command, e.g. for undo actions. Defaults to "Remove".
+        """
+        super().__init__(text)
+        self.widget = widget
+        self.items = list(items)
+        self._groups = []
+
+    def redo(self):
+        """Removes the items and remembers their layer and whether they took part in auto-ranging."""
+        bounded = {id(g) for g in self.widget.w.addedItems}
+        groups = {}
+        for item in self.items:
+            layer = self.widget.layerOf(item)
+            do_bounds = any(id(g) in bounded for g in item.graphicsItems())
+            key = (None if layer is None else layer.name, do_bounds)
+            groups.setdefault(key, []).append(item)
+        self._groups = [(layer, do_bounds, items) for (layer, do_bounds), items in groups.items()]
+        self.widget.removeCadItems(self.items, keep_graphics=True)
+
+    def undo(self):
+        """Adds the items back to their view box or layer."""
+        for layer, do_bounds, items in self._groups:
+            self.widget.restoreCadItems(items, do_bounds, layer)
+
+
+class ModifyItemCommand(QUndoCommand):
+    """ModifyItemCommand changes the geometry of one CAD item.
+
+    Only the changed geometry arguments are stored, with their old and new values. Consecutive commands for the same
+    item that were created with `merge=True`, for example while dragging, are merged into one.
+    """
+
+    MERGE_ID = 0x0CAD
+
+    def __init__(self, widget, item: CadItem, changes, merge=False, text="Modify"):
+        """Initializes the command without applying it.
+
+        Args:
+            widget (QCadvasWidget): The widget that shows the item.
+            item (CadItem): The CAD item to change.
+            changes (dict): New values for some of the geometry arguments of the item, see `CadItem.geometry`.
+            merge (bool, optional): Whether the command may be merged with the previous command for the same item.
+                Defaults to False.
+            text (str, optional): The text of the command, e.g. for undo actions. Defaults to "Modify".
+        """
+        geometry = item.geometry()
+        for name in changes:
+            if name not in geometry:
+                raise TypeError(name)
+        super().__init__(text)
+        self.widget = widget
+        self.item = item
+        self.old = {name: geometry[name] for name in changes}
+        self.new = dict(changes)
+        self.merge = merge
+
+    def id(self):
+        """Returns the merge id of the command, or -1 if it may not be merged."""
+        return self.MERGE_ID if self.merge else -1
+
+    def mergeWith(self, other):
+        """Merges a following command for the same item into this one."""
+        if not isinstance(other, ModifyItemCommand) or other.item is not self.item or not other.merge:
+            return False
+        for name, value in other.old.items():
+            self.old.setdefault(name, value)
+        self.new.update(other.new)
+        return True
+
+    def redo(self):
+        """Applies the new geometry values."""
+        self.widget.modifyCadItem(self.item, **self.new)
+
+    def undo(self):
+        """Restores the old geometry values."""
+        self.widget.modifyCadItem(self.item, **self.old)
+
+
+class UndoStack(QUndoStack):
+    """UndoStack is a `QUndoStack` for the edits of one widget.
+
+    Methods:
+        add(items, layer=None, do_bounds=False):
+            Adds CAD items as an undoable command.
+        remove(items):
+            Removes CAD items as an undoable command.
+        modify(item, merge=False, **changes):
+            Changes the geometry of a CAD item as an undoable command.
+    """
+
+    def __init__(self, widget, limit=100):
+        """Initializes an empty stack.
+
+        Args:
+            widget (QCadvasWidget): The widget to edit.
+            limit (int, optional): The maximum number of commands that are kept; older commands are dropped
+                together with the items and values they hold. 0 means no limit. Defaults to 100.
+        """
+        super().__init__(widget)
+        self.widget = widget
+        self.setUndoLimit(limit)
+
+    def add(self, items, layer=None, do_bounds=False):
+        """Adds CAD items to the widget as an undoable command."""
+        self.push(AddItemsCommand(self.widget, items, layer, do_bounds))
+
+    def remove(self, items):
+        """Removes CAD items from the widget as an undoable command."""
+        self.push(RemoveItemsCommand(self.widget, items))
+
+    def modify(self, item: CadItem, merge=False, **changes):
+        """Changes the geometry of a CAD item as an undoable command.
+
+        Args:
+            item (CadItem): The CAD item to change.
+            merge (bool, optional): Merge with the previous change of the same item, e.g. while dragging.
+                Defaults to False.
+            **changes: New values for the geometry of the item.
+        """
+        self.push(ModifyItemCommand(self.widget, item, changes, merge))
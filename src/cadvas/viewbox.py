@@ -0,0 +1,183 @@
+"""This module defines the `CadViewBox` class.
+
+`CadViewBox` is the view box used by `QCadvasWidget`. It extends `pg.ViewBox` with rubber-band interaction for
+selections: when a selection mode is set, dragging with the left mouse button draws a selection rectangle or lasso
+instead of panning the view. The finished shape is emitted with `sigSelectionDrawn`; resolving which items are
+selected is left to the widget.
+
+Classes:
+    CadViewBox: A view box with box and lasso rubber-band selection and a shared measurement label renderer.
+    SelectionOverlay: A single graphics item that highlights the bounding boxes of all selected items.
+"""
+
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import QRectF, Qt, Signal
+from PySide6.QtGui import QPainterPath, QPen
+from PySide6.QtWidgets import QGraphicsPathItem
+
+from .elements import _mark_dirty
+from .hatch import Hatch, hatch_bucket
+from .labels import LabelRenderer
+
+SELECTION_COLOR = (0, 120, 255)
+
+
+class CadViewBox(pg.ViewBox):
+    """CadViewBox is a `pg.ViewBox` with rubber-band selection.
+
+    Methods:
+        measureLabels() -> LabelRenderer:
+            Returns the renderer that paints the labels of the measurements in the view box.
+        hatchBucket(hatch: Hatch) -> int:
+            Returns the scale bucket of a hatch at the current zoom, computed once per zoom level.
+
+    Attributes:
+        selectionMode (str or None): "box", "lasso" or None. If None, dragging pans the view as usual.
+
+    Signals:
+        sigSelectionDrawn(str, object, object): Emitted when a selection drag is finished, with the kind of shape
+            ("box" or "lasso"), the shape in view coordinates (a `QRectF` or a list of `QPointF`) and the keyboard
+            modifiers that were held.
+    """
+
+    sigSelectionDrawn = Signal(str, object, object)
+
+    def __init__(self, *args, **kwargs):
+        """Initializes the view box without an active selection mode."""
+        super().__init__(*args, **kwargs)
+        self.selectionMode = None
+        self._lasso = []
+
+        pen = QPen(pg.mkColor(SELECTION_COLOR))
+        pen.setCosmetic(True)
+        pen.setStyle(Qt.PenStyle.DashLine)
+        self._band = QGraphicsPathItem()
+        self._band.setPen(pen)
+        self._band.setZValue(1e9)
+        self._band.hide()
+        self.addItem(self._band, ignoreBounds=True)
+
+        self._labels = None
+        self._hatch_pixel_size = None
+        self._hatch_buckets = {}
+
+    def measureLabels(self) -> LabelRenderer:
+        """Returns the label renderer of the view box, creating it on first use."""
+        if self._labels is None:
+            self._labels = LabelRenderer()
+            self._labels.setZValue(1e7)
+            self.addItem(self._labels, ignoreBounds=True)
+        return self._labels
+
+    def hatchBucket(self, hatch: Hatch) -> int:
+        """Returns the scale bucket of a hatch at the current zoom, see `hatch_bucket`.
+
+        The bucket only depends on the hatch spacing and the pixel size, so it is computed once per spacing until the
+        pixel size changes, instead of once per hatched element in every update.
+        """
+        pixel_size = self.viewPixelSize()
+        if pixel_size is not self._hatch_pixel_size:
+            # pg.ViewBox caches the pixel size and replaces the tuple when the view transform changes
+            self._hatch_pixel_size = pixel_size
+            self._hatch_buckets = {}
+        bucket = self._hatch_buckets.get(hatch.spacing)
+        if bucket is None:
+            bucket = self._hatch_buckets[hatch.spacing] = hatch_bucket(hatch, max(pixel_size))
+        return bucket
+
+    def clear(self):
+        """Removes all items from the view box, but keeps the rubber band and the (emptied) label renderer."""
+        super().clear()
+        self.addItem(self._band, ignoreBounds=True)
+        if self._labels is not None:
+            self._labels.clear()
+            self.addItem(self._labels, ignoreBounds=True)
+
+    def mouseDragEvent(self, ev, axis=None):
+        """Draws a selection shape when a selection mode is set, otherwise pans the view as usual."""
+        if self.selectionMode is None or ev.button() != Qt.MouseButton.LeftButton:
+            super().mouseDragEvent(ev, axis)
+            return
+
+        ev.accept()
+        start = self.mapToView(ev.buttonDownPos())
+        pos = self.mapToView(ev.pos())
+
+        if self.selectionMode == "lasso":
+            if ev.isStart():
+                self._lasso = [start]
+            self._lasso.append(pos)
+            shape = list(self._lasso)
+            path = QPainterPath(shape[0])
+            for p in shape[1:]:
+                path.lineTo(p)
+            path.closeSubpath()
+        else:
+            shape = QRectF(start, pos).normalized()
+            path = QPainterPath()
+            path.addRect(shape)
+
+        # in minimal update mode the view only repaints reported regions, report the old and the new band
+        _mark_dirty(self._band)
+        if ev.isFinish():
+            self._band.hide()
+            self._lasso = []
+            self.sigSelectionDrawn.emit(self.selectionMode, shape, ev.modifiers())
+        else:
+            self._band.setPath(path)
+            self._band.show()
+            _mark_dirty(self._band)
+
+
+class SelectionOverlay(pg.GraphicsObject):
+    """SelectionOverlay draws the bounding boxes of the selected items as one path.
+
+    The path is built on the first paint after the selection changed, so changing the selection itself only
+    stores an array.
+    """
+
+    def __init__(self, parent=None):
+        """Initializes an empty overlay."""
+        super().__init__(parent)
+        self._rects = np.zeros((0, 4))
+        self._path = None
+        self._rect = QRectF()
+
+        self._pen = QPen(pg.mkColor(SELECTION_COLOR))
+        self._pen.setCosmetic(True)
+        self._pen.setWidthF(2)
+
+    def setRects(self, rects):
+        """Sets the highlighted rectangles.
+
+        Args:
+            rects (ndarray): (n, 4) array with (xmin, ymin, xmax, ymax) of each rectangle.
+        """
+        self.prepareGeometryChange()
+        self._rects = rects
+        self._path = None
+        if len(rects):
+            x0, y0 = rects[:, :2].min(axis=0)
+            x1, y1 = rects[:, 2:].max(axis=0)
+            self._rect = QRectF(x0, y0, x1 - x0, y1 - y0)
+        else:
+            self._rect = QRectF()
+        self.update()
+
+    def boundingRect(self):
+        """Returns the bounding rectangle of all highlighted rectangles."""
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        """Paints the outlines of all highlighted rectangles."""
+        if not len(self._rects):
+            return
+        if self._path is None:
+            b = self._rects
+            x = np.stack([b[:, 0], b[:, 2], b[:, 2], b[:, 0], b[:, 0]], axis=1).ravel()
+            y = np.stack([b[:, 1], b[:, 1], b[:, 3], b[:, 3], b[:, 1]], axis=1).ravel()
+            connect = np.tile(np.array([1, 1, 1, 1, 0], dtype=bool), len(b))
+            self._path = pg.arrayToQPath(x, y, connect=connect)
+        painter.setPen(self._pen)
+        painter.drawPath(self._path)
@@ -8,21 +8,45 @@ Classes:
 Dependencies:
     - pyqtgraph
     - CadItem (from .elements)
+    - Layer (from .layers)
 Usage:
     The `QCadvasWidget` class can be used to create a graphical interface
     for displaying and interacting with CAD items. It provides methods for
-    adding, updating, and clearing items within the view box.
+    adding, updating, and clearing items within the view box, optionally
+    organised in named layers. Long-running viewers that load many drawings
+    can bound the live graphics items and memory with `setSessionMode`.
 
 Example:
     widget = QCadvasWidget()
     cad_item = CadItem(...)
     widget.addCadItem(cad_item)
+    widget.addLayer("dimensions", z=10)
+    widget.addCadItem(Measure((0, 0), (1, 0)), layer="dimensions")
+    widget.setLayerVisible("dimensions", False)
+    widget.setSessionMode(max_items=200_000, max_memory=2 * 2**30)
     widget.clearDrawing()
 """
 
+import logging
+import os
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import compress
+
+import numpy as np
 import pyqtgraph as pg
+from PySide6.QtCore import QRectF, Qt, QTimer, Signal
+from PySide6.QtGui import QRegion
+from PySide6.QtWidgets import QGraphicsView
+from shiboken6 import isValid
 
 from .elements import CadItem
+from .grid import GridItem
+from .layers import Layer
+from .query import GeometryStore
+from .viewbox import CadViewBox, SelectionOverlay
+
+logger = logging.getLogger(__name__)
 
 
 class QCadvasWidget(pg.GraphicsLayoutWidget):
@@ -37,13 +61,71 @@ class QCadvasWidget(pg.GraphicsLayoutWidget):
         updateMeasurements():
             Updates the measurements of all items in the widget by calling their `updateItems` method
             with the current view box.
-        addCadItem(item: CadItem, do_bounds=True):
-            Adds a CAD item to the widget, creates its graphical representation in the view box,
-            and optionally adjusts its bounds.
+        addCadItem(item: CadItem, do_bounds=True, layer=None):
+            Adds a CAD item to the widget, creates its graphical representation in the view box or in the
+            given layer, and optionally adjusts its bounds.
+        addCadItems(items, do_bounds=False, layer=None):
+            Adds a batch of CAD items to the widget.
+        removeCadItems(items, keep_graphics=False):
+            Removes a batch of CAD items and their graphical representations from the widget.
+        restoreCadItems(items, do_bounds=False, layer=None):
+            Adds removed CAD items back, reusing their graphics items.
+        modifyCadItem(item, **changes), modifyCadItems(changes):
+            Changes the geometry of one or a batch of CAD items and updates their graphics items in place.
         clearDrawing():
             Clears all CAD items from the widget and removes their graphical representations from the view box.
+        hasCadItem(item) -> bool:
+            Returns whether a CAD item is part of the drawing.
+        addLayer(name, z=0, visible=True, color=None, opacity=1.0) -> Layer:
+            Creates a new named layer.
+        layer(name) -> Layer:
+            Returns the layer with the given name.
+        layerOf(item) -> Layer:
+            Returns the layer of a CAD item.
+        setLayerVisible(name, visible):
+            Shows or hides all items of a layer.
+        clearLayer(name):
+            Removes all CAD items of a layer.
+        setMinimalUpdate(enabled=True):
+            Repaints only the regions of changed items instead of letting Qt decide what to repaint.
+        markDirty(items), markDirtyRect(rect):
+            Schedules a repaint of the regions covered by changed CAD items or by a scene rectangle.
+        geometryStore() -> GeometryStore:
+            Returns a snapshot of the geometry of all items for vectorized queries.
+        setSelectionMode(mode):
+            Selects items by dragging a rectangle ("box") or a lasso ("lasso") instead of panning.
+        selectInRect(rect, mode="replace", contained=True), selectInLasso(points, mode="replace"):
+            Selects the items inside a rectangle or a lasso.
+        selectionMask() -> ndarray, selectedItems() -> list, clearSelection():
+            Query or reset the selection.
+        itemBounds() -> ndarray:
+            Returns the cached bounding boxes of all items.
+        deleteSelection(), restyleSelection(pen=None, brush=None):
+            Remove or restyle the selected items.
+        setItemBudget(budget):
+            Limits the number of graphics items of lazily created elements, releasing off-screen ones.
+        setSessionMode(enabled=True, max_items=None, max_memory=None):
+            Manages the graphics items of all elements within a budget for long-running sessions.
+        sessionStats() -> dict:
+            Returns item, eviction and memory counters.
+        showGrid(show=True, min_spacing=12):
+            Shows or hides an adaptive reference grid behind the drawing.
+
+    Signals:
+        sigItemsRemoved(list): Emitted with the CAD items that were removed from the drawing by `removeCadItems`,
+            `deleteSelection`, `clearLayer` or `clearDrawing`.
     """
 
+    sigItemsRemoved = Signal(list)
+
+    # Maximum number of separate rectangles that are repainted in minimal update mode. If the changed
+    # regions can not be merged into this many rectangles, their bounding rectangle is repainted instead.
+    MAX_DIRTY_RECTS = 16
+
+    # Number of item budget checks between two reads of the process memory in session mode. Reading the memory
+    # costs a system call or a file read, too much for every range change while panning.
+    MEMORY_SAMPLE_INTERVAL = 32
+
     def __init__(self, *args, **kwargs):
         """Initializes the widget with a specified background color, layout, and view box.
 
@@ -54,6 +136,29 @@ class QCadvasWidget(pg.GraphicsLayoutWidget):
         Attributes:
             w (ViewBox): The view box added to the layout, with aspect ratio locked and auto-range disabled.
             _items (list): A list to store items associated with the widget.
+            _index (dict): The serial number of each CAD item, keyed by `id(item)`. Serial numbers are given out in
+                the order in which items are added, so they are ascending in `_items`.
+            _serials (ndarray): Serial numbers of `_items`, see `_positions`.
+            _layers (dict): The layers of the widget by name.
+            _item_layers (dict): The layer of each CAD item that was added to a layer, keyed by `id(item)`.
+            _view_items (dict): The CAD items that were added directly to the view box, keyed by `id(item)`. Items
+                on layers are kept in `Layer.items`.
+            _lazy_items (dict): The lazy CAD items, keyed by `id(item)`.
+            _minimal_update (bool): Whether minimal update mode is enabled, see `setMinimalUpdate`.
+            _dirty (list): Dirty scene rectangles that will be repainted in minimal update mode.
+            _selection (ndarray): Boolean selection mask over `_items`.
+            _bounds (ndarray or None): Cached (n, 4) bounding boxes of `_items`, see `itemBounds`.
+            _item_budget (int or None): Maximum number of graphics items of lazy elements, see `setItemBudget`.
+            _materialized (OrderedDict): (element, number of graphics items, frame last seen) of the elements
+                whose graphics items count against the item budget, least recently visible first.
+            _session (bool): Whether session mode is enabled, see `setSessionMode`.
+            _memory_budget (int or None): Maximum process memory in bytes in session mode.
+            _memory_countdown (int): Budget checks left until the process memory is read again.
+            _over_memory (bool): Whether the process memory was above the memory budget when it was last read.
+            _evicted (dict): (element, do_bounds) of elements whose graphics items were released by the session.
+            _frame (int): Number of view updates, used to tell on-screen elements from off-screen ones.
+            _stats (dict): Counters reported by `sessionStats`.
+            grid (GridItem or None): The reference grid, created by the first call of `showGrid`.
 
         Notes:
             - The background color is set to (254, 254, 254).
@@ -63,37 +168,1038 @@ class QCadvasWidget(pg.GraphicsLayoutWidget):
         self.setBackground((254, 254, 254))
 
         sub1 = self.addLayout()
-        w = sub1.addViewBox()
+        w = CadViewBox()
+        sub1.addItem(w)
 
         w.setAspectLocked(True)
         w.enableAutoRange(False)
 
         self._items = []
+        self._index = {}
+        self._serials = np.zeros(0, dtype=np.int64)
+        self._next_serial = 0
+        self._layers = {}
+        self._item_layers = {}
+        self._view_items = {}
+        self._lazy_items = {}
+
+        self._minimal_update = False
+        self._dirty = []
+        self._dirty_timer = QTimer(self)
+        self._dirty_timer.setSingleShot(True)
+        self._dirty_timer.setInterval(0)
+        self._dirty_timer.timeout.connect(self._flushDirty)
+
+        self._selection = np.zeros(0, dtype=bool)
+        self._bounds = None
+
+        self._item_budget = None
+        self._materialized = OrderedDict()
+        self._materialized_count = 0
+
+        self._session = False
+        self._memory_budget = None
+        self._memory_countdown = 0
+        self._over_memory = False
+        self._evicted = {}
+        self._frame = 0
+        self._stats = {"evictions": 0, "restores": 0, "cleared": 0, "leaked_items": 0, "peak_memory": 0}
+
+        self._selection_overlay = SelectionOverlay()
+        self._selection_overlay.setZValue(1e8)
+        w.addItem(self._selection_overlay, ignoreBounds=True)
+
+        self.grid = None
 
         w.sigRangeChanged.connect(self.updateMeasurements)
+        w.sigSelectionDrawn.connect(self._selectionDrawn)
 
         self.w = w
 
     def updateMeasurements(self):
         """Updates the measurements of all items in the widget.
 
-        Iterates through the list of items (`self._items`) and calls the `updateItems` method on each item,
-        passing the widget's width (`self.w`) as a parameter.
+        Calls the `updateItems` method of the items in the view box (`self.w`) and of the items on visible layers,
+        passing the view box or the layer as a parameter. Items on hidden layers are skipped; they are updated when
+        their layer is shown again.
+
+        Lazy elements that are in view are marked as most recently used; in session mode, this also holds for
+        other elements, and elements that come back into view get their graphics items back. Afterwards the item
+        budget is enforced.
         """
-        for p in self._items:
-            p.updateItems(self.w)
+        self._frame += 1
+        w = self.w
+        for p in self._view_items.values():
+            p.updateItems(w)
+        for layer in self._layers.values():
+            if layer.visible:
+                for p in layer.items:
+                    p.updateItems(layer)
+        for key, p in self._lazy_items.items():
+            if p.visible:
+                layer = self._item_layers.get(key)
+                if layer is None or layer.visible:
+                    self._touch(p)
+        self._afterUpdate()
+
+    def _afterUpdate(self):
+        """Restores evicted elements in session mode, enforces the item budget and repaints in minimal update mode."""
+        if self._session:
+            self._sessionUpdate()
+        self._enforceItemBudget()
+
+        if self._minimal_update:
+            self.viewport().update()
 
-    def addCadItem(self, item: CadItem, do_bounds=True):
+    def addCadItem(self, item: CadItem, do_bounds=True, layer=None):
         """Adds a CAD item to the widget.
 
         Args:
             item (CadItem): The CAD item to be added to the widget.
             do_bounds (bool): If True, adjusts the bounds of the item in the view box.
+            layer (str or Layer, optional): The layer to add the item to. If None, the item is added
+                directly to the view box.
         """
-        item.createItems(self.w, do_bounds)
+        if layer is None:
+            item.createItems(self.w, do_bounds)
+            self._view_items[id(item)] = item
+        else:
+            layer = self.layer(layer)
+            item.createItems(layer, do_bounds)
+            layer.items.append(item)
+            self._item_layers[id(item)] = layer
+        if item.lazy:
+            self._lazy_items[id(item)] = item
+        self._index[id(item)] = self._next_serial
+        self._next_serial += 1
         self._items.append(item)
+        if item.lazy and item.visible:
+            self._touch(item)
+        elif self._session and not item.lazy:
+            self._sessionUpdate(len(self._items) - 1, new=True)
+        self._enforceItemBudget()
+        self.markDirty([item])
+
+    def addCadItems(self, items, do_bounds=False, layer=None):
+        """Adds a batch of CAD items to the widget.
+
+        Args:
+            items (iterable of CadItem): The CAD items to be added to the widget.
+            do_bounds (bool): If True, adjusts the bounds of the items in the view box.
+            layer (str or Layer, optional): The layer to add the items to. If None, the items are added
+                directly to the view box.
+        """
+        target = self.w if layer is None else self.layer(layer)
+
+        items = list(items)
+        for item in items:
+            item.createItems(target, do_bounds)
+        self._registerItems(items, target)
+
+    def restoreCadItems(self, items, do_bounds=False, layer=None):
+        """Adds CAD items back to the widget after they were removed with `removeCadItems(..., keep_graphics=True)`.
+
+        Graphics items that still exist are added to the view box or layer again instead of being re-created.
+        Items without graphics items are created as in `addCadItems`.
+
+        Args:
+            items (iterable of CadItem): The CAD items to add back.
+            do_bounds (bool): If True, adjusts the bounds of the items in the view box.
+            layer (str or Layer, optional): The layer to add the items to. If None, the items are added
+                directly to the view box.
+        """
+        target = self.w if layer is None else self.layer(layer)
+
+        items = list(items)
+        for item in items:
+            graphics = item.graphicsItems()
+            if not graphics:
+                item.createItems(target, do_bounds)
+                continue
+            for g in graphics:
+                target.addItem(g, ignoreBounds=not do_bounds)
+            item.updateItems(target)
+        self._registerItems(items, target)
+
+    def _registerItems(self, items, target):
+        """Adds CAD items whose graphics items were just added to `target` to the bookkeeping of the widget."""
+        for item in items:
+            if item.lazy and item.visible:
+                self._touch(item)
+
+        if target is not self.w:
+            target.items.extend(items)
+            for item in items:
+                self._item_layers[id(item)] = target
+        else:
+            self._view_items.update(zip(map(id, items), items, strict=True))
+        self._lazy_items.update((id(item), item) for item in items if item.lazy)
+        start = self._next_serial
+        self._next_serial += len(items)
+        self._index.update(zip(map(id, items), range(start, self._next_serial), strict=True))
+        self._items.extend(items)
+        if self._session:
+            self._sessionUpdate(len(self._items) - len(items), new=True)
+        self._enforceItemBudget()
+        self.markDirty(items)
+
+    def modifyCadItem(self, item: CadItem, **changes):
+        """Changes the geometry of a CAD item in place.
+
+        The graphics items of the CAD item are updated instead of re-created, and its cached bounding box and
+        selection highlight follow the change.
+
+        Args:
+            item (CadItem): The CAD item to change.
+            **changes: New values for the geometry of the item, see `CadItem.geometry`.
+        """
+        self.modifyCadItems([(item, changes)])
+
+    def modifyCadItems(self, changes):
+        """Changes the geometry of a batch of CAD items in place, see `modifyCadItem`.
+
+        The position of the items in the drawing is looked up once for the whole batch.
+
+        Items that are no longer part of the drawing, for example when an undo stack replays a change after the drawing
+        was cleared, only take over the new geometry.
+
+        Args:
+            changes (iterable): (item, dict of geometry changes) pairs.
+        """
+        changes = list(changes)
+        items = [item for item, _ in changes]
+        self.markDirty(items)
+
+        budget = False
+        for item, geometry in changes:
+            item.setGeometry(**geometry)
+            if id(item) not in self._index:
+                continue
+            layer = self._item_layers.get(id(item))
+            if layer is None:
+                item.updateItems(self.w)
+            elif layer.visible:
+                item.updateItems(layer)
+            if item.lazy and item.visible:
+                self._touch(item)
+                budget = True
+        if budget:
+            self._enforceItemBudget()
+        self.markDirty(items)
+        self._updateModifiedBounds(items)
+
+    def _updateModifiedBounds(self, items):
+        """Updates the bounds, the session state and the selection of items whose geometry changed."""
+        if self._bounds is None:
+            return
+        selected = False
+        for item, i in zip(items, self._positions(map(id, items), sort=False), strict=True):
+            if i is None:
+                continue  # no longer part of the drawing, e.g. when a change is undone after clearing
+            if i < len(self._bounds):
+                self._bounds[i] = item.bounds()
+                selected |= i < len(self._selection) and bool(self._selection[i])
+            if self._session and id(item) in self._evicted:
+                self._sessionUpdate(i, i + 1)
+        if selected:
+            self._updateSelectionOverlay()
+
+    def removeCadItems(self, items, keep_graphics=False):
+        """Removes a batch of CAD items from the widget.
+
+        The graphics items of the CAD items are removed from the view box or from their layer, and the CAD items
+        drop their references to them, so adding them again creates new graphics items. Removing many items at
+        once is much cheaper than removing them one by one.
+
+        Args:
+            items (iterable of CadItem): The CAD items to remove. Items that are not part of the
+                drawing are ignored.
+            keep_graphics (bool, optional): If True, the CAD items keep their graphics items so that
+                `restoreCadItems` can add them back, as done by undo. Defaults to False.
+        """
+        removed = {id(p) for p in items}
+        dropped = [self._items[i] for i in self._positions(removed)]
+        if not dropped:
+            return
+
+        touched_layers = {}
+        graphics = []
+        for p in dropped:
+            self.markDirty([p])
+            p._detach()
+            layer = self._item_layers.get(id(p))
+            if layer is None:
+                graphics.extend(p.graphicsItems())
+            else:
+                touched_layers[layer.name] = layer
+                for g in p.graphicsItems():
+                    layer.removeItem(g)
+        self._removeGraphicsItems(graphics)
+        self._discardItems(removed)
+
+        for layer in touched_layers.values():
+            layer.items = [p for p in layer.items if id(p) not in removed]
+        if not keep_graphics:
+            for p in dropped:
+                p._dropItems()
+        self.sigItemsRemoved.emit(dropped)
+
+    def _removeGraphicsItems(self, graphics):
+        """Removes graphics items from the view box.
+
+        Equivalent to calling `self.w.removeItem` for each item, but updates the auto-range only once.
+        """
+        if not graphics:
+            return
+        doomed = set(graphics)
+        self.w.addedItems = [g for g in self.w.addedItems if g not in doomed]
+        scene = self.w.scene()
+        for g in graphics:
+            if scene is not None and g.scene() is scene:
+                scene.removeItem(g)
+            g.setParentItem(None)
+        self.w.updateAutoRange()
+
+    def _discardItems(self, removed):
+        """Drops the CAD items with the given ids from the bookkeeping of the widget.
+
+        Args:
+            removed (set): `id()` of the CAD items to drop.
+        """
+        positions = self._positions(removed)
+        if not positions:
+            return
+        self._syncSelection()
+        if len(positions) == 1:
+            del self._items[positions[0]]
+        else:
+            keep = np.ones(len(self._items), dtype=bool)
+            keep[positions] = False
+            self._items = list(compress(self._items, keep))
+        self._serials = np.delete(self._serials, positions)
+        for key in removed:
+            self._index.pop(key, None)
+            self._item_layers.pop(key, None)
+            self._view_items.pop(key, None)
+            self._lazy_items.pop(key, None)
+            self._evicted.pop(key, None)
+            entry = self._materialized.pop(key, None)
+            if entry is not None:
+                self._materialized_count -= entry[1]
+
+        selection_changed = bool(self._selection[positions].any())
+        self._selection = np.delete(self._selection, positions)
+        if self._bounds is not None:
+            # items added after the last call of itemBounds have no cached bounds yet
+            cached = positions[: bisect_left(positions, len(self._bounds))]
+            self._bounds = np.delete(self._bounds, cached, axis=0)
+        if selection_changed:
+            self._updateSelectionOverlay()
+
+    def _positions(self, ids, sort=True):
+        """Returns the positions in `_items` of CAD items.
+
+        The serial numbers of the items are looked up in `_serials` with a binary search, so neither adding nor
+        removing items has to renumber the items behind them.
+
+        Args:
+            ids (iterable): `id()` of the CAD items.
+            sort (bool, optional): If True, returns the positions of the items that are part of the drawing in
+                ascending order. If False, returns one position per id, None for items that are not part of the
+                drawing. Defaults to True.
+
+        Returns:
+            list: The positions.
+        """
+        index = self._index
+        n = len(self._items)
+        if len(self._serials) < n:
+            # items added since the last lookup have the most recent serial numbers
+            missing = np.arange(self._next_serial - (n - len(self._serials)), self._next_serial)
+            self._serials = np.concatenate([self._serials, missing])
+        if sort:
+            serials = sorted(index[key] for key in ids if key in index)
+            return np.searchsorted(self._serials, serials).tolist()
+        serials = [index.get(key) for key in ids]
+        found = [s for s in serials if s is not None]
+        positions = iter(np.searchsorted(self._serials, found).tolist())
+        return [None if s is None else next(positions) for s in serials]
 
     def clearDrawing(self):
-        """Clears all CAD items from the widget."""
+        """Clears all CAD items from the widget.
+
+        The graphics items of all elements are removed from the scene and the elements drop their references to
+        them, so nothing of the drawing is kept alive by elements that are still referenced elsewhere. Graphics
+        items that are still in the scene afterwards are counted as leaked in `sessionStats`.
+
+        Layers are emptied but keep their name, z-order and style.
+        """
+        graphics = []
+        own = []
+        for p in self._items:
+            items = p.graphicsItems()
+            graphics.extend(items)
+            if id(p) not in self._item_layers:
+                own.extend(items)
+        self._removeGraphicsItems(own)
+        for p in self._items:
+            p._dropItems()
+        for layer in self._layers.values():
+            layer.clear()
+        leaked = sum(1 for g in graphics if isValid(g) and g.scene() is not None)
+        if leaked:
+            logger.warning("%d graphics items are still in the scene after clearing the drawing", leaked)
+        self._stats["leaked_items"] += leaked
+        self._stats["cleared"] += 1
+
+        removed = self._items
         self._items = []
+        self._index = {}
+        self._serials = np.zeros(0, dtype=np.int64)
+        self._item_layers = {}
+        self._view_items = {}
+        self._lazy_items = {}
+        self._selection = np.zeros(0, dtype=bool)
+        self._bounds = None
+        self._materialized = OrderedDict()
+        self._materialized_count = 0
+        self._evicted = {}
         self.w.clear()
+        self.w.addItem(self._selection_overlay, ignoreBounds=True)
+        if self.grid is not None:
+            self.w.addItem(self.grid, ignoreBounds=True)
+        self._updateSelectionOverlay()
+        if self._minimal_update:
+            self.viewport().update()
+        if removed:
+            self.sigItemsRemoved.emit(removed)
+
+    def hasCadItem(self, item: CadItem) -> bool:
+        """Returns whether a CAD item is part of the drawing."""
+        return id(item) in self._index
+
+    # ---- grid
+
+    def showGrid(self, show=True, min_spacing=12):
+        """Shows or hides an adaptive reference grid behind the drawing.
+
+        The grid is a single graphics item that draws only the lines inside the view, with a spacing that adapts
+        to the zoom level. It is not a CAD item and does not take part in selection, export or auto-range.
+
+        Args:
+            show (bool, optional): Whether the grid is shown. Defaults to True.
+            min_spacing (float, optional): Minimum distance between minor grid lines in pixels. Defaults to 12.
+        """
+        if self.grid is None:
+            if not show:
+                return
+            self.grid = GridItem(min_spacing)
+            self.grid.setZValue(-1e9)
+            self.w.addItem(self.grid, ignoreBounds=True)
+        self.grid.setMinSpacing(min_spacing)
+        self.grid.setVisible(show)
+
+    # ---- item budget
+
+    def setItemBudget(self, budget):
+        """Limits the number of graphics items of lazily created elements, such as `Measure`.
+
+        Lazy elements create their graphics items the first time they come into view. With a budget, the
+        elements that have been out of view the longest release their graphics items again as soon as the
+        total exceeds the budget; they are re-created when the element comes back into view. Elements in view
+        are never released, so the budget can be exceeded by what is on screen.
+
+        In session mode, the budget applies to all elements, see `setSessionMode`.
+
+        Args:
+            budget (int or None): The maximum number of graphics items, or None for no limit.
+        """
+        self._item_budget = budget
+        self._enforceItemBudget()
+
+    def _targetOf(self, item: CadItem):
+        """Returns the layer or view box the graphics items of a CAD item were added to."""
+        layer = self._item_layers.get(id(item))
+        return self.w if layer is None else layer
+
+    def _touch(self, item: CadItem, on_screen=True):
+        """Marks an element with graphics items as most recently visible.
+
+        Elements that are not on screen are put in front, so they are the first to be released.
+        """
+        key = id(item)
+        entry = self._materialized.get(key)
+        frame = self._frame if on_screen else -1
+        if entry is not None:
+            self._materialized[key] = (item, entry[1], frame)
+        else:
+            n = len(item.graphicsItems())
+            self._materialized[key] = (item, n, frame)
+            self._materialized_count += n
+        self._materialized.move_to_end(key, last=on_screen)
+
+    def _enforceItemBudget(self):
+        """Releases the graphics items of the least recently visible elements until the budget is met.
+
+        In session mode, all off-screen elements are released while the process uses more memory than allowed. The
+        memory is read every `MEMORY_SAMPLE_INTERVAL` checks.
+        """
+        budget = self._item_budget
+        if self._memory_budget is not None:
+            self._memory_countdown -= 1
+            if self._memory_countdown <= 0:
+                self._memory_countdown = self.MEMORY_SAMPLE_INTERVAL
+                memory = _process_memory()
+                if memory is not None:
+                    self._stats["peak_memory"] = max(self._stats["peak_memory"], memory)
+                self._over_memory = memory is not None and memory > self._memory_budget
+            if self._over_memory:
+                budget = 0
+        if budget is None:
+            return
+        victims = []
+        while self._materialized_count > budget and self._materialized:
+            key, (p, n, frame) = next(iter(self._materialized.items()))
+            layer = self._item_layers.get(key)
+            on_screen = p.visible if p.lazy else frame == self._frame
+            if on_screen and (layer is None or layer.visible):
+                break  # everything that is left is on screen
+            del self._materialized[key]
+            self._materialized_count -= n
+            victims.append(p)
+        if victims:
+            self._evict(victims)
+
+    def _evict(self, victims):
+        """Releases the graphics items of elements; elements that are not lazy are restored by the session."""
+        self.markDirty(victims)
+        bounded = None
+        graphics = []
+        for p in victims:
+            layer = self._item_layers.get(id(p))
+            items = p.graphicsItems()
+            if not p.lazy:
+                if layer is None:
+                    if bounded is None:
+                        bounded = {id(g) for g in self.w.addedItems}
+                    do_bounds = any(id(g) in bounded for g in items)
+                else:
+                    do_bounds = any(g in layer._bounded for g in items)
+                self._evicted[id(p)] = (p, do_bounds)
+            if layer is None:
+                graphics.extend(items)
+            else:
+                for g in items:
+                    layer.removeItem(g)
+        self._removeGraphicsItems(graphics)
+        for p in victims:
+            p._dropItems()
+        self._stats["evictions"] += len(victims)
+
+    # ---- session mode
+
+    def setSessionMode(self, enabled=True, max_items=None, max_memory=None):
+        """Enables or disables session mode for long-running viewers.
+
+        In session mode, the item budget applies to the graphics items of all elements, not only of lazy ones.
+        Elements that are entirely out of view release their graphics items when the budget is exceeded, least
+        recently visible first, and create them again when they come back into view. With a memory budget, all
+        off-screen elements are released while the resident memory of the process is above it. The memory is read
+        right away and then every `MEMORY_SAMPLE_INTERVAL` updates.
+
+        Args:
+            enabled (bool, optional): Whether to enable session mode. Defaults to True.
+            max_items (int, optional): The maximum number of live graphics items, or None for no limit. This is
+                the same budget as set by `setItemBudget`. Defaults to None.
+            max_memory (int, optional): The maximum resident memory of the process in bytes, or None for no
+                limit. Ignored on platforms where the memory can not be read. Defaults to None.
+        """
+        self._item_budget = max_items
+        self._memory_countdown = 0
+        self._over_memory = False
+        if enabled:
+            self._session = True
+            self._memory_budget = max_memory
+            self._sessionUpdate(new=True)
+        else:
+            self._session = False
+            self._memory_budget = None
+            for p, do_bounds in self._evicted.values():
+                p.createItems(self._targetOf(p), do_bounds)
+            self._evicted = {}
+            for key, (p, n, _) in list(self._materialized.items()):
+                if not p.lazy:
+                    del self._materialized[key]
+                    self._materialized_count -= n
+        self._enforceItemBudget()
+
+    def _sessionUpdate(self, start=0, stop=None, new=False):
+        """Tracks the elements in `_items[start:stop]` that are in view and restores their graphics items.
+
+        Elements without bounds are treated as always in view. With `new=True`, the elements are not tracked yet
+        and those out of view are added as least recently visible.
+        """
+        if new:
+            for p in self._items[start:stop]:
+                if not p.lazy:
+                    self._touch(p, on_screen=False)
+        bounds = self.itemBounds()[start:stop]
+        rect = self.w.viewRect()
+        outside = (
+            (bounds[:, 0] > rect.right())
+            | (bounds[:, 2] < rect.left())
+            | (bounds[:, 1] > rect.bottom())
+            | (bounds[:, 3] < rect.top())
+        )
+        restored = []
+        for i in (np.flatnonzero(~outside) + start).tolist():
+            p = self._items[i]
+            if p.lazy:
+                continue
+            key = id(p)
+            layer = self._item_layers.get(key)
+            if layer is not None and not layer.visible:
+                continue
+            evicted = self._evicted.pop(key, None)
+            if evicted is not None:
+                p.createItems(self.w if layer is None else layer, evicted[1])
+                restored.append(p)
+            self._touch(p)
+        if restored:
+            self._stats["restores"] += len(restored)
+            self.markDirty(restored)
+
+    def sessionStats(self) -> dict:
+        """Returns counters of the drawing, its graphics items and the memory of the process.
+
+        Returns:
+            dict: With the keys
+                - "elements": number of CAD items in the drawing,
+                - "live_items": number of graphics items of the CAD items,
+                - "evicted": number of elements whose graphics items are released by the session,
+                - "evictions", "restores": number of times graphics items were released and re-created,
+                - "cleared": number of calls of `clearDrawing`,
+                - "leaked_items": graphics items that were still in the scene after `clearDrawing`,
+                - "memory", "peak_memory": current and highest seen resident memory in bytes, or None.
+        """
+        memory = _process_memory()
+        if memory is not None:
+            self._stats["peak_memory"] = max(self._stats["peak_memory"], memory)
+        return {
+            "elements": len(self._items),
+            "live_items": sum(len(p.graphicsItems()) for p in self._items),
+            "evicted": len(self._evicted),
+            "evictions": self._stats["evictions"],
+            "restores": self._stats["restores"],
+            "cleared": self._stats["cleared"],
+            "leaked_items": self._stats["leaked_items"],
+            "memory": memory,
+            "peak_memory": self._stats["peak_memory"] if memory is not None else None,
+        }
+
+    def addLayer(self, name, z=0, visible=True, color=None, opacity=1.0) -> Layer:
+        """Creates a new layer.
+
+        Args:
+            name (str): The name of the layer.
+            z (float, optional): The z-value of the layer, layers with a higher value are drawn on top. Defaults to 0.
+            visible (bool, optional): Initial visibility of the layer. Defaults to True.
+            color (optional): If given, all items of the layer are drawn in this color. Defaults to None.
+            opacity (float, optional): The opacity of the layer. Defaults to 1.0.
+
+        Returns:
+            Layer: The new layer.
+
+        Raises:
+            ValueError: If a layer with the same name already exists.
+        """
+        if name in self._layers:
+            raise ValueError(name)
+        layer = Layer(name, self.w, z=z, visible=visible, color=color, opacity=opacity)
+        self._layers[name] = layer
+        return layer
+
+    def layer(self, name) -> Layer:
+        """Returns the layer with the given name.
+
+        Args:
+            name (str or Layer): The name of the layer. A `Layer` instance is returned as-is.
+
+        Raises:
+            KeyError: If the layer does not exist.
+        """
+        if isinstance(name, Layer):
+            return name
+        try:
+            return self._layers[name]
+        except KeyError:
+            raise KeyError(name) from None
+
+    def layerOf(self, item: CadItem):
+        """Returns the layer of a CAD item, or None if it was added directly to the view box."""
+        return self._item_layers.get(id(item))
+
+    def layers(self) -> list[Layer]:
+        """Returns all layers of the widget."""
+        return list(self._layers.values())
+
+    def setLayerVisible(self, name, visible: bool):
+        """Shows or hides all items of a layer.
+
+        Args:
+            name (str or Layer): The layer.
+            visible (bool): The new visibility.
+        """
+        layer = self.layer(name)
+        layer.setVisible(visible)
+        if not visible:
+            if self._minimal_update:
+                self.viewport().update()
+            return
+        self._frame += 1
+        for p in layer.items:
+            p.updateItems(layer)
+            if p.lazy and p.visible:
+                self._touch(p)
+        self._afterUpdate()
+
+    def clearLayer(self, name):
+        """Removes all CAD items of a layer from the widget.
+
+        The elements drop their references to their graphics items, so they can be added to the drawing again.
+
+        Args:
+            name (str or Layer): The layer to clear.
+        """
+        layer = self.layer(name)
+        items = layer.items
+        self.markDirty(items)
+        self._discardItems({id(p) for p in items})
+        for p in items:
+            p._dropItems()
+        layer.clear()
+        if items:
+            self.sigItemsRemoved.emit(items)
+
+    def geometryStore(self) -> GeometryStore:
+        """Returns a snapshot of the geometry of all CAD items in NumPy arrays.
+
+        The snapshot does not reference any Qt object, so queries on it can run on a worker thread.
+
+        Returns:
+            GeometryStore: The geometry of all items, tagged with the name of their layer.
+        """
+        return GeometryStore.from_widget(self)
+
+    # ---- selection
+
+    def setSelectionMode(self, mode):
+        """Sets what dragging with the left mouse button does.
+
+        With a selection mode, dragging selects the items inside the dragged shape. Holding shift adds to
+        the selection, holding control toggles the items in the shape.
+
+        Args:
+            mode (str or None): "box" for a selection rectangle, "lasso" for a free-form lasso, or None to
+                pan the view.
+        """
+        if mode not in (None, "box", "lasso"):
+            raise ValueError(mode)
+        self.w.selectionMode = mode
+
+    def _selectionDrawn(self, kind, shape, modifiers):
+        """Resolves a finished rubber-band drag of the view box into a selection."""
+        if modifiers & Qt.KeyboardModifier.ShiftModifier:
+            mode = "add"
+        elif modifiers & Qt.KeyboardModifier.ControlModifier:
+            mode = "toggle"
+        else:
+            mode = "replace"
+
+        if kind == "lasso":
+            self.selectInLasso([(p.x(), p.y()) for p in shape], mode=mode)
+        else:
+            self.selectInRect(shape, mode=mode)
+
+    def itemBounds(self) -> np.ndarray:
+        """Returns the bounding boxes of all CAD items.
+
+        The bounding boxes are cached; only items that were added since the last call are evaluated.
+        Items without `bounds` get NaN bounds.
+
+        Returns:
+            ndarray: (n, 4) array with (xmin, ymin, xmax, ymax) of each item in `_items`.
+        """
+        if self._bounds is None:
+            self._bounds = np.zeros((0, 4))
+        known = len(self._bounds)
+        if known < len(self._items):
+            new = np.full((len(self._items) - known, 4), np.nan)
+            for i, p in enumerate(self._items[known:]):
+                try:
+                    new[i] = p.bounds()
+                except NotImplementedError:
+                    continue
+            self._bounds = np.concatenate([self._bounds, new])
+        return self._bounds
+
+    def _syncSelection(self):
+        """Extends the selection mask with unselected entries for items that were added since."""
+        n = len(self._items)
+        if len(self._selection) < n:
+            self._selection = np.concatenate([self._selection, np.zeros(n - len(self._selection), dtype=bool)])
+
+    def _applySelection(self, hits, mode):
+        """Combines a mask of hit items with the current selection.
+
+        Args:
+            hits (ndarray): Boolean mask of the hit items.
+            mode (str): "replace", "add", "remove" or "toggle".
+        """
+        self._syncSelection()
+        if mode == "replace":
+            self._selection = hits
+        elif mode == "add":
+            self._selection = self._selection | hits
+        elif mode == "remove":
+            self._selection = self._selection & ~hits
+        elif mode == "toggle":
+            self._selection = self._selection ^ hits
+        else:
+            raise ValueError(mode)
+        self._updateSelectionOverlay()
+
+    def selectInRect(self, rect, mode="replace", contained=True):
+        """Selects the items inside a rectangle.
+
+        Args:
+            rect (QRectF or tuple): The rectangle in drawing coordinates, as `QRectF` or (xmin, ymin, xmax, ymax).
+            mode (str, optional): How to combine with the current selection: "replace", "add", "remove" or
+                "toggle". Defaults to "replace".
+            contained (bool, optional): If True, only items that are completely inside the rectangle are hit;
+                if False, all items that intersect the rectangle are hit. Defaults to True.
+
+        Returns:
+            int: The number of selected items.
+        """
+        if isinstance(rect, QRectF):
+            rect = rect.normalized()
+            rect = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        x0, y0, x1, y1 = rect
+        b = self.itemBounds()
+        with np.errstate(invalid="ignore"):
+            if contained:
+                hits = (b[:, 0] >= x0) & (b[:, 1] >= y0) & (b[:, 2] <= x1) & (b[:, 3] <= y1)
+            else:
+                hits = (b[:, 2] >= x0) & (b[:, 3] >= y0) & (b[:, 0] <= x1) & (b[:, 1] <= y1)
+        self._applySelection(hits, mode)
+        return int(self._selection.sum())
+
+    def selectInLasso(self, points, mode="replace"):
+        """Selects the items whose bounding box center is inside a lasso polygon.
+
+        Args:
+            points (sequence): The (x, y) points of the lasso in drawing coordinates.
+            mode (str, optional): How to combine with the current selection, see `selectInRect`.
+
+        Returns:
+            int: The number of selected items.
+        """
+        lasso = np.asarray(points, dtype=float).reshape(-1, 2)
+        b = self.itemBounds()
+        hits = np.zeros(len(b), dtype=bool)
+        if len(lasso) >= 3:
+            cx = 0.5 * (b[:, 0] + b[:, 2])
+            cy = 0.5 * (b[:, 1] + b[:, 3])
+
+            lo = lasso.min(axis=0)
+            hi = lasso.max(axis=0)
+            with np.errstate(invalid="ignore"):
+                candidates = np.flatnonzero((cx >= lo[0]) & (cx <= hi[0]) & (cy >= lo[1]) & (cy <= hi[1]))
+            px = cx[candidates]
+            py = cy[candidates]
+
+            # even-odd rule, one vectorized pass per lasso edge
+            inside = np.zeros(len(candidates), dtype=bool)
+            for (xa, ya), (xb, yb) in zip(lasso, np.roll(lasso, -1, axis=0), strict=True):
+                if ya == yb:
+                    continue
+                crosses = (ya > py) != (yb > py)
+                x_cross = xa + (py - ya) * (xb - xa) / (yb - ya)
+                inside ^= crosses & (px < x_cross)
+            hits[candidates[inside]] = True
+
+        self._applySelection(hits, mode)
+        return int(self._selection.sum())
+
+    def selectionMask(self) -> np.ndarray:
+        """Returns the selection as a boolean mask over the CAD items, in the order in which they were added."""
+        self._syncSelection()
+        return self._selection
+
+    def selectedItems(self) -> list:
+        """Returns the selected CAD items."""
+        self._syncSelection()
+        return [self._items[i] for i in np.flatnonzero(self._selection)]
+
+    def clearSelection(self):
+        """Deselects all items."""
+        self._selection = np.zeros(len(self._items), dtype=bool)
+        self._updateSelectionOverlay()
+
+    def deleteSelection(self):
+        """Removes the selected CAD items from the widget."""
+        self.removeCadItems(self.selectedItems())
+
+    def restyleSelection(self, pen=None, brush=None):
+        """Changes the pen and/or brush of the graphics items of the selected CAD items.
+
+        Args:
+            pen (optional): The new pen, anything accepted by `pg.mkPen`. Defaults to None (unchanged).
+            brush (optional): The new brush, anything accepted by `pg.mkBrush`. Defaults to None (unchanged).
+        """
+        pen = None if pen is None else pg.mkPen(pen)
+        brush = None if brush is None else pg.mkBrush(brush)
+        selected = self.selectedItems()
+        for p in selected:
+            for g in p.graphicsItems():
+                if pen is not None and hasattr(g, "setPen"):
+                    g.setPen(pen)
+                if brush is not None and hasattr(g, "setBrush"):
+                    g.setBrush(brush)
+        self.markDirty(selected)
+
+    def _updateSelectionOverlay(self):
+        """Highlights the bounding boxes of all selected items with the single overlay item."""
+        if self._minimal_update:
+            self.markDirtyRect(self._selection_overlay.sceneBoundingRect())
+
+        self._syncSelection()
+        b = self.itemBounds()[self._selection]
+        self._selection_overlay.setRects(b[~np.isnan(b).any(axis=1)])
+
+        if self._minimal_update:
+            self.markDirtyRect(self._selection_overlay.sceneBoundingRect())
+
+    def setMinimalUpdate(self, enabled=True):
+        """Enables or disables minimal update mode.
+
+        In minimal update mode Qt does not schedule repaints by itself. Instead, the widget tracks the bounding
+        rectangles of changed CAD items, merges them and repaints only those regions of the viewport. Changing
+        the view range, a layer visibility or clearing the drawing repaints the whole viewport.
+
+        Items that are changed directly, without going through the widget, must be reported with `markDirty`
+        or `markDirtyRect`; otherwise the change only becomes visible at the next repaint.
+
+        Args:
+            enabled (bool, optional): Whether to enable minimal update mode. Defaults to True.
+        """
+        self._minimal_update = enabled
+        if enabled:
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.NoViewportUpdate)
+        else:
+            self._dirty = []
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+        self.viewport().update()
+
+    def markDirty(self, items):
+        """Schedules a repaint of the regions covered by the given CAD items.
+
+        Does nothing if minimal update mode is disabled; Qt then tracks changes by itself.
+
+        Args:
+            items (iterable of CadItem): The changed CAD items.
+        """
+        if not self._minimal_update:
+            return
+        for p in items:
+            for g in p.graphicsItems():
+                if g.scene() is not None:
+                    self.markDirtyRect(g.sceneBoundingRect())
+            for rect in p._sharedSceneRects():
+                self.markDirtyRect(rect)
+
+    def markDirtyRect(self, rect: QRectF):
+        """Schedules a repaint of a rectangle in scene coordinates.
+
+        The repaint happens when control returns to the event loop, so that all changes made in the
+        same event are repainted together.
+
+        Args:
+            rect (QRectF): The changed rectangle in scene coordinates.
+        """
+        if not self._minimal_update:
+            return
+        self._dirty.append(rect)
+        if not self._dirty_timer.isActive():
+            self._dirty_timer.start()
+
+    def _flushDirty(self):
+        """Repaints the merged dirty rectangles."""
+        dirty = self._dirty
+        self._dirty = []
+        if not dirty:
+            return
+
+        # map to the viewport, with a small margin for anti-aliasing and cosmetic pens
+        rects = [self.mapFromScene(r).boundingRect().adjusted(-2, -2, 2, 2) for r in dirty]
+        rects = _mergeRects(rects, self.MAX_DIRTY_RECTS)
+
+        region = QRegion()
+        for r in rects:
+            region = region.united(r)
+        self.viewport().update(region)
+
+
+def _mergeRects(rects, max_rects):
+    """Merges overlapping rectangles.
+
+    Rectangles that intersect are replaced by their bounding rectangle until no two rectangles overlap.
+    If more than `max_rects` rectangles remain, a single bounding rectangle is returned.
+
+    Args:
+        rects (list of QRect): The rectangles to merge.
+        max_rects (int): The maximum number of rectangles to return.
+
+    Returns:
+        list of QRect: The merged rectangles.
+    """
+    merged = []
+    for r in sorted(rects, key=lambda r: r.left()):
+        merged = _addMerged(merged, r)
+        if len(merged) > max_rects:
+            bounding = rects[0]
+            for other in rects[1:]:
+                bounding = bounding.united(other)
+            return [bounding]
+    return merged
+
+
+def _addMerged(merged, rect):
+    """Adds a rectangle to a list of non-overlapping rectangles, merging it with every rectangle it overlaps."""
+    remaining = []
+    for m in merged:
+        if m.intersects(rect):
+            rect = rect.united(m)
+        else:
+            remaining.append(m)
+    if len(remaining) < len(merged):
+        # the united rectangle can overlap rectangles that were checked before it grew
+        return _addMerged(remaining, rect)
+    remaining.append(rect)
+    return remaining
+
+
+def _process_memory():
+    """Returns the resident memory of the process in bytes, or None if it can not be determined."""
+    try:
+        import psutil
+    except ImportError:
+        pass
+    else:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
@@ -1,9 +1,34 @@
-"""Dummy conftest.py for cadvas.
+"""Shared fixtures for the cadvas tests.
 
-If you don't know what this is for, just leave it empty.
-Read more about conftest.py under:
-- https://docs.pytest.org/en/stable/fixture.html
-- https://docs.pytest.org/en/stable/writing_plugins.html
+The tests run against real Qt objects on the offscreen platform, so no display is needed. Set `QT_QPA_PLATFORM`
+explicitly to run them on another platform.
 """
 
-# import pytest
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pyqtgraph as pg
+import pytest
+
+from cadvas import QCadvasWidget
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The application of the test session."""
+    return pg.mkQApp()
+
+
+@pytest.fixture
+def widget(qapp):
+    """A shown 800 x 600 widget that views the region (0, 0) - (100, 100)."""
+    w = QCadvasWidget()
+    w.resize(800, 600)
+    w.show()
+    w.w.setRange(xRange=(0, 100), yRange=(0, 100), padding=0)
+    qapp.processEvents()
+    yield w
+    w.close()
+    w.deleteLater()
+    qapp.processEvents()
@@ -0,0 +1,46 @@
+"""Tests of blocks and inserts."""
+
+from cadvas import Block, Box, Insert, Segment
+
+
+def test_inserts_share_the_block_picture(widget):
+    block = Block([Box((0, 0), (1, 1)), Segment((0, 0), (1, 1))], name="bolt")
+    inserts = [Insert(block, position=(i, 0), rotation=90) for i in range(3)]
+    widget.addCadItems(inserts)
+
+    assert block.bounds() == (0, 0, 1, 1)
+    assert {id(i.graphics.block.picture()) for i in inserts} == {id(block.picture())}
+    x0, y0, x1, y1 = inserts[1].bounds()
+    assert (x0, x1, y0, y1) == (0, 1, 0, 1)
+
+
+def test_nested_block_bounds():
+    inner = Block([Box((0, 0), (1, 1))])
+    outer = Block([Insert(inner, position=(10, 0), scale=2)])
+
+    assert outer.bounds() == (10, 0, 12, 2)
+
+
+def test_invalidate_updates_the_bounds_of_shown_inserts(widget):
+    block = Block([Box((0, 0), (1, 1))])
+    insert = Insert(block, position=(5, 5))
+    widget.addCadItem(insert)
+    picture = block.picture()
+    assert insert.graphics.boundingRect().width() == 3
+
+    block.items.append(Box((0, 0), (10, 4)))
+    block.invalidate()
+
+    assert block.picture() is not picture
+    rect = insert.graphics.boundingRect()
+    assert (rect.width(), rect.height()) == (12, 6)
+    assert insert.graphics.mapRectToParent(rect).contains(14, 8)
+
+
+def test_invalidate_ignores_deleted_inserts(widget):
+    block = Block([Box((0, 0), (1, 1))])
+    widget.addLayer("symbols")
+    widget.addCadItem(Insert(block), layer="symbols")
+    widget.clearLayer("symbols")
+
+    block.invalidate()
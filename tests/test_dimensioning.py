@@ -0,0 +1,127 @@
+"""Tests of automatic dimensioning."""
+
+import numpy as np
+import pytest
+
+from cadvas import Box, Circle, Segment
+from cadvas.dimensioning import AutoDimensioner, auto_dimensions, dimension_tracks
+
+
+def _max_overlap(lo, hi):
+    events = sorted([(x, 1) for x in lo] + [(x, -1) for x in hi], key=lambda e: (e[0], e[1]))
+    depth = best = 0
+    for _, step in events:
+        depth += step
+        best = max(best, depth)
+    return best
+
+
+def test_tracks_do_not_overlap_and_are_minimal():
+    rng = np.random.default_rng(3)
+    lo = rng.uniform(0, 100, 500)
+    hi = lo + rng.exponential(5, 500)
+    hi[:20] = lo[:20]  # zero-length intervals
+    lo[20:40] = np.round(lo[20:40])  # equal starts
+    hi[20:40] = lo[20:40] + 1
+
+    tracks = dimension_tracks(lo, hi)
+
+    for track in np.unique(tracks):
+        members = np.flatnonzero(tracks == track)
+        order = members[np.argsort(lo[members], kind="stable")]
+        assert (lo[order][1:] >= hi[order][:-1]).all()
+    assert tracks.max() + 1 == _max_overlap(lo, hi)
+
+
+def test_touching_intervals_share_a_track():
+    assert dimension_tracks([0, 1, 2], [1, 2, 3]).tolist() == [0, 0, 0]
+    assert dimension_tracks([], []).tolist() == []
+
+
+def _spans(measures):
+    return [(m.start[0], m.end[0]) for m in measures]
+
+
+def test_chain():
+    items = [Box((0, 0), (2, 1)), Box((5, 0), (7, 3))]
+    measures = auto_dimensions(items, mode="chain")
+
+    assert _spans(measures) == [(0, 2), (2, 5), (5, 7)]
+    assert {m.start[1] for m in measures} == {0}
+    assert {m.geometry()["offset"] for m in measures} == {1.0}
+    # below the drawing
+    assert all(m.midpoint[1] < 0 for m in measures)
+
+
+def test_baseline_nests_in_tracks():
+    items = [Segment((0, 0), (2, 0)), Segment((5, 0), (9, 0))]
+    measures = auto_dimensions(items, mode="baseline", offset=2, spacing=0.5)
+
+    assert _spans(measures) == [(0, 2), (0, 5), (0, 9)]
+    assert [m.geometry()["offset"] for m in measures] == [2, 2.5, 3]
+
+
+def test_overall_per_item_stacks_overlapping_items():
+    items = [Box((0, 0), (4, 1)), Box((2, 2), (6, 3)), Box((10, 0), (11, 1))]
+    measures = auto_dimensions(items, mode="overall", per_item=True)
+
+    assert _spans(measures) == [(0, 4), (2, 6), (10, 11)]
+    assert [m.geometry()["offset"] for m in measures] == [1, 2, 1]
+
+
+def test_vertical_right_and_above():
+    items = [Box((0, 0), (1, 3)), Circle((5, 5), 1)]
+    right = auto_dimensions(items, mode="overall", axis="y", side="right")
+    above = auto_dimensions(items, mode="overall", axis="x", side="above")
+
+    assert [(m.start, m.end) for m in right] == [((6, 0), (6, 6))]
+    assert right[0].midpoint[0] > 6
+    assert [(m.start, m.end) for m in above] == [((0, 6), (6, 6))]
+    assert above[0].midpoint[1] > 6
+
+
+def test_close_coordinates_are_merged():
+    items = [Segment((0, 0), (1, 0)), Segment((1 + 1e-12, 0), (3, 0))]
+
+    assert _spans(auto_dimensions(items)) == [(0, 1), (1, 3)]
+    assert auto_dimensions([Segment((0, 0), (0, 5))]) == []
+    assert auto_dimensions([]) == []
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"mode": "ordinate"}, {"axis": "z"}, {"axis": "x", "side": "left"}, {"axis": "y", "side": "below"}]
+)
+def test_invalid_options(kwargs):
+    with pytest.raises(ValueError):
+        auto_dimensions([Segment((0, 0), (1, 1))], **kwargs)
+
+
+def test_dimensioner_adds_in_batches(widget):
+    widget.addLayer("dims")
+    dimensioner = AutoDimensioner(widget, layer="dims", batch_size=2)
+    batches, finished = [], []
+    dimensioner.sigBatchAdded.connect(batches.append)
+    dimensioner.sigFinished.connect(lambda: finished.append(True))
+    items = [Segment((i, 0), (i + 1, 0)) for i in range(5)]
+
+    measures = dimensioner.dimension(items, mode="chain")
+    dimensioner._timer.stop()
+    assert len(measures) == 5
+    assert dimensioner.pending() == 5
+
+    while dimensioner.pending():
+        dimensioner.flush()
+    assert batches == [2, 2, 1]
+    assert finished == [True]
+    assert widget.layer("dims").items == measures
+
+
+def test_dimensioner_cancel(widget, qapp):
+    dimensioner = AutoDimensioner(widget, batch_size=1)
+    dimensioner.dimension([Segment((0, 0), (1, 0)), Segment((2, 0), (3, 0))])
+    dimensioner.flush()
+    dimensioner.cancel()
+    qapp.processEvents()
+
+    assert dimensioner.pending() == 0
+    assert len(widget._items) == 1
@@ -0,0 +1,92 @@
+"""Tests of the SVG and PDF export."""
+
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from cadvas import Block, Box, Circle, Hatch, Insert, Measure, Polygon, Segment
+from cadvas.elements import LINE_WIDTH
+from cadvas.export import export_pdf, export_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+XLINK = "{http://www.w3.org/1999/xlink}"
+
+
+def drawing():
+    bolt = Block([Circle((0, 0), 0.5), Segment((-0.7, 0), (0.7, 0))], name="bolt")
+    return [
+        Segment((0, 0), (10, 0)),
+        Box((0, 0), (4, 2), hatch=Hatch(spacing=0.5)),
+        Polygon([(5, 5), (8, 5), (8, 8)]),
+        Measure((0, 0), (10, 0), offset=2),
+        Insert(bolt, position=(2, 8)),
+        Insert(bolt, position=(6, 8), rotation=90),
+    ]
+
+
+def export(items, **kwargs):
+    out = io.StringIO()
+    export_svg(items, out, **kwargs)
+    return ET.fromstring(out.getvalue())  # noqa: S314 - parses our own output
+
+
+def test_svg_page_and_coordinates():
+    root = export([Segment((0, 0), (10, 5))], width=100, margin=10)
+
+    assert root.get("width") == "120"
+    assert root.get("height") == "70"
+    line = root.find(f"{SVG}line")
+    # y points down in the output
+    assert [line.get(k) for k in ("x1", "y1", "x2", "y2")] == ["10", "60", "110", "10"]
+    assert line.get("stroke-width") == f"{LINE_WIDTH * 10:g}"
+
+
+def test_svg_blocks_are_defined_once_and_referenced_twice():
+    root = export(drawing())
+
+    assert len(root.findall(f".//{SVG}defs/{SVG}g")) == 1
+    uses = root.findall(f"{SVG}use")
+    assert len(uses) == 2
+    for use in uses:
+        assert use.get("href") == use.get(f"{XLINK}href") == "#block0"
+
+
+def test_svg_hatch_pattern_and_measure():
+    root = export(drawing())
+
+    rect = root.find(f"{SVG}rect[@fill='url(#hatch0)']")
+    assert rect is not None
+    assert root.find(f".//{SVG}pattern[@id='hatch0']") is not None
+
+    arrows = root.findall(f"{SVG}polygon[@fill='none']")
+    arrows = [a for a in arrows if a.get("stroke") != "black"]
+    assert len(arrows) == 2
+    assert all(a.get("stroke-width") == f"{LINE_WIDTH:g}" for a in arrows)
+    assert root.find(f".//{SVG}text").text == "10.00"
+
+
+def test_invalid_measures_are_skipped():
+    root = export([Segment((0, 0), (1, 1)), Measure((1, 1), (1, 1))])
+    assert root.find(f".//{SVG}text") is None
+
+
+def test_generators_need_bounds():
+    with pytest.raises(ValueError):
+        export_svg(iter(drawing()), io.StringIO())
+    root = export(iter(drawing()), bounds=(0, 0, 10, 10))
+    assert len(root.findall(f"{SVG}use")) == 2
+
+
+def test_unknown_elements_are_rejected():
+    with pytest.raises(TypeError):
+        export_svg([object()], io.StringIO(), bounds=(0, 0, 1, 1))
+
+
+def test_pdf(qapp, tmp_path):
+    path = tmp_path / "drawing.pdf"
+    export_pdf(drawing(), path)
+
+    data = path.read_bytes()
+    assert data.startswith(b"%PDF")
+    assert b"/Page" in data
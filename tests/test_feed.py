@@ -0,0 +1,145 @@
+"""Tests of `DrawingFeed`."""
+
+import pytest
+
+from cadvas import Box, DrawingFeed, Hatch, Segment
+
+
+@pytest.fixture
+def feed(widget):
+    """A feed whose deltas are only applied by explicit flushes."""
+    f = DrawingFeed(widget, max_pending=3)
+    f._timer.stop()
+    yield f
+    f.stop()
+
+
+def test_deltas_are_coalesced_per_key(widget, feed):
+    applied = []
+    feed.sigApplied.connect(applied.append)
+    for i in range(5):
+        feed.set("a", Segment((0, 0), (i + 1, 0)))
+    feed.set("b", Box((0, 0), (1, 1)))
+    feed.flush()
+
+    assert applied == [2]
+    assert len(widget._items) == 2
+    assert feed.items()["a"].end == (5, 0)
+
+
+def test_remove(widget, feed):
+    feed.set("a", Segment((0, 0), (1, 0)))
+    feed.flush()
+    feed.remove("a")
+    feed.remove("unknown")
+    feed.flush()
+
+    assert feed.items() == {}
+    assert widget._items == []
+
+
+def test_update_is_applied_in_place(widget, feed, monkeypatch):
+    widget.addLayer("live")
+    feed.set("a", Box((0, 0), (1, 1), hatch=Hatch()), layer="live")
+    feed.flush()
+    shown = feed.items()["a"]
+    rect = shown.rect
+
+    calls = []
+    monkeypatch.setattr(widget, "addCadItems", lambda *a, **kw: calls.append("add"))
+    feed.set("a", Box((2, 2), (4, 4), hatch=Hatch()), layer="live")
+    feed.flush()
+
+    assert calls == []
+    assert feed.items()["a"] is shown
+    assert shown.rect is rect
+    assert shown.lower_left == (2, 2)
+    assert widget.layer("live").items == [shown]
+
+
+def test_update_with_other_style_or_layer_replaces(widget, feed):
+    widget.addLayer("live")
+    feed.set("a", Box((0, 0), (1, 1)))
+    feed.flush()
+    first = feed.items()["a"]
+
+    feed.set("a", Box((0, 0), (1, 1), hatch=Hatch(cross=True)))
+    feed.flush()
+    second = feed.items()["a"]
+    assert second is not first
+
+    feed.set("a", Box((0, 0), (1, 1), hatch=Hatch(cross=True)), layer="live")
+    feed.flush()
+    assert widget.layerOf(feed.items()["a"]).name == "live"
+    assert widget._items == [feed.items()["a"]]
+
+
+def test_unknown_layer_is_rejected_before_queueing(widget, feed):
+    feed.set("a", Segment((0, 0), (1, 0)))
+    feed.flush()
+    with pytest.raises(KeyError):
+        feed.set("a", Segment((0, 0), (2, 0)), layer="missing")
+    feed.flush()
+
+    assert feed._pending == {}
+    assert feed.items()["a"].end == (1, 0)
+    assert widget._items == [feed.items()["a"]]
+
+
+def test_failed_add_keeps_bookkeeping(widget, feed, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError
+
+    monkeypatch.setattr(widget, "addCadItems", fail)
+    feed.set("a", Segment((0, 0), (1, 0)))
+    with pytest.raises(RuntimeError):
+        feed.flush()
+
+    assert feed.items() == {}
+
+
+def test_full_feed_does_not_block(feed):
+    for key in "abc":
+        assert feed.set(key, Segment((0, 0), (1, 0)))
+    assert feed.set("a", Segment((0, 0), (2, 0)), block=False)
+    assert not feed.set("d", Segment((0, 0), (1, 0)), block=False)
+    assert not feed.set("d", Segment((0, 0), (1, 0)), timeout=0.01)
+    feed.flush()
+    assert feed.set("d", Segment((0, 0), (1, 0)), block=False)
+
+
+def test_set_after_clearing_the_drawing_adds_again(widget, feed):
+    feed.set("a", Segment((0, 0), (1, 0)))
+    feed.set("b", Segment((0, 1), (1, 1)))
+    feed.flush()
+    widget.clearDrawing()
+    assert feed.items() == {}
+
+    feed.set("a", Segment((0, 0), (2, 0)))
+    feed.remove("b")
+    feed.flush()
+
+    shown = feed.items()["a"]
+    assert widget._items == [shown]
+    assert shown.end == (2, 0)
+    assert shown.line.scene() is widget.w.scene()
+
+
+def test_elements_removed_elsewhere_are_forgotten(widget, feed):
+    widget.addLayer("live")
+    feed.set("a", Segment((0, 0), (1, 0)), layer="live")
+    feed.set("b", Segment((0, 1), (1, 1)))
+    feed.set("c", Segment((0, 2), (1, 2)))
+    feed.flush()
+    b = feed.items()["b"]
+
+    widget.clearLayer("live")
+    widget.removeCadItems([b])
+    assert list(feed.items()) == ["c"]
+
+    # a stale element is added anew instead of being modified
+    feed._live["b"] = b
+    feed.set("b", Segment((0, 1), (3, 1)))
+    feed.flush()
+    assert feed.items()["b"] is not b
+    assert widget.hasCadItem(feed.items()["b"])
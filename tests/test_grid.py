@@ -0,0 +1,82 @@
+"""Tests of the adaptive reference grid."""
+
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from cadvas.grid import grid_spacing
+
+
+@pytest.mark.parametrize(
+    ("pixel_size", "expected"),
+    [
+        (1 / 12, (1, 5)),
+        (0.1, (2, 10)),
+        (0.3, (5, 10)),
+        (0.5, (10, 50)),
+        (0.001, (0.02, 0.1)),
+        (40, (500, 1000)),
+    ],
+)
+def test_spacing_follows_the_1_2_5_sequence(pixel_size, expected):
+    assert grid_spacing(pixel_size) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("pixel_size", [10.0**e * m for e in range(-4, 5) for m in (1, 1.3, 2.7, 4.9, 7.7)])
+def test_spacing_is_the_smallest_wide_enough(pixel_size):
+    minor, major = grid_spacing(pixel_size, min_spacing=12)
+    target = 12 * pixel_size
+
+    assert minor >= target * (1 - 1e-12)
+    assert minor / 2.5 < target  # the previous step of the sequence is too narrow
+    mantissa = major / 10.0 ** math.floor(math.log10(major) + 1e-9)
+    assert mantissa == pytest.approx(5) or mantissa == pytest.approx(1)
+    assert round(major / minor) in (2, 5)
+
+
+def test_grid_follows_the_view(widget, qapp):
+    widget.showGrid(min_spacing=20)
+    grid = widget.grid
+    pixel_size = max(widget.w.viewPixelSize())
+    assert grid.spacing() == grid_spacing(pixel_size, 20)
+    assert grid.boundingRect() == widget.w.viewRect()
+
+    widget.w.setRange(xRange=(0, 1000), yRange=(0, 1000), padding=0)
+    qapp.processEvents()
+    assert grid.boundingRect() == widget.w.viewRect()
+    assert grid.spacing()[0] > 1
+
+
+def test_paint_draws_only_lines_in_view(widget, qapp):
+    widget.showGrid()
+    widget.w.setRange(xRange=(-50, 50), yRange=(-50, 50), padding=0)
+    qapp.processEvents()
+    grid = widget.grid
+    minor, _ = grid.spacing()
+    rect = grid.boundingRect()
+
+    drawn = []
+    painter = SimpleNamespace(setPen=lambda pen: None, drawLines=lambda lines: drawn.append(list(lines)))
+    grid.paint(painter, None)
+
+    minor_lines, major_lines, axes = drawn
+    assert len(axes) == 2
+    total = len(minor_lines) + len(major_lines) + len(axes)
+    expected = (math.floor(rect.right() / minor) - math.ceil(rect.left() / minor) + 1) + (
+        math.floor(rect.bottom() / minor) - math.ceil(rect.top() / minor) + 1
+    )
+    assert total == expected
+    for line in minor_lines + major_lines:
+        assert rect.left() <= line.x1() <= rect.right()
+        assert rect.top() <= line.y1() <= rect.bottom()
+
+
+def test_grid_survives_clearing_the_drawing(widget):
+    widget.showGrid()
+    widget.clearDrawing()
+
+    assert widget.grid.scene() is widget.w.scene()
+
+    widget.showGrid(False)
+    assert not widget.grid.isVisible()
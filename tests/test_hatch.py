@@ -0,0 +1,66 @@
+"""Tests of hatch styles and their scale buckets."""
+
+import pytest
+
+from cadvas import Box, Circle, Hatch, Polygon
+from cadvas import viewbox as viewbox_module
+from cadvas.hatch import MAX_TEXTURE_SPACING, MIN_TEXTURE_SPACING, hatch_brush, hatch_bucket
+
+
+def test_bucket_is_a_clamped_power_of_two():
+    hatch = Hatch(spacing=1.0)
+
+    assert hatch_bucket(hatch, 1 / 16) == 16
+    assert hatch_bucket(hatch, 1 / 20) == 16
+    assert hatch_bucket(hatch, 1.0) == MIN_TEXTURE_SPACING
+    assert hatch_bucket(hatch, 1e-6) == MAX_TEXTURE_SPACING
+    assert hatch_bucket(Hatch(spacing=None, fill=(255, 0, 0)), 0.1) == 0
+
+
+def test_invalid_spacing():
+    with pytest.raises(ValueError, match="spacing"):
+        Hatch(spacing=0)
+
+
+def test_brushes_are_shared_per_style_and_bucket():
+    a = hatch_brush(Hatch(angle=30), bucket=16)
+
+    assert hatch_brush(Hatch(angle=30), bucket=16) is a
+    assert hatch_brush(Hatch(angle=30), bucket=32) is not a
+    assert hatch_brush(Hatch(angle=60), bucket=16) is not a
+
+
+def test_view_box_computes_each_bucket_once_per_zoom(widget, monkeypatch):
+    calls = []
+
+    def counting_bucket(hatch, pixel_size):
+        calls.append(hatch.spacing)
+        return hatch_bucket(hatch, pixel_size)
+
+    monkeypatch.setattr(viewbox_module, "hatch_bucket", counting_bucket)
+    hatch, other = Hatch(spacing=1.0), Hatch(spacing=2.0)
+    widget.addCadItems([Box((i, i), (i + 1, i + 1), hatch=hatch) for i in range(50)])
+    widget.addCadItems([Circle((i, 50), 0.5, hatch=other) for i in range(50)])
+    calls.clear()
+
+    widget.updateMeasurements()
+    assert calls == []
+
+    widget.w.setRange(xRange=(0, 400), yRange=(0, 400), padding=0)
+    assert sorted(calls) == [1.0, 2.0]
+
+
+def test_brush_follows_the_zoom(widget):
+    widget.addLayer("hatched")
+    box = Box((10, 10), (20, 20), hatch=Hatch(spacing=1.0))
+    polygon = Polygon([(30, 30), (40, 30), (35, 40)], hatch=Hatch(spacing=1.0))
+    widget.addCadItem(box)
+    widget.addCadItem(polygon, layer="hatched")
+    pixel_size = max(widget.w.viewPixelSize())
+    assert box._hatch_bucket == hatch_bucket(box.hatch, pixel_size)
+    assert polygon._hatch_bucket == box._hatch_bucket
+
+    widget.w.setRange(xRange=(0, 1000), yRange=(0, 1000), padding=0)
+    assert box._hatch_bucket == MIN_TEXTURE_SPACING
+    assert polygon._hatch_bucket == MIN_TEXTURE_SPACING
+    assert box.rect.brush() == hatch_brush(box.hatch, bucket=MIN_TEXTURE_SPACING)
@@ -0,0 +1,98 @@
+"""Tests of `LabelRenderer` and the labels of measurements."""
+
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QImage, QPainter
+
+from cadvas import Measure, labels
+from cadvas.labels import LabelRenderer
+
+
+def test_set_move_and_remove(qapp):
+    renderer = LabelRenderer()
+    renderer.setLabel("a", (1, 2), 0, "1.00")
+    renderer.setLabel("b", (3, 4), 90, "2.00")
+    renderer.setLabel("a", (5, 6), 0, "1.00")
+
+    assert len(renderer) == 2
+    assert renderer._labels["a"] == (5, 6, 0, "1.00")
+    renderer.removeLabel("a")
+    renderer.removeLabel("unknown")
+    assert len(renderer) == 1
+    renderer.clear()
+    assert len(renderer) == 0
+
+
+def test_layouts_are_shared_and_bounded(qapp, monkeypatch):
+    monkeypatch.setattr(labels, "MAX_CACHED_LAYOUTS", 3)
+    renderer = LabelRenderer()
+    first = renderer._layout("1.00", 0)
+
+    assert renderer._layout("1.00", 0) is first
+    assert renderer._layout("1.00", 45) is not first
+    for text in ("2.00", "3.00", "4.00"):
+        renderer._layout(text, 0)
+    assert len(renderer._layouts) == 3
+    assert ("1.00", 0) not in renderer._layouts
+
+
+def test_measurements_share_the_view_box_renderer(widget):
+    a = Measure((10, 10), (20, 10))
+    b = Measure((10, 30), (20, 30))
+    widget.addCadItems([a, b])
+    renderer = widget.w.measureLabels()
+
+    assert a.textitem is None
+    assert len(renderer) == 2
+    assert renderer._labels[a] == (15, 10, 0, "10.00")
+    assert renderer.labelSceneRect(a) is not None
+
+    widget.w.setRange(xRange=(200, 300), yRange=(200, 300), padding=0)
+    assert len(renderer) == 0
+    assert renderer.labelSceneRect(a) is None
+
+    widget.w.setRange(xRange=(0, 100), yRange=(0, 100), padding=0)
+    widget.removeCadItems([b])
+    assert list(renderer._labels) == [a]
+
+
+def test_labels_follow_their_layer(widget):
+    widget.addLayer("dims")
+    m = Measure((10, 10), (20, 10))
+    widget.addCadItem(m, do_bounds=False, layer="dims")
+    renderer = widget.layer("dims").measureLabels()
+
+    assert m in renderer._labels
+    assert len(widget.w.measureLabels()) == 0
+    widget.setLayerVisible("dims", False)
+    assert not renderer.isVisible()
+
+
+def test_upside_down_labels_are_turned():
+    assert Measure((0, 0), (10, 0))._labelAngle() == 0
+    assert Measure((10, 0), (0, 0))._labelAngle() == 0
+    assert Measure((0, 10), (0, 0))._labelAngle() == 90
+
+
+def _render(widget):
+    image = QImage(widget.viewport().size(), QImage.Format.Format_ARGB32)
+    painter = QPainter(image)
+    widget.render(painter)
+    painter.end()
+    return image
+
+
+def test_paint_draws_the_labels(widget):
+    m = Measure((10, 50), (90, 50), offset=20)
+    widget.addCadItem(m)
+    with_label = _render(widget)
+    widget.w.measureLabels().removeLabel(m)
+    without_label = _render(widget)
+
+    center = widget.mapFromScene(widget.w.mapViewToScene(QPointF(*m.midpoint)))
+    changed = [
+        (dx, dy)
+        for dx in range(-20, 21)
+        for dy in range(-5, 6)
+        if with_label.pixel(center.x() + dx, center.y() + dy) != without_label.pixel(center.x() + dx, center.y() + dy)
+    ]
+    assert changed
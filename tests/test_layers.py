@@ -0,0 +1,115 @@
+"""Tests of named layers in `QCadvasWidget`."""
+
+import pytest
+
+from cadvas import Box, Layer, Segment
+
+
+def test_add_layer_and_lookup(widget):
+    layer = widget.addLayer("walls", z=5, opacity=0.5)
+
+    assert isinstance(layer, Layer)
+    assert widget.layer("walls") is layer
+    assert widget.layer(layer) is layer
+    assert widget.layers() == [layer]
+    assert layer.zValue == 5
+    assert layer._group.opacity() == 0.5
+
+
+def test_duplicate_and_unknown_layer(widget):
+    widget.addLayer("walls")
+    with pytest.raises(ValueError):
+        widget.addLayer("walls")
+    with pytest.raises(KeyError):
+        widget.layer("doors")
+    with pytest.raises(KeyError):
+        widget.addCadItem(Segment((0, 0), (1, 1)), layer="doors")
+
+
+def test_items_are_children_of_the_layer_group(widget):
+    layer = widget.addLayer("walls")
+    segment = Segment((0, 0), (10, 0))
+    box = Box((0, 0), (5, 5))
+    widget.addCadItem(segment)
+    widget.addCadItem(box, layer="walls")
+
+    assert widget.layerOf(segment) is None
+    assert widget.layerOf(box) is layer
+    assert layer.items == [box]
+    assert box.rect.parentItem() is layer._group
+    assert segment.line.parentItem() is not layer._group
+
+
+def test_visibility_is_a_single_group_operation(widget):
+    layer = widget.addLayer("walls")
+    boxes = [Box((i, 0), (i + 1, 1)) for i in range(100)]
+    widget.addCadItems(boxes, layer="walls")
+
+    widget.setLayerVisible("walls", False)
+    assert not layer.visible
+    assert not layer._group.isVisible()
+    assert all(b.rect.isVisibleTo(layer._group) for b in boxes)
+    assert not any(b.rect.isVisible() for b in boxes)
+
+    widget.setLayerVisible("walls", True)
+    assert all(b.rect.isVisible() for b in boxes)
+
+
+def test_color_and_z_value(widget):
+    layer = widget.addLayer("walls")
+    layer.setColor((255, 0, 0))
+    assert layer._group.graphicsEffect() is not None
+    layer.setColor(None)
+    assert layer._group.graphicsEffect() is None
+
+    layer.setZValue(-3)
+    assert layer._group.zValue() == -3
+
+
+def test_clear_layer_keeps_other_items_and_style(widget):
+    layer = widget.addLayer("walls", z=2)
+    kept = Segment((0, 0), (1, 0))
+    widget.addCadItem(kept)
+    boxes = [Box((0, 0), (1, 1)), Box((2, 2), (3, 3))]
+    widget.addCadItems(boxes, layer="walls", do_bounds=True)
+    rects = [b.rect for b in boxes]
+    scene = widget.scene()
+
+    widget.clearLayer("walls")
+
+    assert layer.items == []
+    assert widget._items == [kept]
+    assert layer._group.scene() is scene
+    assert layer._group.zValue() == 2
+    assert not layer._bounded
+    assert not any(g in widget.w.addedItems for g in rects)
+
+
+def test_clear_drawing_keeps_layers(widget):
+    layer = widget.addLayer("walls")
+    box = Box((0, 0), (1, 1))
+    widget.addCadItem(box, layer="walls")
+    widget.clearDrawing()
+
+    assert widget.layer("walls") is layer
+    assert layer.items == []
+    assert widget.layerOf(box) is None
+
+
+def test_range_change_updates_view_and_visible_layer_items(widget, monkeypatch):
+    widget.addLayer("walls")
+    widget.addLayer("hidden", visible=False)
+    items = {"view": Segment((0, 0), (1, 0)), "walls": Box((0, 0), (1, 1)), "hidden": Box((2, 2), (3, 3))}
+    widget.addCadItem(items["view"])
+    widget.addCadItems([items["walls"]], layer="walls")
+    widget.addCadItem(items["hidden"], layer="hidden")
+    widget.removeCadItems([items["walls"]])
+    widget.addCadItems([items["walls"]], layer="walls")
+
+    targets = {}
+    for name, item in items.items():
+        monkeypatch.setattr(item, "updateItems", lambda target, name=name: targets.setdefault(name, []).append(target))
+    widget.w.setRange(xRange=(10, 50), yRange=(10, 50), padding=0)
+
+    assert targets == {"view": [widget.w], "walls": [widget.layer("walls")]}
+    assert list(widget._view_items.values()) == [items["view"]]
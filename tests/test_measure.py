@@ -0,0 +1,134 @@
+"""Tests of `Measure`: memoized geometry, lazy graphics items and adding measurements again."""
+
+import math
+
+import pytest
+from PySide6.QtGui import QUndoStack
+
+from cadvas import DrawingFeed, Measure
+from cadvas.undo import RemoveItemsCommand
+
+
+def test_geometry_is_derived_on_first_use():
+    m = Measure((0, 0), (3, 4), offset=2)
+    assert m._derived is None
+
+    assert m.distance == 5
+    derived = m._derived
+    assert m.midpoint == pytest.approx((1.5 + 1.6, 2 - 1.2))
+    assert m.offset == pytest.approx((1.6, -1.2))
+    assert m.angle == pytest.approx(math.degrees(math.atan2(-4, -3)))
+    assert m._derived is derived
+
+    m.setGeometry(end=(6, 8))
+    assert m._derived is None
+    assert m.distance == 10
+    assert m.geometry() == {"start": (0, 0), "end": (6, 8), "offset": 2}
+
+
+def test_zero_length_is_invalid(caplog):
+    m = Measure((1, 1), (1, 1))
+
+    assert m._invalid
+    assert "length 0" in caplog.text
+    assert m.distance == 0
+    assert m.bounds() == (1, 1, 1, 1)
+
+
+def test_items_are_created_when_in_view(widget):
+    m = Measure((200, 10), (210, 10))
+    widget.addCadItem(m, do_bounds=False)
+    assert m.line is None
+    assert m._derived is None
+
+    widget.w.setRange(xRange=(150, 250), yRange=(0, 100), padding=0)
+    assert m.line is not None
+    assert m.line.isVisible()
+
+
+def test_removed_measurement_can_be_added_again(widget):
+    m = Measure((10, 10), (20, 10))
+    widget.addCadItem(m, do_bounds=False)
+    first = m.line
+    widget.removeCadItems([m])
+    assert m.line is None
+
+    widget.addCadItem(m, do_bounds=False)
+    assert m.line is not first
+    assert m.line.scene() is widget.w.scene()
+    assert m.line.isVisible()
+
+
+def test_cleared_layer_measurement_can_be_added_again(widget, qapp):
+    widget.addLayer("dims")
+    m = Measure((10, 10), (20, 10))
+    widget.addCadItem(m, do_bounds=False, layer="dims")
+    widget.clearLayer("dims")
+    qapp.processEvents()
+    assert m.line is None
+
+    widget.addCadItem(m, do_bounds=False, layer="dims")
+    assert m.line.scene() is widget.w.scene()
+    assert m.line.isVisible()
+
+
+def test_items_outside_of_a_scene_are_recreated(widget):
+    m = Measure((10, 10), (20, 10))
+    widget.addCadItem(m, do_bounds=False)
+    first = m.line
+    widget._removeGraphicsItems(m.graphicsItems())
+    widget._discardItems({id(m)})
+
+    widget.addCadItem(m, do_bounds=False)
+    assert m.line is not first
+    assert m.line.scene() is widget.w.scene()
+
+
+def test_feed_can_show_the_same_measurement_again(widget):
+    feed = DrawingFeed(widget)
+    feed._timer.stop()
+    m = Measure((10, 10), (20, 10))
+    feed.set("a", m)
+    feed.flush()
+    feed.remove("a")
+    feed.flush()
+    feed.set("a", m)
+    feed.flush()
+    feed.stop()
+
+    assert m.line.scene() is widget.w.scene()
+    assert m.line.isVisible()
+
+
+def test_undo_keeps_the_graphics_items(widget):
+    m = Measure((10, 10), (20, 10))
+    widget.addCadItem(m, do_bounds=False)
+    line = m.line
+    stack = QUndoStack()
+    stack.push(RemoveItemsCommand(widget, [m]))
+    assert m.line is line
+    assert line.scene() is None
+
+    stack.undo()
+    assert m.line is line
+    assert line.scene() is widget.w.scene()
+
+
+def test_showing_a_layer_enforces_the_budget(widget):
+    widget.addLayer("dims")
+    on_layer = Measure((10, 10), (20, 10))
+    direct = Measure((60, 10), (70, 10))
+    widget.addCadItem(on_layer, do_bounds=False, layer="dims")
+    widget.addCadItem(direct, do_bounds=False)
+    n = len(direct.graphicsItems())
+    widget.setItemBudget(n)
+
+    widget.setLayerVisible("dims", False)
+    widget.w.setRange(xRange=(0, 30), yRange=(0, 30), padding=0)
+    assert on_layer.line is None
+    assert direct.line is not None
+
+    widget.setLayerVisible("dims", True)
+    assert on_layer.line is not None
+    assert direct.line is None
+    assert widget._materialized_count == n
@@ -0,0 +1,70 @@
+"""Tests of the minimal update mode of `QCadvasWidget`."""
+
+from PySide6.QtCore import QRect
+from PySide6.QtWidgets import QGraphicsView
+
+from cadvas import Box, Segment
+from cadvas.widget import _mergeRects
+
+
+def test_merge_overlapping_rects():
+    rects = [QRect(0, 0, 10, 10), QRect(5, 5, 10, 10), QRect(100, 100, 5, 5)]
+    merged = _mergeRects(rects, 10)
+
+    assert sorted((r.x(), r.y(), r.width(), r.height()) for r in merged) == [(0, 0, 15, 15), (100, 100, 5, 5)]
+
+
+def test_merge_chains_through_grown_rects():
+    # the third rect joins the first two, which only then overlap the fourth
+    rects = [QRect(0, 0, 10, 10), QRect(30, 0, 10, 10), QRect(5, 0, 30, 5), QRect(0, 8, 40, 5)]
+    merged = _mergeRects(rects, 10)
+
+    assert len(merged) == 1
+    assert merged[0] == QRect(0, 0, 40, 13)
+
+
+def test_merge_falls_back_to_the_bounding_rect():
+    rects = [QRect(i * 20, 0, 10, 10) for i in range(5)]
+
+    assert len(_mergeRects(rects, 5)) == 5
+    assert _mergeRects(rects, 4) == [QRect(0, 0, 90, 10)]
+
+
+def test_merged_rects_do_not_overlap():
+    rects = [QRect((i * 37) % 200, (i * 53) % 150, 15, 12) for i in range(60)]
+    merged = _mergeRects(rects, 1000)
+
+    for i, a in enumerate(merged):
+        for b in merged[i + 1 :]:
+            assert not a.intersects(b)
+    for r in rects:
+        assert any(m.contains(r) for m in merged)
+
+
+def test_mark_dirty_collects_item_rects(widget, qapp):
+    box = Box((10, 10), (20, 20))
+    widget.addCadItem(box)
+    assert widget._dirty == []
+
+    widget.setMinimalUpdate(True)
+    assert widget.viewportUpdateMode() == QGraphicsView.ViewportUpdateMode.NoViewportUpdate
+    widget.markDirty([box])
+    assert widget._dirty == [box.rect.sceneBoundingRect()]
+
+    qapp.processEvents()
+    assert widget._dirty == []
+
+
+def test_changes_through_the_widget_are_marked(widget):
+    widget.setMinimalUpdate(True)
+    segment = Segment((0, 0), (10, 0))
+    widget.addCadItem(segment)
+    widget._dirty = []
+
+    widget.modifyCadItem(segment, end=(50, 50))
+    assert len(widget._dirty) == 2
+
+    widget.setMinimalUpdate(False)
+    assert widget._dirty == []
+    widget.markDirty([segment])
+    assert widget._dirty == []
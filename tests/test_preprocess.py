@@ -0,0 +1,81 @@
+"""Tests of `cadvas.preprocess`."""
+
+import gc
+
+import numpy as np
+import pytest
+
+from cadvas import Measure
+from cadvas.preprocess import preprocess_measures, preprocess_polygons
+
+
+def test_measures_match_direct_construction():
+    rng = np.random.default_rng(1)
+    starts = rng.uniform(-10, 10, (50, 2))
+    ends = rng.uniform(-10, 10, (50, 2))
+    offsets = rng.uniform(-2, 2, 50)
+
+    result = preprocess_measures(starts, ends, offsets)
+    assert len(result) == 50
+    for m, s, e, o in zip(result.measures(), starts.tolist(), ends.tolist(), offsets.tolist(), strict=True):
+        direct = Measure(tuple(s), tuple(e), o)
+        assert m.start == direct.start
+        assert m.end == direct.end
+        assert m.distance == pytest.approx(direct.distance)
+        assert m.midpoint == pytest.approx(direct.midpoint)
+        assert m.angle == pytest.approx(direct.angle)
+        assert m.geometry() == pytest.approx(direct.geometry())
+
+
+def test_zero_length_measures_are_invalid(caplog):
+    result = preprocess_measures([(0, 0), (1, 1)], [(1, 0), (1, 1)], offsets=1.0)
+    valid, invalid = result.measures()
+
+    assert not valid._invalid
+    assert invalid._invalid
+    assert invalid.distance == 0
+    assert "length 0" in caplog.text
+    np.testing.assert_array_equal(result.distance, [1, 0])
+    np.testing.assert_array_equal(result.offset, [valid.offset, (0, 0)])
+
+
+def test_measures_do_not_compute_the_arrays():
+    result = preprocess_measures([(0, 0)], [(3, 4)])
+    (m,) = result.measures()
+
+    assert result._derived is None
+    assert m._derived is None
+    assert m.distance == 5
+
+
+def test_garbage_collector_state_is_restored():
+    preprocess_measures([(0, 0)], [(1, 0)]).measures()
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        preprocess_measures([(0, 0)], [(1, 0)]).measures()
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_polygon_bounds():
+    points = [(0, 0), (2, 0), (1, 3), (5, 5), (6, 4), (7, 7), (4, 6)]
+    result = preprocess_polygons(points, [0, 3, 7])
+
+    np.testing.assert_array_equal(result.bounds, [[0, 0, 2, 3], [4, 4, 7, 7]])
+    first, second = result.polygons()
+    assert first.points == [(0, 0), (2, 0), (1, 3)]
+    assert second.bounds() == (4, 4, 7, 7)
+
+
+@pytest.mark.parametrize("offsets", [[0, 3, 2], [0, 2], [1, 3]])
+def test_invalid_polygon_offsets(offsets):
+    with pytest.raises(ValueError, match="offsets"):
+        preprocess_polygons([(0, 0), (1, 0), (1, 1)], offsets)
+
+
+def test_mismatched_ends():
+    with pytest.raises(ValueError, match="ends"):
+        preprocess_measures([(0, 0), (1, 1)], [(1, 0)])
@@ -0,0 +1,87 @@
+"""Tests of `GeometryStore` and `nearest_neighbours`."""
+
+import numpy as np
+import pytest
+
+from cadvas import Box, Circle, Measure, Polygon, Segment
+from cadvas.query import GeometryStore, nearest_neighbours
+
+
+def brute_force(points):
+    d = points[:, None, :] - points[None, :, :]
+    d2 = (d**2).sum(axis=-1)
+    np.fill_diagonal(d2, np.inf)
+    return np.sqrt(d2.min(axis=1))
+
+
+rng = np.random.default_rng(7)
+POINT_SETS = {
+    "random": rng.random((2000, 2)) * 100,
+    "clustered": np.r_[rng.normal(0, 1e-4, (1000, 2)), rng.random((1000, 2)) * 1e4],
+    "duplicates": np.round(rng.random((2000, 2)) * 20),
+    "outliers": np.r_[rng.random((1990, 2)), rng.random((10, 2)) * 1e9],
+    "line": np.c_[np.zeros(1000), rng.permutation(1000) * 0.5],
+    "grid": np.stack(np.meshgrid(np.arange(40.0), np.arange(40.0)), axis=-1).reshape(-1, 2),
+}
+
+
+@pytest.mark.parametrize("name", POINT_SETS)
+def test_nearest_neighbours_matches_brute_force(name):
+    points = POINT_SETS[name]
+    distances, indices = nearest_neighbours(points)
+
+    np.testing.assert_allclose(distances, brute_force(points))
+    assert np.all(indices != np.arange(len(points)))
+    np.testing.assert_allclose(np.hypot(*(points - points[indices]).T), distances)
+
+
+def test_nearest_neighbours_small_inputs():
+    distances, indices = nearest_neighbours([(1, 1)])
+    assert distances.tolist() == [np.inf]
+    assert indices.tolist() == [-1]
+
+    distances, indices = nearest_neighbours([(0, 0), (3, 4)])
+    assert distances.tolist() == [5, 5]
+    assert indices.tolist() == [1, 0]
+
+    distances, indices = nearest_neighbours(np.ones((4, 2)))
+    assert distances.tolist() == [0, 0, 0, 0]
+    assert sorted(indices.tolist()) == [0, 1, 2, 3]
+
+
+def test_nearest_neighbours_batches(monkeypatch):
+    monkeypatch.setattr("cadvas.query.MAX_PAIRS", 64)
+    points = POINT_SETS["clustered"]
+
+    np.testing.assert_allclose(nearest_neighbours(points)[0], brute_force(points))
+
+
+def test_store_from_items():
+    items = [
+        Segment((0, 0), (3, 4)),
+        Box((0, 0), (2, 3)),
+        Circle((10, 10), 1),
+        Polygon([(0, 0), (4, 0), (4, 4), (0, 4)]),
+        Measure((0, 0), (0, 6)),
+    ]
+    store = GeometryStore.from_items(items, layer_of=lambda item: "a" if isinstance(item, Box) else None)
+
+    assert store.layers == [None, "a"]
+    assert store.total_segment_length() == 5
+    assert store.box_areas().tolist() == [6]
+    assert store.box_perimeters().tolist() == [10]
+    np.testing.assert_allclose(store.circle_areas(), [np.pi])
+    assert store.polygon_areas().tolist() == [16]
+    assert store.polygon_perimeters().tolist() == [16]
+    assert store.measure_distances().tolist() == [6]
+    assert store.layer_bounds() == {None: (0, 0, 11, 11), "a": (0, 0, 2, 3)}
+    assert len(store.nearest_vertex_distances()) == len(store.vertices()) == 2 + 4 + 1 + 4
+
+
+def test_store_from_widget(widget):
+    widget.addLayer("walls")
+    widget.addCadItem(Segment((0, 0), (1, 0)))
+    widget.addCadItem(Box((5, 5), (6, 7)), layer="walls")
+    store = GeometryStore.from_widget(widget)
+
+    assert store.layer_bounds() == {None: (0, 0, 1, 0), "walls": (5, 5, 6, 7)}
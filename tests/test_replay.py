@@ -0,0 +1,91 @@
+"""Tests of recording and replaying interaction traces."""
+
+import json
+import math
+
+import pytest
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QMouseEvent
+
+from cadvas.replay import InteractionRecorder, ReplayReport, replay
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_recorder_writes_ranges_and_mouse_events(widget, qapp, tmp_path):
+    path = tmp_path / "trace.jsonl"
+    recorder = InteractionRecorder(widget, path)
+    recorder.start()
+    assert recorder.recording
+    widget.w.setRange(xRange=(10, 20), yRange=(10, 20), padding=0)
+    event = QMouseEvent(
+        QMouseEvent.Type.MouseMove,
+        QPointF(5, 6),
+        QPointF(5, 6),
+        Qt.MouseButton.NoButton,
+        Qt.MouseButton.NoButton,
+        Qt.KeyboardModifier.NoModifier,
+    )
+    qapp.sendEvent(widget.viewport(), event)
+    recorder.stop()
+    assert not recorder.recording
+
+    header, *records = _read(path)
+    assert header["type"] == "header"
+    assert header["size"] == [widget.viewport().width(), widget.viewport().height()]
+    ranges = [r for r in records if r["type"] == "range"]
+    first, *_, last = ranges
+    assert sum(first["x"]) / 2 == pytest.approx(50)
+    assert sum(last["x"]) / 2 == pytest.approx(15)
+    assert last["y"] == pytest.approx([10, 20])
+    moves = [r for r in records if r["type"] == "mouse"]
+    assert moves == [
+        {
+            "t": moves[0]["t"],
+            "type": "mouse",
+            "event": "move",
+            "pos": [5.0, 6.0],
+            "buttons": 0,
+            "modifiers": 0,
+            "button": 0,
+        }
+    ]
+
+
+def test_replay_ranges(widget, tmp_path):
+    path = tmp_path / "trace.jsonl"
+    lines = [{"type": "header", "version": 1, "size": [800, 600]}]
+    lines += [{"t": i * 0.01, "type": "range", "x": [i, i + 50], "y": [0, 50]} for i in range(5)]
+    path.write_text("".join(json.dumps(r) + "\n" for r in lines))
+
+    report = replay(widget, path)
+
+    assert len(report) == 5
+    assert sum(widget.w.viewRange()[0]) / 2 == pytest.approx(29)
+    assert (report.latencies > 0).all()
+
+
+def test_replay_rejects_bad_input(widget, tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text(json.dumps({"type": "range"}) + "\n")
+    with pytest.raises(ValueError, match="header"):
+        replay(widget, path)
+    path.write_text(json.dumps({"type": "header", "version": 99}) + "\n")
+    with pytest.raises(ValueError, match="version"):
+        replay(widget, path)
+    with pytest.raises(ValueError, match="bogus"):
+        replay(widget, path, mode="bogus")
+
+
+def test_report_summary():
+    report = ReplayReport([0.001, 0.002, 0.003, 0.004])
+    summary = report.summary()
+
+    assert summary["frames"] == 4
+    assert summary["mean"] == pytest.approx(2.5)
+    assert summary["max"] == pytest.approx(4)
+    assert report.percentile(50) == pytest.approx(2.5)
+    assert "4 frames" in str(report)
+    assert math.isnan(ReplayReport([]).summary()["p99"])
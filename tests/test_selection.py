@@ -0,0 +1,132 @@
+"""Tests of box and lasso selection in `QCadvasWidget`."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PySide6.QtCore import QPointF, QRectF, Qt
+
+from cadvas import Box, Segment
+
+
+def drag_event(start, pos, is_start=False, finish=False, modifiers=Qt.KeyboardModifier.NoModifier):
+    """The part of a pyqtgraph drag event that the view box uses, in scene coordinates."""
+    return SimpleNamespace(
+        button=lambda: Qt.MouseButton.LeftButton,
+        buttonDownPos=lambda: start,
+        pos=lambda: pos,
+        isStart=lambda: is_start,
+        isFinish=lambda: finish,
+        modifiers=lambda: modifiers,
+        accept=lambda: None,
+    )
+
+
+def drag(widget, points, modifiers=Qt.KeyboardModifier.NoModifier):
+    """Drags through the given points in drawing coordinates."""
+    vb = widget.w
+    scene = [vb.mapFromView(QPointF(*p)) for p in points]
+    for i, pos in enumerate(scene[1:], start=1):
+        vb.mouseDragEvent(drag_event(scene[0], pos, i == 1, i == len(scene) - 1, modifiers))
+
+
+@pytest.fixture
+def boxes(widget):
+    items = [Box((i * 10, 0), (i * 10 + 5, 5)) for i in range(5)]
+    widget.addCadItems(items)
+    return items
+
+
+def test_select_in_rect_modes(widget, boxes):
+    assert widget.selectInRect((0, 0, 16, 6)) == 2
+    assert widget.selectedItems() == boxes[:2]
+    assert widget.selectInRect(QRectF(QPointF(31, 6), QPointF(19, -1)), mode="add") == 3
+    assert widget.selectInRect((0, 0, 36, 6), mode="toggle") == 1
+    assert widget.selectedItems() == [boxes[3]]
+    assert widget.selectInRect((0, 0, 100, 2), contained=False) == 5
+    assert widget.selectInRect((0, 0, 100, 6), mode="remove") == 0
+
+
+def test_select_in_lasso(widget, boxes):
+    assert widget.selectInLasso([(0, -1), (20, -1), (0, 20)]) == 2
+    assert widget.selectedItems() == boxes[:2]
+    assert widget.selectInLasso([(0, 0), (1, 1)]) == 0
+
+
+def test_selection_follows_added_and_removed_items(widget, boxes):
+    widget.selectInRect((20, 0, 50, 5))
+    extra = Segment((22, 1), (23, 2))
+    widget.addCadItem(extra)
+    assert widget.selectionMask().tolist() == [False, False, True, True, True, False]
+
+    widget.removeCadItems([boxes[0], boxes[3]])
+    assert widget.selectedItems() == [boxes[2], boxes[4]]
+    assert widget.selectInRect((20, 0, 50, 5)) == 3
+
+
+def test_remove_after_adding_to_cached_bounds(widget, boxes):
+    widget.selectInRect((0, 0, 5, 5))
+    added = [Box((100, 100), (101, 101)), Box((200, 200), (201, 201))]
+    widget.addCadItems(added)
+
+    # the bounds cache does not know the added items yet
+    widget.removeCadItems([boxes[1], added[0]])
+
+    assert len(widget._items) == 5
+    np.testing.assert_array_equal(widget.itemBounds()[-1], (200, 200, 201, 201))
+    assert widget.selectInRect((150, 150, 250, 250)) == 1
+    assert widget.selectedItems() == [added[1]]
+
+
+def test_modify_after_removing_updates_the_cached_bounds(widget, boxes):
+    widget.selectInRect((0, 0, 5, 5))
+    added = Box((100, 100), (101, 101))
+    widget.addCadItem(added)
+    widget.removeCadItems([boxes[0], boxes[2]])
+
+    widget.modifyCadItem(boxes[3], lower_left=(30, 50), upper_right=(35, 55))
+    widget.modifyCadItem(added, upper_right=(102, 102))
+
+    np.testing.assert_array_equal(widget.itemBounds()[1], (30, 50, 35, 55))
+    np.testing.assert_array_equal(widget.itemBounds()[3], (100, 100, 102, 102))
+    assert widget._positions(map(id, [added, boxes[0], boxes[1]]), sort=False) == [3, None, 0]
+
+
+def test_box_drag_selects(widget, boxes):
+    widget.setSelectionMode("box")
+    drag(widget, [(-1, -1), (10, 3), (16, 6)])
+    assert widget.selectedItems() == boxes[:2]
+    assert not widget.w._band.isVisible()
+
+    drag(widget, [(29, -1), (46, 6)], Qt.KeyboardModifier.ShiftModifier)
+    assert widget.selectedItems() == [boxes[0], boxes[1], boxes[3], boxes[4]]
+
+
+def test_lasso_drag_selects(widget, boxes):
+    widget.setSelectionMode("lasso")
+    drag(widget, [(8, -1), (28, -1), (28, 6), (8, 6)])
+    assert widget.selectedItems() == boxes[1:3]
+
+    with pytest.raises(ValueError):
+        widget.setSelectionMode("circle")
+
+
+def test_band_is_repainted_in_minimal_update_mode(widget, boxes):
+    widget.setSelectionMode("box")
+    widget.setMinimalUpdate(True)
+    vb = widget.w
+    start = vb.mapFromView(QPointF(0, 0))
+
+    vb.mouseDragEvent(drag_event(start, vb.mapFromView(QPointF(10, 10)), is_start=True))
+    first = vb._band.sceneBoundingRect()
+    assert any(r.contains(first) for r in widget._dirty)
+
+    widget._dirty = []
+    vb.mouseDragEvent(drag_event(start, vb.mapFromView(QPointF(50, 50))))
+    second = vb._band.sceneBoundingRect()
+    assert any(r.contains(first) for r in widget._dirty)
+    assert any(r.contains(second) for r in widget._dirty)
+
+    widget._dirty = []
+    vb.mouseDragEvent(drag_event(start, vb.mapFromView(QPointF(50, 50)), finish=True))
+    assert any(r.contains(second) for r in widget._dirty)
@@ -0,0 +1,99 @@
+"""Tests of session mode, the item budget and clearing the drawing."""
+
+from cadvas import Box, Measure, Segment
+from cadvas import widget as widget_module
+
+
+def _grid_of_boxes(n):
+    return [Box((10 * i, 10), (10 * i + 5, 15)) for i in range(n)]
+
+
+def test_off_screen_elements_are_evicted_and_restored(widget):
+    boxes = _grid_of_boxes(30)  # x up to 295, the view shows about 0 - 100
+    widget.addCadItems(boxes)
+    widget.setSessionMode(max_items=12)
+
+    stats = widget.sessionStats()
+    on_screen = [b for b in boxes if b.rect is not None]
+    assert stats["elements"] == 30
+    assert stats["live_items"] == len(on_screen) <= 16
+    assert stats["evicted"] == 30 - len(on_screen)
+    assert stats["evictions"] == stats["evicted"]
+    assert boxes[0].rect is not None
+    assert boxes[-1].rect is None
+
+    widget.w.setRange(xRange=(200, 300), yRange=(0, 100), padding=0)
+    stats = widget.sessionStats()
+    assert boxes[-1].rect is not None
+    assert boxes[-1].rect.scene() is widget.w.scene()
+    assert stats["restores"] > 0
+    assert boxes[0].rect is None
+    assert stats["live_items"] <= 16
+
+
+def test_disabling_session_mode_restores_everything(widget):
+    boxes = _grid_of_boxes(30)
+    widget.addCadItems(boxes)
+    widget.setSessionMode(max_items=5)
+    widget.setSessionMode(False)
+
+    stats = widget.sessionStats()
+    assert stats["evicted"] == 0
+    assert stats["live_items"] == 30
+
+
+def test_memory_is_sampled(widget, monkeypatch):
+    reads = []
+
+    def fake_memory():
+        reads.append(True)
+        return 1000
+
+    monkeypatch.setattr(widget_module, "_process_memory", fake_memory)
+    widget.addCadItems(_grid_of_boxes(30))
+    widget.setSessionMode(max_memory=10_000)
+    assert len(reads) == 1
+
+    for _ in range(2 * widget.MEMORY_SAMPLE_INTERVAL):
+        widget.updateMeasurements()
+    assert len(reads) == 3
+    assert widget.sessionStats()["evicted"] == 0
+
+
+def test_memory_budget_evicts_off_screen_elements(widget, monkeypatch):
+    monkeypatch.setattr(widget_module, "_process_memory", lambda: 10_000)
+    boxes = _grid_of_boxes(30)
+    widget.addCadItems(boxes)
+    widget.setSessionMode(max_memory=1000)
+
+    stats = widget.sessionStats()
+    assert stats["peak_memory"] == 10_000
+    assert stats["evicted"] == sum(1 for b in boxes if b.rect is None) > 0
+    assert boxes[0].rect is not None
+
+
+def test_clear_drawing_releases_graphics(widget):
+    segment = Segment((0, 0), (10, 0))
+    m = Measure((10, 10), (20, 10))
+    widget.addCadItems([segment, m])
+    line = segment.line
+    widget.clearDrawing()
+
+    stats = widget.sessionStats()
+    assert stats["elements"] == 0
+    assert stats["cleared"] == 1
+    assert stats["leaked_items"] == 0
+    assert line.scene() is None
+    assert segment.graphicsItems() == []
+    assert m.graphicsItems() == []
+
+
+def test_clear_layer_releases_graphics_like_clear_drawing(widget):
+    widget.addLayer("walls")
+    boxes = _grid_of_boxes(3)
+    widget.addCadItems(boxes, layer="walls")
+    widget.clearLayer("walls")
+
+    assert all(b.graphicsItems() == [] for b in boxes)
+    widget.addCadItems(boxes, layer="walls")
+    assert all(b.rect.scene() is widget.w.scene() for b in boxes)
@@ -0,0 +1,134 @@
+"""Tests of undo and redo of widget edits."""
+
+import pytest
+
+from cadvas import Box, Measure, Segment
+from cadvas.undo import UndoStack
+
+
+@pytest.fixture
+def stack(widget):
+    """An undo stack for the widget."""
+    return UndoStack(widget, limit=10)
+
+
+def test_add_round_trip_reuses_graphics(widget, stack):
+    box = Box((10, 10), (20, 20))
+    stack.add([box], do_bounds=True)
+    rect = box.rect
+
+    stack.undo()
+    assert widget._items == []
+    assert rect.scene() is None
+    assert box.rect is rect
+
+    stack.redo()
+    assert widget._items == [box]
+    assert box.rect is rect
+    assert rect.scene() is widget.w.scene()
+    assert rect in widget.w.addedItems
+
+
+def test_remove_round_trip_restores_layer_and_bounds(widget, stack):
+    widget.addLayer("walls")
+    on_layer = Segment((0, 0), (10, 0))
+    bounded = Box((10, 10), (20, 20))
+    widget.addCadItem(on_layer, layer="walls")
+    widget.addCadItem(bounded, do_bounds=True)
+
+    stack.remove([on_layer, bounded])
+    assert widget._items == []
+    assert widget.layer("walls").items == []
+
+    stack.undo()
+    assert widget.layerOf(on_layer).name == "walls"
+    assert widget.layer("walls").items == [on_layer]
+    assert widget.layerOf(bounded) is None
+    assert bounded.rect in widget.w.addedItems
+
+    stack.redo()
+    assert widget._items == []
+
+
+def test_modify_round_trip_updates_in_place(widget, stack):
+    box = Box((10, 10), (20, 20))
+    widget.addCadItem(box)
+    rect = box.rect
+
+    stack.modify(box, upper_right=(40, 30))
+    assert box.bounds() == (10, 10, 40, 30)
+    assert rect.rect().width() == pytest.approx(30)
+
+    stack.undo()
+    assert box.geometry() == {"lower_left": (10, 10), "upper_right": (20, 20)}
+    assert box.rect is rect
+    assert rect.rect().width() == pytest.approx(10)
+
+    stack.redo()
+    assert box.bounds() == (10, 10, 40, 30)
+
+
+def test_merged_modifications_undo_at_once(widget, stack):
+    segment = Segment((0, 0), (10, 0))
+    widget.addCadItem(segment)
+    for x in range(11, 20):
+        stack.modify(segment, merge=True, end=(x, 0))
+    stack.modify(segment, start=(1, 1))
+
+    assert stack.count() == 2
+    stack.undo()
+    assert segment.geometry() == {"start": (0, 0), "end": (19, 0)}
+    stack.undo()
+    assert segment.geometry() == {"start": (0, 0), "end": (10, 0)}
+
+
+def test_modify_measurement_round_trip(widget, stack):
+    m = Measure((10, 10), (20, 10), offset=2)
+    widget.addCadItem(m, do_bounds=False)
+    line = m.line
+
+    stack.modify(m, end=(30, 10))
+    assert m.distance == 20
+    stack.undo()
+    assert m.distance == 10
+    assert m.line is line
+    assert line.line().x2() - line.line().x1() == pytest.approx(10)
+
+
+def test_unknown_geometry_argument(widget, stack):
+    segment = Segment((0, 0), (10, 0))
+    widget.addCadItem(segment)
+
+    with pytest.raises(TypeError):
+        stack.modify(segment, radius=3)
+    assert stack.count() == 0
+
+
+def test_limit_drops_old_commands(widget):
+    stack = UndoStack(widget, limit=3)
+    for i in range(5):
+        stack.add([Segment((0, i), (1, i))])
+
+    assert stack.count() == 3
+    while stack.canUndo():
+        stack.undo()
+    assert len(widget._items) == 2
+
+
+def test_modify_undo_after_clearing_the_drawing(widget, stack):
+    box = Box((10, 10), (20, 20))
+    stack.add([box])
+    stack.modify(box, upper_right=(40, 30))
+    widget.selectInRect((0, 0, 50, 50))
+    widget.clearDrawing()
+
+    stack.undo()
+    assert box.bounds() == (10, 10, 20, 20)
+    assert box.rect is None
+    assert widget._items == []
+
+    stack.undo()
+    assert widget._items == []
+    stack.redo()
+    assert widget._items == [box]
+    assert box.rect.scene() is widget.w.scene()